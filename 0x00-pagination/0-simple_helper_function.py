@@ -17,9 +17,7 @@ def get_pagination_range(current_page: int, items_per_page: int) -> Tuple[int, i
     Returns:
         tuple(start_index, end_index): indices for the list slice
     """
-    start_index, end_index = 0, 0
-    for _ in range(current_page):
-        start_index = end_index
-        end_index += items_per_page
+    start_index = (current_page - 1) * items_per_page
+    end_index = start_index + items_per_page
 
     return (start_index, end_index)
@@ -2,9 +2,8 @@
 """
 Defines the Server class to paginate a database of popular baby names.
 """
-import csv
-import math
-from typing import List, Tuple
+from typing import Iterable, List, Sequence, Tuple
+from base_server import BaseServer
 
 
 def get_pagination_range(current_page: int, items_per_page: int) -> Tuple[int, int]:
@@ -19,31 +18,18 @@ def get_pagination_range(current_page: int, items_per_page: int) -> Tuple[int, i
     Returns:
         tuple(start_index, end_index): indices for the list slice
     """
-    start_index, end_index = 0, 0
-    for _ in range(current_page):
-        start_index = end_index
-        end_index += items_per_page
+    start_index = (current_page - 1) * items_per_page
+    end_index = start_index + items_per_page
 
     return (start_index, end_index)
 
 
-class Server:
+class Server(BaseServer):
     """Server class to manage pagination of a database of popular baby names."""
-    
-    DATA_FILE = "Popular_Baby_Names.csv"
-
-    def __init__(self):
-        self.__dataset = None
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List]:
         """Loads and caches the dataset from a CSV file if not already loaded."""
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Exclude header row
-
-        return self.__dataset
+        return self.load_dataset()
 
     def get_page(self, current_page: int = 1, items_per_page: int = 10) -> List[List]:
         """
@@ -69,3 +55,27 @@ class Server:
             return []
         
         return dataset[start_index:end_index]
+
+    def get_pages(self, pages: Iterable[int], items_per_page: int = 10) -> List[List[List]]:
+        """
+        Retrieves several pages of records in a single call, validating the
+        page size and loading the dataset only once for the whole batch.
+        
+        Args:
+            pages (Iterable[int]): the page numbers to fetch, each a positive integer
+            items_per_page (int): the number of records per page, must be positive
+            
+        Returns:
+            A list holding one page (as returned by get_page) per requested
+            page number, in the order they were requested.
+        """
+        assert isinstance(items_per_page, int) and items_per_page > 0, "Page size must be a positive integer"
+
+        dataset = self.dataset()
+        result = []
+        for current_page in pages:
+            assert isinstance(current_page, int) and current_page > 0, "Page number must be a positive integer"
+            start_index, end_index = get_pagination_range(current_page, items_per_page)
+            result.append(dataset[start_index:end_index])
+
+        return result
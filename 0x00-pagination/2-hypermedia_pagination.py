@@ -2,33 +2,23 @@
 """
 Provides the Server class with methods to create pagination from CSV data.
 """
-import csv
-from typing import List
+from typing import Dict, Iterable, List, Optional
+from base_server import BaseServer
+from inverted_index import InvertedIndex, PrefixIndex, intersect
+from keyset_index import SortIndex, decode_cursor, encode_cursor
+from row_json import encode_envelope
 get_pagination_range = __import__('0-simple_helper_function').get_pagination_range
 
 
-class Server:
+class Server(BaseServer):
     """Server class to manage pagination of a popular baby names database."""
-    
-    DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        self.__dataset = None
+    FILTER_COLUMNS = ("year", "gender", "ethnicity")
 
-    def load_dataset(self) -> List[List]:
-        """
-        Reads and caches the dataset from a CSV file.
-        
-        Returns:
-            List[List]: The dataset without the header row.
-        """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip header row
-
-        return self.__dataset
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sort_indexes = {}
+        self._filter_indexes = None
 
     @staticmethod
     def assert_positive_integer(value: int) -> None:
@@ -62,17 +52,71 @@ class Server:
             data = []
         return data
 
+    def get_pages(self, pages: Iterable[int], items_per_page: int = 10) -> List[List[List]]:
+        """
+        Retrieves several pages of data in a single call.
+        
+        The page size is validated and the dataset loaded once for the
+        whole batch instead of once per page.
+        
+        Args:
+            pages (Iterable[int]): The page numbers to fetch.
+            items_per_page (int): The number of items per page.
+            
+        Returns:
+            List[List[List]]: One page of data per requested page number.
+        """
+        self.assert_positive_integer(items_per_page)
+        
+        dataset = self.load_dataset()
+        result = []
+        for current_page in pages:
+            self.assert_positive_integer(current_page)
+            start_index, end_index = get_pagination_range(current_page, items_per_page)
+            result.append(dataset[start_index:end_index])
+        return result
+
     def get_pagination_info(self, current_page: int = 1, items_per_page: int = 10) -> dict:
         """
         Provides paginated data along with additional metadata.
         
+        With the prefetch option, the next page is then computed in the
+        background so that following next_page is served from memory.
+        
         Args:
             current_page (int): The page number to display.
             items_per_page (int): The number of items per page.
             
         Returns:
             dict: A dictionary containing pagination information and the data.
+            When the page cache is enabled the dictionary may be shared
+            with other callers and must not be mutated.
         """
+        self._maybe_refresh()
+        cache = self.page_cache
+        prefetcher = self.prefetcher
+        key = ("pagination_info", current_page, items_per_page)
+        version = self.version
+        pagination_info = None
+        if cache is not None:
+            pagination_info = cache.get(key, version)
+            if pagination_info is not None:
+                return pagination_info
+        if prefetcher is not None:
+            pagination_info = prefetcher.take(key, version)
+        if pagination_info is None:
+            pagination_info = self._pagination_info(current_page, items_per_page)
+
+        if cache is not None:
+            cache.put(key, version, pagination_info)
+        next_page = pagination_info["next_page"]
+        if prefetcher is not None and next_page is not None:
+            prefetcher.schedule(("pagination_info", next_page, items_per_page), version,
+                                lambda: self._pagination_info(next_page, items_per_page))
+        return pagination_info
+
+    def _pagination_info(self, current_page: int, items_per_page: int) -> dict:
+        """Computes the get_pagination_info dictionary, bypassing caches."""
         total_pages = (len(self.load_dataset()) + items_per_page - 1) // items_per_page
         data = self.get_page(current_page, items_per_page)
         
@@ -85,3 +129,209 @@ class Server:
             "next_page": current_page + 1 if current_page + 1 <= total_pages else None
         }
         return pagination_info
+
+    def get_pagination_info_json(self, current_page: int = 1, items_per_page: int = 10) -> bytes:
+        """
+        Provides get_pagination_info serialized as JSON.
+        
+        Rows are taken from the pre-rendered row JSON cache, so only the
+        small metadata envelope is serialized per request.
+        
+        Args:
+            current_page (int): The page number to display.
+            items_per_page (int): The number of items per page.
+            
+        Returns:
+            bytes: The same document json.dumps(get_pagination_info(...)) yields.
+        """
+        self.assert_positive_integer(current_page)
+        self.assert_positive_integer(items_per_page)
+
+        row_json = self.row_json()
+        data_length = len(self.load_dataset())
+        total_pages = (data_length + items_per_page - 1) // items_per_page
+        start_index, end_index = get_pagination_range(current_page, items_per_page)
+        data = row_json.fragments(range(min(start_index, data_length), min(end_index, data_length)))
+
+        return encode_envelope({
+            "current_page": current_page,
+            "items_per_page": items_per_page if items_per_page <= len(data) else len(data),
+            "total_pages": total_pages,
+            "data": None,
+            "previous_page": current_page - 1 if current_page > 1 else None,
+            "next_page": current_page + 1 if current_page + 1 <= total_pages else None
+        }, data)
+
+    def _on_rows_appended(self, first_row: int) -> None:
+        """Extends the sort and filter indexes with the appended rows."""
+        rows = self._dataset[first_row:]
+        for sort_by, index in list(self._sort_indexes.items()):
+            if len(rows) > len(index) // 8:
+                del self._sort_indexes[sort_by]  # Cheaper to rebuild on next use
+                continue
+            column = self.COLUMNS[sort_by]
+            convert = int if sort_by in self.NUMERIC_COLUMNS else str
+            index.extend((convert(row[column]) for row in rows), first_row)
+        if self._filter_indexes is not None:
+            for name in self.FILTER_COLUMNS:
+                column = self.COLUMNS[name]
+                self._filter_indexes[name].extend((row[column] for row in rows), first_row)
+            column = self.COLUMNS["name"]
+            self._filter_indexes["name"].extend((row[column] for row in rows), first_row)
+
+    def _on_reload(self) -> None:
+        """Drops the indexes built over the previous dataset."""
+        self._sort_indexes = {}
+        self._filter_indexes = None
+
+    def sort_index(self, sort_by: str) -> SortIndex:
+        """
+        Builds, once, the ordering of the dataset by one column.
+        
+        Args:
+            sort_by (str): A column name from COLUMNS.
+            
+        Returns:
+            SortIndex: The cached row permutation for that column.
+        """
+        assert sort_by in self.COLUMNS, "Unknown sort key: {}".format(sort_by)
+        if sort_by not in self._sort_indexes:
+            with self._lock:
+                if sort_by not in self._sort_indexes:
+                    column = self.COLUMNS[sort_by]
+                    numeric = sort_by in self.NUMERIC_COLUMNS
+                    convert = int if numeric else str
+                    self._sort_indexes[sort_by] = SortIndex(
+                        (convert(row[column]) for row in self.load_dataset()), numeric)
+        return self._sort_indexes[sort_by]
+
+    def get_keyset_page(self, sort_by: str = "name", cursor: Optional[str] = None,
+                        page_size: int = 10, descending: bool = False) -> Dict:
+        """
+        Provides a page of data ordered by a column, addressed by cursor.
+        
+        Cursors are opaque tokens taken from the next_cursor / prev_cursor
+        of a previous response; they are resolved with a bisect over a
+        precomputed sort permutation, so deep pages cost the same as the
+        first one. A cursor is only accepted with the sort_by and
+        descending it was issued for.
+        
+        Args:
+            sort_by (str): The column to order by (see COLUMNS).
+            cursor (str): A cursor from a previous page, or None for the first page.
+            page_size (int): The number of items per page.
+            descending (bool): Order from the largest key down.
+            
+        Returns:
+            dict: The page data and the cursors of its neighbouring pages.
+        """
+        self.assert_positive_integer(page_size)
+        index = self.sort_index(sort_by)
+        column = self.COLUMNS[sort_by]
+        convert = int if sort_by in self.NUMERIC_COLUMNS else str
+        position = None
+        if cursor is not None:
+            cursor_sort_by, cursor_descending, direction, key, row = decode_cursor(cursor)
+            assert cursor_sort_by == sort_by, "Cursor belongs to another sort key"
+            assert cursor_descending == descending, "Cursor belongs to another sort order"
+            assert isinstance(key, convert), "Malformed cursor"
+            position = (direction, key, row)
+
+        row_ids, has_previous, has_next = index.page(page_size, position, descending)
+        dataset = self.load_dataset()
+        data = [dataset[row] for row in row_ids]
+
+        return {
+            "sort_by": sort_by,
+            "descending": descending,
+            "page_size": len(data),
+            "data": data,
+            "prev_cursor": encode_cursor(sort_by, descending, "before",
+                                         convert(data[0][column]), row_ids[0])
+            if has_previous and data else None,
+            "next_cursor": encode_cursor(sort_by, descending, "after",
+                                         convert(data[-1][column]), row_ids[-1])
+            if has_next and data else None
+        }
+
+    def filter_indexes(self) -> Dict:
+        """
+        Builds, once, the inverted indexes used by get_filtered_page.
+        
+        Returns:
+            dict: An InvertedIndex per FILTER_COLUMNS entry, and a
+            PrefixIndex over names under the "name" key.
+        """
+        if self._filter_indexes is None:
+            with self._lock:
+                if self._filter_indexes is None:
+                    self._filter_indexes = self._build_filter_indexes()
+        return self._filter_indexes
+
+    def _build_filter_indexes(self) -> Dict:
+        """Indexes every filter column and the names in one pass over the dataset."""
+        columns = [self.COLUMNS[name] for name in self.FILTER_COLUMNS]
+        indexes = {name: InvertedIndex() for name in self.FILTER_COLUMNS}
+        names = []
+        chunk = 4096
+        for number, page in enumerate(self.iter_pages(chunk)):
+            for name, column in zip(self.FILTER_COLUMNS, columns):
+                indexes[name].extend((row[column] for row in page), number * chunk)
+            names.extend(row[self.COLUMNS["name"]] for row in page)
+        indexes["name"] = PrefixIndex(names)
+        return indexes
+
+    def get_filtered_page(self, current_page: int = 1, items_per_page: int = 10,
+                          year=None, gender: Optional[str] = None,
+                          ethnicity: Optional[str] = None,
+                          name_prefix: Optional[str] = None) -> Dict:
+        """
+        Provides a page of the rows matching every given filter, with metadata.
+        
+        Matching rows are found by intersecting posting lists of the
+        inverted indexes, never by scanning the dataset, and keep file order.
+        
+        Args:
+            current_page (int): The page number to display.
+            items_per_page (int): The number of items per page.
+            year (int | str): Keep rows with this year of birth.
+            gender (str): Keep rows with this gender.
+            ethnicity (str): Keep rows with this ethnicity.
+            name_prefix (str): Keep names starting with this, ignoring case.
+            
+        Returns:
+            dict: The same fields as get_pagination_info, computed over the
+            matching rows, plus the applied "filters".
+        """
+        self.assert_positive_integer(current_page)
+        self.assert_positive_integer(items_per_page)
+
+        filters = {"year": None if year is None else str(year),
+                   "gender": gender, "ethnicity": ethnicity}
+        indexes = self.filter_indexes()
+        postings = [indexes[name].rows(value) for name, value in filters.items()
+                    if value is not None]
+        if name_prefix is not None:
+            postings.append(indexes["name"].rows(name_prefix))
+        filters["name_prefix"] = name_prefix
+        if len(postings) == 1:
+            matches = postings[0]  # Sliced in place, never copied
+        elif postings:
+            matches = intersect(postings)
+        else:
+            matches = range(len(self.load_dataset()))
+
+        total_pages = (len(matches) + items_per_page - 1) // items_per_page
+        start_index, end_index = get_pagination_range(current_page, items_per_page)
+        dataset = self.load_dataset()
+        data = [dataset[row] for row in matches[start_index:end_index]]
+
+        return {
+            "current_page": current_page,
+            "items_per_page": items_per_page if items_per_page <= len(data) else len(data),
+            "total_pages": total_pages,
+            "data": data,
+            "previous_page": current_page - 1 if current_page > 1 else None,
+            "next_page": current_page + 1 if current_page + 1 <= total_pages else None,
+            "filters": {name: value for name, value in filters.items() if value is not None}
+        }
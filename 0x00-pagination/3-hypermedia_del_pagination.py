@@ -3,79 +3,281 @@
 Provides a Server class with deletion-resilient hypermedia pagination.
 """
 
-import csv
-from typing import List, Dict
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Sequence
+from base_server import BaseServer
+from live_index import LiveIndex
+from row_json import encode_envelope, iter_runs
+from rwlock import ReadWriteLock
 
 
-class Server:
-    """Server class to handle pagination of a database of popular baby names."""
-    
-    DATA_FILE = "Popular_Baby_Names.csv"
+class IndexedDataset(MutableMapping):
+    """
+    Mapping of record index to row that reads through to the dataset.
 
-    def __init__(self):
-        self.__dataset = None
-        self.__indexed_dataset = None
+    Rows are fetched from the underlying dataset on access instead of being
+    copied into a dict up front. Deletions are tracked by a LiveIndex, so
+    finding the k-th remaining row never scans the deleted ones.
 
-    def load_dataset(self) -> List[List]:
-        """Loads and caches the dataset from the CSV file.
-        
-        Returns:
-            List[List]: The cached dataset, excluding the header row.
+    Deleting and restoring take the write side of lock; page readers hold
+    its read side, so they never observe a half-updated LiveIndex. Every
+    effective deletion or restoration bumps version.
+    """
+
+    def __init__(self, dataset: Sequence[List], deleted: Iterable[int] = ()):
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip header row
+        Args:
+            dataset (Sequence[List]): the rows to index
+            deleted (Iterable[int]): rows to start out deleted; those past
+                the end of dataset are ignored
+        """
+        self._dataset = dataset
+        self.live_index = LiveIndex(len(dataset))
+        for index in deleted:
+            if index >= len(dataset):
+                break
+            self.live_index.delete(index)
+        self.lock = ReadWriteLock()
+        self.version = 0
+
+    def __contains__(self, index) -> bool:
+        return index in self.live_index
+
+    def __getitem__(self, index: int) -> List:
+        if index not in self.live_index:
+            raise KeyError(index)
+        return self._dataset[index]
+
+    def __setitem__(self, index: int, row: List) -> None:
+        raise TypeError("indexed dataset rows are read-only")
+
+    def __delitem__(self, index: int) -> None:
+        with self.lock.write_lock():
+            if index not in self.live_index:
+                raise KeyError(index)
+            self.live_index.delete(index)
+            self.version += 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.live_index)
+
+    def __len__(self) -> int:
+        return len(self.live_index)
+
+    def restore(self, index: int) -> None:
+        """Makes a deleted record visible again."""
+        if not 0 <= index < self.live_index.size:
+            raise KeyError(index)
+        with self.lock.write_lock():
+            if self.live_index.restore(index):
+                self.version += 1
+
+    def extend(self) -> None:
+        """Makes rows appended to the underlying dataset visible, as live rows."""
+        with self.lock.write_lock():
+            added = len(self._dataset) - self.live_index.size
+            if added > 0:
+                self.live_index.extend(added)
+                self.version += 1
+
+    def rows(self, indexes: List[int]) -> List[List]:
+        """Reads the given ascending indexes, slicing contiguous runs at once."""
+        rows = []
+        for start, stop in iter_runs(indexes):
+            rows.extend(self._dataset[start:stop])
+        return rows
+
+
+class Server(BaseServer):
+    """Server class to handle pagination of a database of popular baby names."""
 
-        return self.__dataset
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__indexed_dataset = None
+        self.__deleted = ()  # Deletions carried over a reload
 
     def load_indexed_dataset(self) -> Dict[int, List]:
         """Indexes the dataset for deletion-resilient pagination.
         
+        With the refresh_interval option, a due refresh runs first, so the
+        index covers rows appended since the last check.
+
         Returns:
             Dict[int, List]: Indexed dataset where each key is the record index.
         """
+        self._maybe_refresh()
         if self.__indexed_dataset is None:
-            dataset = self.load_dataset()
-            self.__indexed_dataset = {
-                index: dataset[index] for index in range(len(dataset))
-            }
+            with self._lock:
+                if self.__indexed_dataset is None:
+                    self.__indexed_dataset = IndexedDataset(self.load_dataset(),
+                                                            self.__deleted)
+                    self.__deleted = ()
         return self.__indexed_dataset
 
+    def _on_rows_appended(self, first_row: int) -> None:
+        """Extends the live index over the appended rows."""
+        if self.__indexed_dataset is not None:
+            self.__indexed_dataset.extend()
+
+    def _on_reload(self) -> None:
+        """
+        Rebuilds the index on next use, keeping the deletions by row position.
+
+        A reload follows any change to the file for the snapshot and
+        compressed backends, appends included, so the deleted positions
+        still name the same rows in that common case. After a rewrite that
+        moves rows, the same positions stay deleted, whichever rows now
+        hold them; positions past the new end are dropped.
+        """
+        indexed_dataset = self.__indexed_dataset
+        if indexed_dataset is not None:
+            with indexed_dataset.lock.read_lock():
+                self.__deleted = list(indexed_dataset.live_index.deleted())
+        self.__indexed_dataset = None
+
+    def delete(self, index: int) -> None:
+        """
+        Deletes a record; pages served afterwards skip it.
+        
+        Args:
+            index (int): The index of the record to delete.
+        """
+        del self.load_indexed_dataset()[index]
+
+    def restore(self, index: int) -> None:
+        """
+        Restores a previously deleted record.
+        
+        Args:
+            index (int): The index of the record to restore.
+        """
+        self.load_indexed_dataset().restore(index)
+
     def get_hyper_index(self, start_index: int = None, page_size: int = 10) -> Dict:
         """
         Provides a deletion-resilient page of data with pagination metadata.
         
+        With the prefetch option, the page at next_index is then computed
+        in the background; a deletion made meanwhile discards it.
+        
         Args:
             start_index (int): The index of the first item to display.
             page_size (int): Number of records to include on the page.
             
         Returns:
             Dict: A dictionary with pagination metadata and the page data.
+            When the page cache is enabled the dictionary may be shared
+            with other callers and must not be mutated.
         """
         dataset = self.load_indexed_dataset()
-        data_length = len(dataset)
+        data_length = dataset.live_index.size
         assert 0 <= start_index < data_length, "start_index must be within dataset range"
+
+        cache = self.page_cache
+        prefetcher = self.prefetcher
+        if cache is None and prefetcher is None:
+            return self._hyper_page(dataset, start_index, page_size)
+
+        key = ("hyper_index", start_index, page_size)
+        version = (self.version, dataset.version)
+        pagination_data = None
+        if cache is not None:
+            pagination_data = cache.get(key, version)
+            if pagination_data is not None:
+                return pagination_data
+        if prefetcher is not None:
+            pagination_data = prefetcher.take(key, version)
+        if pagination_data is None:
+            pagination_data = self._hyper_page(dataset, start_index, page_size)
+
+        if cache is not None:
+            cache.put(key, version, pagination_data)
+        next_index = pagination_data["next_index"]
+        if prefetcher is not None and next_index is not None:
+            prefetcher.schedule(("hyper_index", next_index, page_size), version,
+                                lambda: self._hyper_page(dataset, next_index, page_size))
+        return pagination_data
+
+    def iter_hyper_index(self, start_index: int = 0, page_size: int = 10) -> Iterator[Dict]:
+        """
+        Lazily yields consecutive deletion-resilient pages, following next_index.
+        
+        The arguments are validated once; the generator then keeps its
+        position between pages, so rows deleted while iterating are skipped
+        without repeating or missing any remaining row.
+        
+        Args:
+            start_index (int): The index of the first item to display.
+            page_size (int): Number of records to include on each page.
+            
+        Yields:
+            Dict: The same pagination dictionaries get_hyper_index returns.
+        """
+        assert isinstance(page_size, int) and page_size > 0, "page_size must be a positive integer"
+        dataset = self.load_indexed_dataset()
+        assert 0 <= start_index < dataset.live_index.size, "start_index must be within dataset range"
+
+        next_index = start_index
+        while next_index is not None:
+            pagination_data = self._hyper_page(dataset, next_index, page_size)
+            yield pagination_data
+            next_index = pagination_data["next_index"]
+
+    def get_hyper_index_json(self, start_index: int = None, page_size: int = 10) -> bytes:
+        """
+        Provides get_hyper_index serialized as JSON.
         
-        pagination_data = {
+        Rows are taken from the pre-rendered row JSON cache, so only the
+        small metadata envelope is serialized per request.
+        
+        Args:
+            start_index (int): The index of the first item to display.
+            page_size (int): Number of records to include on the page.
+            
+        Returns:
+            bytes: The same document json.dumps(get_hyper_index(...)) yields.
+        """
+        dataset = self.load_indexed_dataset()
+        assert 0 <= start_index < dataset.live_index.size, "start_index must be within dataset range"
+
+        indexes, next_index = self._hyper_indexes(dataset, start_index, page_size)
+        data = self.row_json().fragments(indexes)
+        return encode_envelope({
             "start_index": start_index,
-            "page_size": 0,  # Will update with actual data length
-            "data": [],
-            "next_index": None
-        }
+            "page_size": len(data),
+            "data": None,
+            "next_index": next_index
+        }, data)
+
+    @staticmethod
+    def _hyper_indexes(dataset: IndexedDataset, start_index: int, page_size: int):
+        """
+        Resolves which live records a page holds.
         
-        page_data = []
-        current_index = start_index
+        Returns:
+            tuple(indexes, next_index): the ascending record indexes of up
+            to page_size live records from start_index onwards, and the
+            index to continue from (None after the last record).
+        """
+        live_index = dataset.live_index
+        with dataset.lock.read_lock():
+            indexes = list(islice(live_index.iter_from(start_index), page_size))
 
-        while len(page_data) < page_size and current_index < data_length:
-            record = dataset.get(current_index)
-            current_index += 1
-            if record is not None:
-                page_data.append(record)
+        next_index = indexes[-1] + 1 if indexes and len(indexes) == page_size else None
+        if next_index is not None and next_index >= live_index.size:
+            next_index = None
+        return indexes, next_index
 
-        pagination_data["data"] = page_data
-        pagination_data["page_size"] = len(page_data)
-        pagination_data["next_index"] = current_index if current_index < data_length else None
+    @classmethod
+    def _hyper_page(cls, dataset: IndexedDataset, start_index: int, page_size: int) -> Dict:
+        """Collects up to page_size live records from start_index onwards."""
+        indexes, next_index = cls._hyper_indexes(dataset, start_index, page_size)
+        page_data = dataset.rows(indexes)
 
-        return pagination_data
+        return {
+            "start_index": start_index,
+            "page_size": len(page_data),
+            "data": page_data,
+            "next_index": next_index
+        }
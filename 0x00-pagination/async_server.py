@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Provides AsyncServer, an asyncio front end to the pagination servers.
+
+The dataset load, and page reads from disk-backed storage, run in an
+executor so they never block the event loop. serve_http exposes the
+pages over a minimal HTTP/1.1 endpoint for local load tests:
+    GET /page?page=1&page_size=10
+    GET /pagination_info?page=1&page_size=10
+    GET /hyper_index?index=0&page_size=10
+
+Usage: ./async_server.py [port] [csv]
+"""
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+HyperServer = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class PaginationServer(HyperServer, DelServer):
+    """Serves both the hypermedia and the deletion-resilient pages of one dataset."""
+
+    def _on_rows_appended(self, first_row: int) -> None:
+        """Extends the indexes of both parents."""
+        HyperServer._on_rows_appended(self, first_row)
+        DelServer._on_rows_appended(self, first_row)
+
+    def _on_reload(self) -> None:
+        """Drops the indexes of both parents."""
+        HyperServer._on_reload(self)
+        DelServer._on_reload(self)
+
+
+class AsyncServer:
+    """
+    Awaitable pagination over a PaginationServer.
+
+    The first request loads the dataset in the executor; requests arriving
+    while it loads all await that single load. Afterwards, pages held in
+    memory ("rows" and "columnar" storage) are served directly on the event
+    loop, and every other page read goes through the executor.
+    """
+
+    IN_MEMORY_STORAGES = ("rows", "columnar")
+
+    def __init__(self, server: Optional[PaginationServer] = None,
+                 executor: Optional[Executor] = None, **options):
+        """
+        Args:
+            server (PaginationServer): the server to wrap, by default a new
+                one created with options
+            executor (Executor): where blocking work runs, by default the
+                event loop's default executor
+        """
+        self.server = server if server is not None else PaginationServer(**options)
+        self.executor = executor
+        self._load_task = None
+
+    def _blocking(self) -> bool:
+        """Tells whether a page read may touch the disk or wait on a thread."""
+        server = self.server
+        return (server.storage not in self.IN_MEMORY_STORAGES
+                or server.prefetcher is not None
+                or server.options.get("refresh_interval") is not None)
+
+    async def _run(self, function, *args):
+        """Calls function(*args), in the executor if it may block."""
+        if not self._blocking():
+            return function(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def load(self) -> None:
+        """Loads the dataset and its live index once, coalescing concurrent callers."""
+        if self._load_task is None:
+            loop = asyncio.get_running_loop()
+            self._load_task = asyncio.ensure_future(
+                loop.run_in_executor(self.executor, self.server.load_indexed_dataset))
+        try:
+            await asyncio.shield(self._load_task)
+        except Exception:
+            if self._load_task.done():
+                self._load_task = None  # Let the next request try again
+            raise
+
+    async def get_page(self, current_page: int = 1, items_per_page: int = 10) -> List[List]:
+        """Awaitable Server.get_page."""
+        await self.load()
+        return await self._run(self.server.get_page, current_page, items_per_page)
+
+    async def get_pagination_info(self, current_page: int = 1, items_per_page: int = 10) -> Dict:
+        """Awaitable Server.get_pagination_info."""
+        await self.load()
+        return await self._run(self.server.get_pagination_info, current_page, items_per_page)
+
+    async def get_hyper_index(self, start_index: int = None, page_size: int = 10) -> Dict:
+        """Awaitable Server.get_hyper_index."""
+        await self.load()
+        return await self._run(self.server.get_hyper_index, start_index, page_size)
+
+    async def handle_http(self, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> None:
+        """Answers HTTP/1.1 GET requests on one connection, keeping it alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                status, body = await self._respond(method, target)
+                keep_alive = (headers.get("connection") != "close"
+                              and (version != "HTTP/1.0" or headers.get("connection") == "keep-alive"))
+                writer.write("HTTP/1.1 {}\r\nContent-Type: application/json\r\n"
+                             "Content-Length: {}\r\nConnection: {}\r\n\r\n".format(
+                                 status, len(body), "keep-alive" if keep_alive else "close"
+                             ).encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str):
+        """Computes the status line and JSON body for one request."""
+        if method != "GET":
+            return "405 Method Not Allowed", b'{"error": "method not allowed"}'
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            page_size = int(query.get("page_size", 10))
+            await self.load()
+            if url.path == "/page":
+                page = await self.get_page(int(query.get("page", 1)), page_size)
+                return "200 OK", json.dumps(page).encode()
+            if url.path == "/pagination_info":
+                return "200 OK", await self._run(self.server.get_pagination_info_json,
+                                                 int(query.get("page", 1)), page_size)
+            if url.path == "/hyper_index":
+                return "200 OK", await self._run(self.server.get_hyper_index_json,
+                                                 int(query.get("index", 0)), page_size)
+        except (AssertionError, ValueError) as error:
+            return "400 Bad Request", json.dumps({"error": str(error) or "invalid argument"}).encode()
+        return "404 Not Found", b'{"error": "not found"}'
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Starts the HTTP endpoint.
+
+        Returns:
+            asyncio.AbstractServer: the listening server, already serving
+        """
+        return await asyncio.start_server(self.handle_http, host, port)
+
+
+async def _main(port: int, data_file: Optional[str]) -> None:
+    """Serves the dataset over HTTP until interrupted."""
+    if data_file:
+        PaginationServer.DATA_FILE = data_file
+    server = AsyncServer()
+    listener = await server.serve_http(port=port)
+    print("Serving on http://127.0.0.1:{}/".format(port))
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 8080,
+                          sys.argv[2] if len(sys.argv) > 2 else None))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Defines the BaseServer class shared by the pagination servers.
+"""
+import csv
+import io
+import os
+import threading
+import time
+from typing import IO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from page_cache import PageCache
+from page_export import WRITERS
+from prefetch import Prefetcher
+from row_json import RowJsonCache
+
+# The storage backends and parallel_csv are imported where they are
+# selected, so a server only loads the modules its options use
+
+TAIL_BYTES = 64  # Bytes compared to tell an appended CSV from a rewritten one
+
+
+def source_stamp(path: str) -> Tuple[int, int]:
+    """Returns the (size, mtime_ns) pair identifying a version of a file."""
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class _LimitedReader(io.RawIOBase):
+    """Raw binary stream over the first limit bytes of a file."""
+
+    def __init__(self, raw: IO[bytes], limit: Optional[int]):
+        self._raw = raw
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining is None:
+            return self._raw.readinto(buffer)
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        count = self._raw.readinto(memoryview(buffer)[:size])
+        self._remaining -= count
+        return count
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def open_text(path: str, limit: Optional[int] = None, encoding: str = "utf-8") -> IO[str]:
+    """
+    Opens a file for csv.reader, reading at most its first limit bytes.
+
+    Decoding and line splitting stay in C (io.TextIOWrapper), so this is as
+    fast as a plain open(); the limit keeps a load consistent with the stamp
+    taken before it while the file is being appended to.
+
+    Args:
+        path (str): the file to open
+        limit (int): the maximum number of bytes to read, None for all
+        encoding (str): the text encoding of the file
+
+    Returns:
+        IO[str]: a text stream with newline="" as csv expects
+    """
+    raw = open(path, "rb", buffering=0)
+    return io.TextIOWrapper(io.BufferedReader(_LimitedReader(raw, limit)),
+                            encoding=encoding, newline="")
+
+
+class BaseServer:
+    """
+    Loads and caches the popular baby names dataset.
+
+    The storage backend is chosen per instance:
+        "rows"     - a list of csv.reader rows (the default)
+        "columnar" - a ColumnarDataset, several times smaller in memory
+        "mmap"     - an MmapDataset parsing only the rows that are read
+        "snapshot" - a SnapshotDataset mapped from a binary snapshot file,
+                     rebuilt from the CSV whenever it is missing or stale
+        "compressed" - a CompressedDataset reading independently compressed
+                     blocks of rows, rebuilt like a snapshot
+        "shared"   - a SharedDataset attached to a shared memory segment
+                     published by another process with share_dataset
+    Every backend is a sequence of rows supporting len() and slicing.
+
+    Backend specific options are passed as keyword arguments:
+        persist_index (bool) - "mmap": keep the row offset index on disk
+        index_path (str)     - "mmap": where to keep it (DATA_FILE + ".idx")
+        snapshot_path (str)  - "snapshot": the file (DATA_FILE + ".snap")
+        compressed_path (str) - "compressed": the file (DATA_FILE + ".blk")
+        block_rows (int)     - "compressed": rows per block (1024)
+        codec (str)          - "compressed": "zlib" (default) or "lzma"
+        cache_blocks (int)   - "compressed": decompressed blocks kept (8)
+        shm_name (str)       - "shared": the segment name (required)
+        workers (int)        - "rows", "columnar": parse the CSV on this many
+                               processes instead of on the calling thread,
+                               when the host has several CPUs and the file
+                               is at least PARALLEL_MIN_BYTES
+        refresh_interval (float) - call refresh() from load_dataset at most
+                               once per this many seconds
+        prerender_json (bool) - render the JSON of every row when the row
+                               JSON cache is created rather than on first use
+        prefetch (int)       - after serving a hypermedia page, compute the
+                               next one in the background, parking up to
+                               this many pages (see Prefetcher)
+
+    Page results can be cached with cache_size (0 disables the cache) and
+    cache_policy ("lru", "fifo" or a policy object, see PageCache). Cache
+    entries are stamped with version, which is bumped whenever the data a
+    page is computed from changes.
+    """
+
+    DATA_FILE = "Popular_Baby_Names.csv"
+    STORAGES = ("rows", "columnar", "mmap", "snapshot", "compressed", "shared")
+    COLUMNS = {"year": 0, "gender": 1, "ethnicity": 2, "name": 3, "count": 4, "rank": 5}
+    NUMERIC_COLUMNS = ("year", "count", "rank")
+
+    def __init__(self, storage: str = "rows", cache_size: int = 0,
+                 cache_policy: Union[str, object] = "lru", **options):
+        assert storage in self.STORAGES, "Unknown storage backend: {}".format(storage)
+        assert storage != "shared" or options.get("shm_name"), "The shared storage needs shm_name"
+        self.storage = storage
+        self.options = options
+        self.version = 0
+        self.page_cache = PageCache(cache_size, cache_policy) if cache_size else None
+        prefetch = options.get("prefetch")
+        self.prefetcher = Prefetcher(prefetch) if prefetch else None
+        self._dataset = None
+        self._source = None  # What was read of DATA_FILE, see _source_state
+        self._row_json = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()  # Guards lazy loading of the dataset and indexes
+
+    @classmethod
+    def from_snapshot(cls, path: str, **options) -> "BaseServer":
+        """
+        Creates a server reading its dataset from a binary snapshot.
+
+        Args:
+            path (str): The snapshot file, rebuilt if stale or missing.
+
+        Returns:
+            BaseServer: A server using the "snapshot" storage backend.
+        """
+        return cls(storage="snapshot", snapshot_path=path, **options)
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Reports the page cache counters.
+
+        Returns:
+            Optional[Dict[str, int]]: hits, misses, evictions, size and
+            maxsize, or None when the cache is disabled.
+        """
+        return self.page_cache.stats() if self.page_cache is not None else None
+
+    def prefetch_stats(self) -> Optional[Dict[str, float]]:
+        """
+        Reports the read-ahead counters.
+
+        Returns:
+            Optional[Dict[str, float]]: hits, misses, scheduled, wasted,
+            size, maxsize and hit_rate, or None when prefetching is disabled.
+        """
+        return self.prefetcher.stats() if self.prefetcher is not None else None
+
+    def read_rows(self, size: Optional[int] = None) -> List[List]:
+        """
+        Parses the whole CSV file, on several processes if the workers option is
+        set and the file is large enough, and the host has CPUs enough, to gain
+        from it (see parallel_csv.use_processes).
+
+        Args:
+            size (int): how many bytes of the file to parse, by default all.
+
+        Returns:
+            List[List]: every row of the file, excluding the header row.
+        """
+        workers = self.options.get("workers")
+        if workers:
+            from parallel_csv import read_rows_parallel, use_processes
+            if use_processes(workers, os.path.getsize(self.DATA_FILE) if size is None else size):
+                return read_rows_parallel(self.DATA_FILE, workers, size=size)
+        with open_text(self.DATA_FILE, size) as f:
+            reader = csv.reader(f)
+            dataset = [row for row in reader]
+        return dataset[1:]  # Skip header row
+
+    def load_dataset(self) -> Sequence[List]:
+        """
+        Loads and caches the dataset using the configured storage backend.
+
+        Loading is single-flight: when several threads ask for the dataset
+        before it is loaded, one of them loads it while the others wait.
+        With the refresh_interval option, rows appended to the CSV since
+        the last check are picked up first (see refresh).
+
+        Returns:
+            Sequence[List]: The cached dataset, excluding the header row.
+        """
+        if self._dataset is None:
+            with self._lock:
+                if self._dataset is None:
+                    self._dataset = self._open_dataset()
+        else:
+            self._maybe_refresh()
+
+        return self._dataset
+
+    def _maybe_refresh(self) -> None:
+        """
+        Calls refresh when the refresh_interval option is set and has elapsed.
+
+        Entry points that may answer from a cache call this before reading
+        version, so a cached page is never served past a due refresh.
+        """
+        interval = self.options.get("refresh_interval")
+        if (interval is not None and self._dataset is not None
+                and time.monotonic() - self._checked_at >= interval):
+            self.refresh()
+
+    def _open_dataset(self) -> Sequence[List]:
+        """Loads the dataset with the configured storage backend."""
+        self._checked_at = time.monotonic()
+        if self.storage == "mmap":
+            from mmap_dataset import MmapDataset
+            dataset = MmapDataset(self.DATA_FILE,
+                                  index_path=self.options.get("index_path"),
+                                  persist_index=self.options.get("persist_index", False))
+            self._source = self._source_state(dataset.stamp, dataset.stamp[0])
+            return dataset
+        if self.storage == "snapshot":
+            dataset = self._open_snapshot()
+            self._source = self._source_state(dataset.stamp, None)
+            return dataset
+        if self.storage == "compressed":
+            dataset = self._open_compressed()
+            self._source = self._source_state(dataset.stamp, None)
+            return dataset
+        if self.storage == "shared":
+            # The publishing process owns the data; there is nothing to refresh
+            self._source = None
+            from shared_dataset import SharedDataset
+            return SharedDataset.attach(self.options["shm_name"])
+
+        stamp = source_stamp(self.DATA_FILE)
+        if self.storage == "columnar":
+            dataset = self._read_columnar(stamp[0])
+        else:
+            dataset = self.read_rows(stamp[0])
+        self._source = self._source_state(stamp, stamp[0])
+        return dataset
+
+    def _read_columnar(self, size: int) -> Sequence[List]:
+        """Parses the first size bytes of the CSV file into a ColumnarDataset."""
+        from columnar_dataset import ColumnarDataset
+        workers = self.options.get("workers")
+        if workers:
+            from parallel_csv import read_encoded_parallel, use_processes
+            if use_processes(workers, size):
+                return ColumnarDataset.from_encoded(*read_encoded_parallel(
+                    self.DATA_FILE, workers, size=size))
+        with open_text(self.DATA_FILE, size) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header row
+            return ColumnarDataset.from_rows(reader)
+
+    def _source_state(self, stamp, consumed: Optional[int]) -> Dict:
+        """
+        Records what was read of DATA_FILE, for refresh to compare against.
+
+        Args:
+            stamp (tuple): the (size, mtime_ns) of the file that was read
+            consumed (int): how many bytes of it the dataset holds, or None
+                when the backend cannot be extended in place
+
+        Returns:
+            dict: the stamp, the consumed byte count, the bytes just before
+            that offset, and whether the last row read lacked a newline.
+        """
+        tail = b""
+        if consumed:
+            with open(self.DATA_FILE, "rb") as f:
+                f.seek(max(consumed - TAIL_BYTES, 0))
+                tail = f.read(min(consumed, TAIL_BYTES))
+        return {"stamp": tuple(stamp) if stamp else None, "consumed": consumed,
+                "tail": tail, "partial": bool(tail) and not tail.endswith(b"\n")}
+
+    def refresh(self) -> str:
+        """
+        Brings the loaded dataset up to date with DATA_FILE.
+
+        When the file only grew, and the bytes already read are unchanged,
+        just the complete lines appended since the last load are parsed
+        and added in place (for the "rows", "columnar" and "mmap" backends),
+        and indexes are extended through _on_rows_appended. A truncated or
+        rewritten file, or any other backend, is reloaded from scratch.
+        A trailing line still being written is left for the next refresh.
+        A reload that fails this way keeps the current data; one that
+        succeeds closes the file or mapping of the data it replaces.
+
+        Returns:
+            str: "unchanged", "appended" or "reloaded".
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            source = self._source
+            if self._dataset is None or source is None or source["stamp"] is None:
+                return "unchanged"
+            try:
+                stamp = source_stamp(self.DATA_FILE)
+            except OSError:
+                return "unchanged"
+            if stamp == source["stamp"]:
+                return "unchanged"
+
+            if self._can_append(source, stamp[0]):
+                first_row = len(self._dataset)
+                consumed = self._append_rows(source["consumed"], stamp[0])
+                self._source = self._source_state(stamp, consumed)
+                if len(self._dataset) == first_row:
+                    return "unchanged"
+                self.version += 1
+                self._on_rows_appended(first_row)
+                return "appended"
+
+            source_before = self._source
+            try:
+                dataset = self._open_dataset()
+            except ValueError:
+                # A snapshot or a compressed file that cannot be rebuilt
+                # yet, e.g. over a half-written row; keep serving
+                # the current data and retry on the next refresh
+                self._source = source_before
+                return "unchanged"
+            previous, self._dataset = self._dataset, dataset
+            self._row_json = None
+            self.version += 1
+            self._on_reload()
+            if hasattr(previous, "close"):
+                previous.close()  # Unmap or close the replaced file
+            return "reloaded"
+
+    def _can_append(self, source: Dict, size: int) -> bool:
+        """Checks that DATA_FILE only grew since source was recorded."""
+        if self.storage not in ("rows", "columnar", "mmap") or source["partial"]:
+            return False
+        consumed = source["consumed"]
+        if consumed is None or size < consumed:
+            return False
+        with open(self.DATA_FILE, "rb") as f:
+            f.seek(consumed - len(source["tail"]))
+            return f.read(len(source["tail"])) == source["tail"]
+
+    def _append_rows(self, start: int, size: int) -> int:
+        """
+        Adds the complete lines stored between start and size to the dataset.
+
+        Returns:
+            int: the offset just past the last line added.
+        """
+        with open(self.DATA_FILE, "rb") as f:
+            f.seek(start)
+            data = f.read(size - start)
+        stop = data.rfind(b"\n") + 1
+        if not stop:
+            return start
+        if self.storage == "mmap":
+            self._dataset.extend(start + stop)
+        else:
+            from mmap_dataset import parse_rows
+            self._dataset.extend(parse_rows(data[:stop]))
+        return start + stop
+
+    def _on_rows_appended(self, first_row: int) -> None:
+        """
+        Called by refresh after rows were appended in place.
+
+        Subclasses extend their indexes with dataset[first_row:] here.
+        """
+
+    def _on_reload(self) -> None:
+        """
+        Called by refresh after the dataset was reloaded from scratch.
+
+        Subclasses drop indexes built over the previous dataset here.
+        """
+
+    def row_json(self) -> RowJsonCache:
+        """
+        Returns the cache of pre-rendered row JSON used by the *_json methods.
+
+        Returns:
+            RowJsonCache: The cache for the current dataset.
+        """
+        dataset = self.load_dataset()
+        if self._row_json is None:
+            with self._lock:
+                if self._row_json is None:
+                    row_json = RowJsonCache(dataset)
+                    if self.options.get("prerender_json"):
+                        row_json.render_all()
+                    self._row_json = row_json
+        return self._row_json
+
+    def save_snapshot(self, path: Optional[str] = None) -> str:
+        """
+        Writes a binary snapshot of the CSV file, stamped with its size and mtime.
+
+        Args:
+            path (str): The snapshot file, by default the snapshot_path option
+                or DATA_FILE + ".snap".
+
+        Returns:
+            str: The path written.
+        """
+        path = path or self.options.get("snapshot_path") or self.DATA_FILE + ".snap"
+        from dataset_snapshot import write_snapshot
+        stamp = source_stamp(self.DATA_FILE)
+        with open(self.DATA_FILE, newline="") as f:
+            write_snapshot(path, csv.reader(f), stamp)
+        return path
+
+    def _open_snapshot(self) -> "SnapshotDataset":
+        """Opens the snapshot, rebuilding it first if the CSV has changed."""
+        from dataset_snapshot import SnapshotDataset
+        path = self.options.get("snapshot_path") or self.DATA_FILE + ".snap"
+        try:
+            stamp = source_stamp(self.DATA_FILE)
+        except OSError:
+            stamp = None  # Without the CSV the snapshot is the only source
+        try:
+            return SnapshotDataset.open(path, stamp)
+        except (OSError, ValueError):
+            if stamp is None:
+                raise
+        return SnapshotDataset.open(self.save_snapshot(path))
+
+    def save_compressed(self, path: Optional[str] = None) -> str:
+        """
+        Writes the CSV file as compressed blocks, stamped with its size and mtime.
+
+        The block_rows and codec options choose the block size and codec.
+
+        Args:
+            path (str): The file, by default the compressed_path option
+                or DATA_FILE + ".blk".
+
+        Returns:
+            str: The path written.
+        """
+        path = path or self.options.get("compressed_path") or self.DATA_FILE + ".blk"
+        from compressed_dataset import write_compressed
+        stamp = source_stamp(self.DATA_FILE)
+        with open(self.DATA_FILE, newline="") as f:
+            write_compressed(path, csv.reader(f),
+                             block_rows=self.options.get("block_rows", 1024),
+                             codec=self.options.get("codec", "zlib"), stamp=stamp)
+        return path
+
+    def share_dataset(self, name: Optional[str] = None):
+        """
+        Publishes the CSV file in shared memory for "shared" servers to attach to.
+
+        The caller owns the returned segment and must release it with
+        shared_dataset.unlink_dataset when the servers attached to it are gone.
+
+        Args:
+            name (str): The segment name, by default a random one.
+
+        Returns:
+            SharedMemory: The segment; pass its .name as the shm_name option.
+        """
+        from shared_dataset import publish_dataset
+        stamp = source_stamp(self.DATA_FILE)
+        with open(self.DATA_FILE, newline="") as f:
+            return publish_dataset(csv.reader(f), name, stamp)
+
+    def _open_compressed(self) -> "CompressedDataset":
+        """Opens the compressed file, rebuilding it first if the CSV has changed."""
+        from compressed_dataset import CompressedDataset
+        path = self.options.get("compressed_path") or self.DATA_FILE + ".blk"
+        cache_blocks = self.options.get("cache_blocks", 8)
+        try:
+            stamp = source_stamp(self.DATA_FILE)
+        except OSError:
+            stamp = None  # Without the CSV the compressed file is the only source
+        try:
+            return CompressedDataset(path, cache_blocks, stamp)
+        except (OSError, ValueError):
+            if stamp is None:
+                raise
+        return CompressedDataset(self.save_compressed(path), cache_blocks)
+
+    def read_header(self) -> List[str]:
+        """
+        Reads the header row of the CSV file.
+
+        Returns:
+            List[str]: the column names.
+        """
+        with open(self.DATA_FILE) as f:
+            return next(csv.reader(f), [])
+
+    def iter_pages(self, page_size: int = 10, start_page: int = 1) -> Iterator[List[List]]:
+        """
+        Lazily yields consecutive pages of the dataset, in file order.
+
+        Arguments are validated and the dataset loaded once; the generator
+        then keeps its position and slices one page per step.
+
+        Args:
+            page_size (int): The number of items per page.
+            start_page (int): The first page to yield.
+
+        Yields:
+            List[List]: One non-empty page of data at a time.
+        """
+        assert isinstance(page_size, int) and page_size > 0, "Page size must be a positive integer"
+        assert isinstance(start_page, int) and start_page > 0, "Page number must be a positive integer"
+
+        dataset = self.load_dataset()
+        for start_index in range((start_page - 1) * page_size, len(dataset), page_size):
+            yield dataset[start_index:start_index + page_size]
+
+    def iter_rows(self, page_size: int = 1000) -> Iterator[List]:
+        """
+        Lazily yields every row of the dataset, reading it page by page.
+
+        Args:
+            page_size (int): The number of rows fetched from the backend at once.
+
+        Yields:
+            List: One row at a time.
+        """
+        for page in self.iter_pages(page_size):
+            yield from page
+
+    def export(self, f: IO[str], fmt: str = "csv", page_size: int = 1000,
+               header: bool = True) -> int:
+        """
+        Streams the whole dataset to a text file object.
+
+        Only one page of rows is held in memory at a time.
+
+        Args:
+            f (IO[str]): The destination, ideally opened with newline="".
+            fmt (str): Either "csv" or "jsonl".
+            page_size (int): The number of rows read from the backend at once.
+            header (bool): Write the CSV header row, or key JSON lines by it.
+
+        Returns:
+            int: The number of rows written.
+        """
+        assert fmt in WRITERS, "Unknown export format: {}".format(fmt)
+        return WRITERS[fmt](self.iter_rows(page_size), f,
+                            self.read_header() if header else None)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the pagination servers on synthetic CSV files.
+
+For every dataset size, storage backend and Server variant, a fresh
+process measures the cold start (first page served by a new server),
+then the latency and throughput of that variant's scenarios:
+    1-simple_pagination          get_page, shallow (first 10 pages) and
+                                 deep (last 10%)
+    2-hypermedia_pagination      get_pagination_info, uniformly random pages
+    3-hypermedia_del_pagination  get_hyper_index, at 0%, 10% and 90% of
+                                 the rows deleted
+and finally its peak resident set size. Results are printed, or written
+with --output, as JSON so runs can be diffed across versions.
+
+Usage: ./bench_pagination.py [--rows 10000,100000] [--storage rows,mmap]
+                             [--requests 1000] [--output results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+from synthetic_names import generate_names_csv
+
+STORAGES = ("rows", "columnar", "mmap", "snapshot", "compressed")
+VARIANTS = ("1-simple_pagination", "2-hypermedia_pagination", "3-hypermedia_del_pagination")
+DELETION_DENSITIES = (0.0, 0.1, 0.9)
+PAGE_SIZE = 10
+
+
+def percentile(timings: List[int], fraction: float) -> int:
+    """Returns the nearest-rank percentile of sorted timings."""
+    return timings[min(int(fraction * len(timings)), len(timings) - 1)]
+
+
+def measure(call: Callable[[int], object], arguments: List[int]) -> Dict[str, float]:
+    """
+    Calls call(argument) for every argument and summarizes the timings.
+
+    Returns:
+        dict: requests, p50_us, p99_us and throughput_rps
+    """
+    timings = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for argument in arguments:
+        before = clock()
+        call(argument)
+        timings.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    timings.sort()
+    return {"requests": len(timings),
+            "p50_us": round(percentile(timings, 0.50) / 1e3, 2),
+            "p99_us": round(percentile(timings, 0.99) / 1e3, 2),
+            "throughput_rps": round(len(timings) / elapsed, 1) if elapsed else None}
+
+
+def peak_rss_kb() -> int:
+    """Returns the peak resident set size of this process, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_case(path: str, storage: str, variant: str, requests: int, seed: int) -> Dict:
+    """
+    Benchmarks one Server variant on one storage backend and CSV; meant to
+    run in its own process, so its cold start and peak RSS are its own.
+
+    Returns:
+        dict: cold_start_s, peak_rss_kb and one summary per scenario
+    """
+    server_class = type("BenchServer", (__import__(variant).Server,), {"DATA_FILE": path})
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    server = server_class(storage=storage)
+    if variant == "3-hypermedia_del_pagination":
+        server.get_hyper_index(0, PAGE_SIZE)
+    else:
+        server.get_page(1, PAGE_SIZE)
+    cold_start = time.perf_counter() - started
+
+    rows = len(server.load_dataset())
+    pages = max((rows + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    scenarios = {}
+    if variant == "1-simple_pagination":
+        deep_from = max(pages - pages // 10, 1)
+        scenarios["get_page_shallow"] = measure(
+            lambda page: server.get_page(page, PAGE_SIZE),
+            [rng.randint(1, min(10, pages)) for _ in range(requests)])
+        scenarios["get_page_deep"] = measure(
+            lambda page: server.get_page(page, PAGE_SIZE),
+            [rng.randint(deep_from, pages) for _ in range(requests)])
+    elif variant == "2-hypermedia_pagination":
+        scenarios["get_pagination_info"] = measure(
+            lambda page: server.get_pagination_info(page, PAGE_SIZE),
+            [rng.randint(1, pages) for _ in range(requests)])
+    else:
+        order = list(range(rows))
+        rng.shuffle(order)
+        deleted = 0
+        for density in DELETION_DENSITIES:
+            target = int(rows * density)
+            for index in order[deleted:target]:
+                server.delete(index)
+            deleted = max(deleted, target)
+            scenarios["get_hyper_index_{:d}pct_deleted".format(round(density * 100))] = measure(
+                lambda start: server.get_hyper_index(start, PAGE_SIZE),
+                [rng.randrange(rows) for _ in range(requests)])
+
+    return {"cold_start_s": round(cold_start, 4), "peak_rss_kb": peak_rss_kb(),
+            "scenarios": scenarios}
+
+
+def prepare(directory: str, rows: int, storages: List[str]) -> str:
+    """Generates the CSV for a size, plus the files the backends open, once."""
+    path = os.path.join(directory, "names-{}.csv".format(rows))
+    if not os.path.exists(path):
+        generate_names_csv(path, rows)
+    server = type("BenchServer", (__import__('base_server').BaseServer,), {"DATA_FILE": path})()
+    if "snapshot" in storages:
+        server.save_snapshot()
+    if "compressed" in storages:
+        server.save_compressed()
+    return path
+
+
+def main() -> None:
+    """Parses the command line, runs every case and reports JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", default="10000,100000",
+                        help="comma separated dataset sizes, 10000 to 10000000")
+    parser.add_argument("--storage", default=",".join(STORAGES),
+                        help="comma separated storage backends")
+    parser.add_argument("--requests", type=int, default=1000,
+                        help="requests timed per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="keep the generated files here")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.rows.split(",")]
+    storages = args.storage.split(",")
+    for storage in storages:
+        assert storage in STORAGES, "Unknown storage backend: {}".format(storage)
+
+    # A fresh interpreter per case keeps cold starts and peak RSS independent
+    context = multiprocessing.get_context("spawn")
+    results = []
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.data_dir or scratch
+        for rows in sizes:
+            path = prepare(directory, rows, storages)
+            for storage in storages:
+                for variant in VARIANTS:
+                    with context.Pool(1, maxtasksperchild=1) as pool:
+                        result = pool.apply(run_case, (path, storage, variant,
+                                                       args.requests, args.seed))
+                    results.append(dict(rows=rows, storage=storage, server=variant, **result))
+                    print("{:>10} rows {:<10} {} done".format(rows, storage, variant),
+                          file=sys.stderr)
+
+    report = json.dumps({
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "page_size": PAGE_SIZE, "requests": args.requests, "seed": args.seed,
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())},
+        "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compares Server cold start from the CSV file and from a binary snapshot.
+
+Usage: ./bench_snapshot.py [rows] [repeat]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from synthetic_names import generate_names_csv
+Server = __import__('1-simple_pagination').Server
+
+
+def cold_start(server_class, **options) -> float:
+    """Times creating a server and serving its first page, in seconds."""
+    started = time.perf_counter()
+    server_class(**options).get_page(1, 10)
+    return time.perf_counter() - started
+
+
+def main(rows: int = 200000, repeat: int = 5) -> None:
+    """Runs the benchmark on a synthetic CSV and prints median timings."""
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchServer(Server):
+            DATA_FILE = os.path.join(directory, "names.csv")
+
+        generate_names_csv(BenchServer.DATA_FILE, rows)
+        BenchServer().save_snapshot()
+        scenarios = {
+            "csv rows": {"storage": "rows"},
+            "csv columnar": {"storage": "columnar"},
+            "snapshot": {"storage": "snapshot"},
+        }
+        print("{} rows, median of {} runs".format(rows, repeat))
+        for label, options in scenarios.items():
+            timings = [cold_start(BenchServer, **options) for _ in range(repeat)]
+            print("{:<14} {:>9.2f} ms".format(label, statistics.median(timings) * 1000))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Defines ColumnarDataset, a memory-compact column store for CSV rows.
+"""
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple, Union
+
+
+def _smallest_typecode(low: int, high: int, signed: bool = True) -> str:
+    """
+    Picks the narrowest array typecode able to hold every value in a range.
+
+    Args:
+        low (int): the smallest value to store
+        high (int): the largest value to store
+        signed (bool): whether a signed typecode is required
+
+    Returns:
+        str: an array module typecode
+    """
+    for typecode in ("b", "h", "i", "q") if signed else ("B", "H", "I", "Q"):
+        bits = array(typecode).itemsize * 8
+        if signed and -(1 << (bits - 1)) <= low and high < (1 << (bits - 1)):
+            return typecode
+        if not signed and 0 <= low and high < (1 << bits):
+            return typecode
+    raise OverflowError("value range does not fit in 64 bits")
+
+
+class StringColumn:
+    """Dictionary-encoded column of strings: one small integer code per row."""
+
+    def __init__(self, values: List[str], codes: array):
+        self.values = values
+        self.codes = codes
+        self._lookup = None
+
+    def __getitem__(self, index):
+        """Returns the string (or list of strings for a slice) at index."""
+        if isinstance(index, slice):
+            values = self.values
+            return [values[code] for code in self.codes[index]]
+        return self.values[self.codes[index]]
+
+    def append(self, value: str) -> bool:
+        """Appends one value, widening the codes when the table outgrows them."""
+        if self._lookup is None:
+            self._lookup = {value: code for code, value in enumerate(self.values)}
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(sys.intern(value))
+            if code >= 1 << (8 * self.codes.itemsize):
+                self.codes = array(_smallest_typecode(0, code, signed=False), self.codes)
+        self.codes.append(code)
+        return True
+
+    def nbytes(self) -> int:
+        """Approximate number of bytes held by the column."""
+        return (self.codes.itemsize * len(self.codes)
+                + sum(sys.getsizeof(value) for value in self.values))
+
+
+class IntColumn:
+    """Column of canonical decimal integers kept in a typed array."""
+
+    def __init__(self, numbers: array):
+        self.numbers = numbers
+
+    def __getitem__(self, index):
+        """Returns the value (or list of values for a slice) as strings."""
+        if isinstance(index, slice):
+            return [str(number) for number in self.numbers[index]]
+        return str(self.numbers[index])
+
+    def append(self, value: str) -> bool:
+        """
+        Appends one value, widening the array when the value needs it.
+
+        Returns:
+            bool: False if value is not a canonical integer, which requires
+            the column to be re-encoded as a StringColumn.
+        """
+        if not _is_canonical_int(value):
+            return False
+        number = int(value)
+        try:
+            self.numbers.append(number)
+        except OverflowError:
+            self.numbers = array(_smallest_typecode(min(number, min(self.numbers)),
+                                                    max(number, max(self.numbers))), self.numbers)
+            self.numbers.append(number)
+        return True
+
+    def to_strings(self) -> StringColumn:
+        """Re-encodes the column as a dictionary-encoded string column."""
+        column = StringColumn([], array("B"))
+        for number in self.numbers:
+            column.append(str(number))
+        return column
+
+    def nbytes(self) -> int:
+        """Approximate number of bytes held by the column."""
+        return self.numbers.itemsize * len(self.numbers)
+
+
+def _is_canonical_int(value: str) -> bool:
+    """Checks that value round-trips exactly through int()."""
+    try:
+        return str(int(value)) == value
+    except ValueError:
+        return False
+
+
+def dictionary_encode(rows: Iterable[List[str]]) -> Tuple[List[List[str]], List[array], int]:
+    """
+    Dictionary-encodes rows column by column, consuming them lazily.
+
+    Args:
+        rows (Iterable[List[str]]): rows of equal width, without header
+
+    Returns:
+        tuple(tables, codes, length): the distinct (interned) values of each
+        column in first-seen order, for each column an array('I') of one
+        index into its table per row, and the number of rows
+
+    Raises:
+        ValueError: a row is not as wide as the first one
+    """
+    lookups = []
+    tables = []
+    codes = []
+    length = 0
+    for row in rows:
+        if not lookups:
+            width = len(row)
+            lookups = [{} for _ in range(width)]
+            tables = [[] for _ in range(width)]
+            codes = [array("I") for _ in range(width)]
+        if len(row) != len(lookups):
+            raise ValueError("row {} has {} fields, expected {}".format(
+                length, len(row), len(lookups)))
+        for value, lookup, table, column in zip(row, lookups, tables, codes):
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(table)
+                table.append(sys.intern(value))
+            column.append(code)
+        length += 1
+    return tables, codes, length
+
+
+class ColumnarDataset(Sequence):
+    """
+    Append-only sequence of CSV rows stored column by column.
+
+    Every column is first dictionary-encoded: each distinct string is kept
+    once (interned) and rows hold a narrow integer code. Columns whose
+    values are all canonical integers are then converted to a typed array.
+    Rows are materialized as fresh lists of str only when they are read,
+    so slicing returns exactly what a list of csv.reader rows would.
+    """
+
+    def __init__(self, columns: List[Union[StringColumn, IntColumn]], length: int):
+        self._columns = columns
+        self._length = length
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]]) -> "ColumnarDataset":
+        """
+        Builds a dataset from an iterable of rows, consuming it lazily.
+
+        Args:
+            rows (Iterable[List[str]]): rows of equal width, without header
+
+        Returns:
+            ColumnarDataset: the encoded rows
+        """
+        return cls.from_encoded(*dictionary_encode(rows))
+
+    @classmethod
+    def from_encoded(cls, tables: List[List[str]], codes: List[array],
+                     length: int) -> "ColumnarDataset":
+        """
+        Builds a dataset from dictionary-encoded columns.
+
+        Args:
+            tables (List[List[str]]): the distinct values of each column
+            codes (List[array]): for each column, one index into its table per row
+            length (int): the number of rows
+
+        Returns:
+            ColumnarDataset: the encoded rows
+        """
+        columns = [cls._encode_column(table, column)
+                   for table, column in zip(tables, codes)]
+        return cls(columns, length)
+
+    @staticmethod
+    def _encode_column(table: List[str], codes: array) -> Union[StringColumn, IntColumn]:
+        """Chooses the most compact representation for one column."""
+        if table and all(_is_canonical_int(value) for value in table):
+            numbers = [int(value) for value in table]
+            typecode = _smallest_typecode(min(numbers), max(numbers))
+            return IntColumn(array(typecode, (numbers[code] for code in codes)))
+        typecode = _smallest_typecode(0, max(len(table) - 1, 0), signed=False)
+        return StringColumn(table, array(typecode, codes))
+
+    def extend(self, rows: Iterable[List[str]]) -> None:
+        """
+        Appends rows in place, re-encoding a column if a new value requires it.
+
+        Args:
+            rows (Iterable[List[str]]): rows as wide as the existing ones
+        """
+        rows = iter(rows)
+        if not self._columns:
+            first = next(rows, None)
+            if first is None:
+                return
+            self._columns = [StringColumn([], array("B")) for _ in first]
+            rows = chain([first], rows)
+        columns = self._columns
+        for row in rows:
+            if len(row) != len(columns):
+                raise ValueError("row {} has {} fields, expected {}".format(
+                    self._length, len(row), len(columns)))
+            for position, value in enumerate(row):
+                if not columns[position].append(value):
+                    columns[position] = columns[position].to_strings()
+                    columns[position].append(value)
+            self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        """
+        Materializes one row, or a list of rows for a slice.
+
+        Args:
+            index (int | slice): row position(s) to read
+
+        Returns:
+            List[str] for an int index, List[List[str]] for a slice.
+        """
+        if isinstance(index, slice):
+            return [list(row) for row in zip(*(column[index] for column in self._columns))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("dataset index out of range")
+        return [column[index] for column in self._columns]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        chunk = 4096
+        for start in range(0, self._length, chunk):
+            yield from self[start:start + chunk]
+
+    def column(self, index: int) -> Union[StringColumn, IntColumn]:
+        """Returns the storage of a single column."""
+        return self._columns[index]
+
+    def nbytes(self) -> int:
+        """Approximate number of bytes held by all columns."""
+        return sum(column.nbytes() for column in self._columns)
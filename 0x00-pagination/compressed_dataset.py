@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Defines the block-compressed dataset format and CompressedDataset.
+
+A compressed dataset file holds, in order:
+    a fixed header (magic, codec, rows per block, counts, index offset,
+    source CSV size and mtime)
+    the CSV header row, uncompressed and length-prefixed
+    the blocks: each one the CSV text of up to block_rows rows,
+    compressed independently with zlib or lzma
+    the block index: array('Q') of block start offsets plus the end offset
+"""
+import csv
+import io
+import lzma
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+BLOCK_MAGIC = b"PGBLK001"
+BLOCK_HEADER = struct.Struct("<8s1s3xIQQQQQ")
+# magic, codec, rows per block, row count, block count, index offset,
+# source size, source mtime_ns
+CODECS = {
+    b"z": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    b"x": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+CODEC_NAMES = {"zlib": b"z", "lzma": b"x"}
+
+
+def _encode_rows(rows: List[List[str]]) -> bytes:
+    """Renders rows as CSV text encoded in UTF-8."""
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_compressed(path: str, records: Iterable[List[str]], block_rows: int = 1024,
+                     codec: str = "zlib", level: int = 6,
+                     stamp: Tuple[int, int] = (0, 0)) -> None:
+    """
+    Writes rows as independently compressed blocks, atomically replacing path.
+
+    Args:
+        path (str): the file to (re)write
+        records (Iterable[List[str]]): the header row followed by data rows,
+            all of the same width
+        block_rows (int): the number of rows per block
+        codec (str): "zlib" or "lzma"
+        level (int): the compression level or preset
+        stamp (tuple): the (size, mtime_ns) of the source CSV
+
+    Raises:
+        ValueError: a row does not have as many fields as the header, e.g.
+            a last line still being written; path is left untouched
+    """
+    assert codec in CODEC_NAMES, "Unknown codec: {}".format(codec)
+    assert isinstance(block_rows, int) and block_rows > 0, "block_rows must be a positive integer"
+    codec_id = CODEC_NAMES[codec]
+    compress = CODECS[codec_id][0]
+    records = iter(records)
+    header_row = next(records, [])
+    width = len(header_row)
+    header = _encode_rows([header_row])
+    offsets = array("Q")
+    count = 0
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * BLOCK_HEADER.size)
+            f.write(struct.pack("<I", len(header)) + header)
+            while True:
+                rows = list(islice(records, block_rows))
+                if not rows:
+                    break
+                for number, row in enumerate(rows, count + 1):
+                    if len(row) != width:
+                        raise ValueError("record {} has {} fields, expected {}".format(
+                            number, len(row), width))
+                offsets.append(f.tell())
+                f.write(compress(_encode_rows(rows), level))
+                count += len(rows)
+            offsets.append(f.tell())
+            index_offset = f.tell()
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            f.write(offsets.tobytes())
+            f.seek(0)
+            f.write(BLOCK_HEADER.pack(BLOCK_MAGIC, codec_id, block_rows, count,
+                                      len(offsets) - 1, index_offset, stamp[0], stamp[1]))
+    except ValueError:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+class CompressedDataset(Sequence):
+    """
+    Read-only sequence of rows stored in a block-compressed file.
+
+    Reading a page decompresses only the blocks that hold its rows; the
+    most recently decompressed blocks are kept in a small LRU so that
+    consecutive pages of the same block do not decompress it again.
+    """
+
+    def __init__(self, path: str, cache_blocks: int = 8,
+                 expected_stamp: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            path (str): the compressed dataset file
+            cache_blocks (int): how many decompressed blocks to keep
+            expected_stamp (tuple): when given, the file is rejected unless
+                it was built from a CSV with this (size, mtime_ns)
+
+        Raises:
+            OSError: the file cannot be read
+            ValueError: the file is not a valid or current compressed dataset
+        """
+        self._file = open(path, "rb")
+        try:
+            self._read_layout(expected_stamp)
+        except BaseException:
+            self._file.close()
+            raise
+        self.cache_blocks = cache_blocks
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+        self.block_reads = 0
+
+    def _read_exactly(self, length: int) -> bytes:
+        """Reads length bytes, raising ValueError if the file ends first."""
+        data = self._file.read(length)
+        if len(data) != length:
+            raise ValueError("Truncated compressed dataset")
+        return data
+
+    def _read_layout(self, expected_stamp: Optional[Tuple[int, int]]) -> None:
+        """Reads and checks the file header, CSV header row and block index."""
+        fields = BLOCK_HEADER.unpack(self._read_exactly(BLOCK_HEADER.size))
+        magic, codec_id, block_rows, count, blocks, index_offset, size, mtime_ns = fields
+        if magic != BLOCK_MAGIC or codec_id not in CODECS:
+            raise ValueError("Not a compressed dataset")
+        if expected_stamp is not None and (size, mtime_ns) != tuple(expected_stamp):
+            raise ValueError("Stale compressed dataset")
+
+        header_length = struct.unpack("<I", self._read_exactly(4))[0]
+        try:
+            header = self._read_exactly(header_length).decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError("Not a compressed dataset") from None
+        self.header = next(csv.reader(io.StringIO(header, newline="")), [])
+        self._file.seek(index_offset)
+        self._offsets = array("Q")
+        self._offsets.frombytes(self._read_exactly(8 * (blocks + 1)))
+        if sys.byteorder != "little":
+            self._offsets.byteswap()
+
+        self.stamp = (size, mtime_ns)
+        self.block_rows = block_rows
+        self._count = count
+        self._decompress = CODECS[codec_id][1]
+
+    def _block(self, number: int) -> List[List[str]]:
+        """Returns the rows of one block, decompressing it on an LRU miss."""
+        with self._lock:
+            rows = self._blocks.get(number)
+            if rows is not None:
+                self._blocks.move_to_end(number)
+                return rows
+            start, stop = self._offsets[number], self._offsets[number + 1]
+            self._file.seek(start)
+            data = self._decompress(self._file.read(stop - start))
+            self.block_reads += 1
+            rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+            self._blocks[number] = rows
+            if len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+            return rows
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Reads one row, or a list of rows for a slice, as fresh lists.
+
+        Args:
+            index (int | slice): row position(s) to read
+
+        Returns:
+            List[str] for an int index, List[List[str]] for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows = []
+            while start < stop:
+                number, offset = divmod(start, self.block_rows)
+                block = self._block(number)
+                taken = block[offset:offset + stop - start]
+                rows.extend(list(row) for row in taken)
+                start += len(taken)
+            return rows
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("dataset index out of range")
+        number, offset = divmod(index, self.block_rows)
+        return list(self._block(number)[offset])
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for number in range(len(self._offsets) - 1):
+            yield from (list(row) for row in self._block(number))
+
+    def close(self) -> None:
+        """Closes the underlying file."""
+        self._file.close()
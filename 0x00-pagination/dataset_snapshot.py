@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Defines the binary snapshot format used for fast Server startup.
+
+A snapshot file holds, in order:
+    a fixed header (magic, byte order, source CSV size and mtime, counts)
+    a string table: array('I') end offsets followed by the UTF-8 blob
+    fixed-width row records: one uint32 string id per field, header first
+All sections are 4-byte aligned so records can be viewed in place.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+SNAPSHOT_MAGIC = b"PGSNAP01"
+SNAPSHOT_HEADER = struct.Struct("<8s1s3xQQQII")
+# magic, byte order, source size, source mtime_ns, record count,
+# field count, string count
+
+
+def _padding(length: int) -> bytes:
+    """Returns the zero bytes aligning length to a multiple of four."""
+    return b"\0" * (-length % 4)
+
+
+def encode_snapshot(records: Iterable[List[str]], stamp: Tuple[int, int] = (0, 0)) -> bytes:
+    """
+    Encodes rows into the snapshot layout.
+
+    Args:
+        records (Iterable[List[str]]): the header row followed by data rows,
+            all of the same width
+        stamp (tuple): the (size, mtime_ns) of the source CSV
+
+    Returns:
+        bytes: the encoded snapshot
+    """
+    lookup = {}
+    blob = bytearray()
+    ends = array("I")
+    ids = array("I")
+    width = None
+    count = 0
+    for record in records:
+        if width is None:
+            width = len(record)
+        elif len(record) != width:
+            raise ValueError("record {} has {} fields, expected {}".format(count, len(record), width))
+        for value in record:
+            string_id = lookup.get(value)
+            if string_id is None:
+                string_id = lookup[value] = len(ends)
+                blob += value.encode("utf-8")
+                ends.append(len(blob))
+            ids.append(string_id)
+        count += 1
+
+    if sys.byteorder != "little":
+        ends.byteswap()
+        ids.byteswap()
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, b"<", stamp[0], stamp[1],
+                                  count, width or 0, len(ends))
+    return b"".join((header, ends.tobytes(), bytes(blob), _padding(len(blob)), ids.tobytes()))
+
+
+def write_snapshot(path: str, records: Iterable[List[str]], stamp: Tuple[int, int] = (0, 0)) -> None:
+    """
+    Encodes rows and writes the snapshot atomically to path.
+
+    Args:
+        path (str): the snapshot file to (re)write
+        records (Iterable[List[str]]): the header row followed by data rows
+        stamp (tuple): the (size, mtime_ns) of the source CSV
+    """
+    data = encode_snapshot(records, stamp)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SnapshotDataset(Sequence):
+    """
+    Read-only sequence of rows decoded from a snapshot buffer.
+
+    Only the string table is decoded up front; row records are read in
+    place through a memoryview, so opening costs one pass over the distinct
+    strings rather than over every row.
+    """
+
+    def __init__(self, buffer, expected_stamp: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            buffer: a bytes-like object holding a snapshot (bytes, mmap, ...)
+            expected_stamp (tuple): when given, the snapshot is rejected
+                unless it was built from a CSV with this (size, mtime_ns)
+
+        Raises:
+            ValueError: the buffer is not a valid or current snapshot
+        """
+        view = memoryview(buffer)
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError("Truncated snapshot")
+        magic, order, size, mtime_ns, count, width, strings = \
+            SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC or order != b"<":
+            raise ValueError("Not a dataset snapshot")
+        if expected_stamp is not None and (size, mtime_ns) != tuple(expected_stamp):
+            raise ValueError("Stale snapshot")
+
+        position = SNAPSHOT_HEADER.size
+        ends = array("I", view[position:position + 4 * strings].cast("I"))
+        if sys.byteorder != "little":
+            ends.byteswap()
+        position += 4 * strings
+        blob_length = ends[-1] if strings else 0
+        blob = view[position:position + blob_length]
+        starts = [0] + ends[:-1].tolist() if strings else []
+        self.strings = [str(blob[start:end], "utf-8") for start, end in zip(starts, ends)]
+        position += blob_length + (-blob_length % 4)
+        if len(view) < position + 4 * count * width:
+            raise ValueError("Truncated snapshot")
+
+        self.stamp = (size, mtime_ns)
+        self.width = width
+        self._count = count
+        self._buffer = buffer
+        self._records = view[position:position + 4 * count * width].cast("I")
+        if sys.byteorder != "little":
+            self._records = array("I", self._records)
+            self._records.byteswap()
+
+    @classmethod
+    def open(cls, path: str, expected_stamp: Optional[Tuple[int, int]] = None) -> "SnapshotDataset":
+        """
+        Maps a snapshot file and opens it.
+
+        Args:
+            path (str): the snapshot file
+            expected_stamp (tuple): the (size, mtime_ns) the source CSV must have
+
+        Raises:
+            OSError: the file cannot be read
+            ValueError: the file is not a valid or current snapshot
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, expected_stamp)
+
+    def close(self) -> None:
+        """
+        Releases the buffer, unmapping it if it is a file mapping; rows can
+        no longer be read. A mapping a reader is still viewing is unmapped
+        when that reader lets go of it.
+        """
+        if isinstance(self._records, memoryview):
+            self._records.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                pass
+        self._buffer = None
+
+    @property
+    def header(self) -> List[str]:
+        """The CSV header row stored with the snapshot."""
+        return self._record(0) if self._count else []
+
+    def _record(self, position: int) -> List[str]:
+        """Decodes the record at position, counting the header as record 0."""
+        strings = self.strings
+        width = self.width
+        return [strings[string_id]
+                for string_id in self._records[position * width:(position + 1) * width]]
+
+    def __len__(self) -> int:
+        return max(self._count - 1, 0)
+
+    def __getitem__(self, index):
+        """
+        Decodes one row, or a list of rows for a slice.
+
+        Args:
+            index (int | slice): row position(s) to read, excluding the header
+
+        Returns:
+            List[str] for an int index, List[List[str]] for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return [self._record(position + 1) for position in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self._record(index + 1)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for position in range(1, self._count):
+            yield self._record(position)
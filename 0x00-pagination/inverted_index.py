@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Defines the inverted and prefix indexes used to filter dataset rows.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence
+from keyset_index import merge_ordering
+
+
+class InvertedIndex:
+    """
+    Maps every distinct value of a column to the ascending row ids holding it.
+
+    Posting lists are array('I'), four bytes per row overall.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        """
+        Args:
+            values (Iterable[str]): the column value of every row, in row order
+        """
+        self.postings: Dict[str, array] = {}
+        self.extend(values, 0)
+
+    def extend(self, values: Iterable[str], first_row: int) -> None:
+        """
+        Indexes more rows; their ids must follow every row already indexed.
+
+        Args:
+            values (Iterable[str]): the column value of each new row
+            first_row (int): the row id of the first new row
+        """
+        postings = self.postings
+        for row, value in enumerate(values, first_row):
+            posting = postings.get(value)
+            if posting is None:
+                posting = postings[value] = array("I")
+            posting.append(row)
+
+    def rows(self, value: str) -> Sequence[int]:
+        """Returns the ascending row ids whose column equals value."""
+        return self.postings.get(value, ())
+
+
+class PrefixIndex:
+    """
+    Row ids ordered by a case-folded string column, for prefix lookups.
+
+    A prefix selects one contiguous range of the ordering, found with two
+    bisects; the range is returned re-sorted by row id so it can be
+    intersected with posting lists. The sorted rows of the most recently
+    used prefixes are cached, so repeated requests do not sort again.
+    Keys and rows live in the single ordering attribute, replaced in one
+    assignment by extend; cached rows are only used with the ordering
+    they were sorted from.
+    """
+
+    CACHED_PREFIXES = 64
+
+    def __init__(self, values: Iterable[str] = ()):
+        """
+        Args:
+            values (Iterable[str]): the column value of every row, in row order
+        """
+        keys = [value.casefold() for value in values]
+        order = array("I", sorted(range(len(keys)), key=keys.__getitem__))
+        self.ordering = ([keys[row] for row in order], order)
+        self._matches = {}  # Maps a prefix to (ordering, sorted row ids)
+
+    def extend(self, values: Iterable[str], first_row: int) -> None:
+        """
+        Adds rows whose ids follow every row already indexed.
+
+        Args:
+            values (Iterable[str]): the column value of each new row
+            first_row (int): the row id of the first new row
+        """
+        self.ordering = merge_ordering(*self.ordering, (value.casefold() for value in values),
+                                       first_row)
+
+    def rows(self, prefix: str) -> Sequence[int]:
+        """
+        Returns the ascending row ids whose value starts with prefix, ignoring case.
+
+        The result may be shared with other callers and must not be mutated.
+        """
+        ordering = self.ordering
+        prefix = prefix.casefold()
+        cached = self._matches.get(prefix)
+        if cached is not None and cached[0] is ordering:
+            return cached[1]
+        keys, order = ordering
+        low = bisect_left(keys, prefix)
+        high = bisect_left(keys, prefix + "\U0010ffff", low)
+        rows = array("I", sorted(order[low:high]))
+        if len(self._matches) >= self.CACHED_PREFIXES:
+            self._matches.clear()
+        self._matches[prefix] = (ordering, rows)
+        return rows
+
+
+def intersect(postings: List[Sequence[int]]) -> List[int]:
+    """
+    Intersects ascending row id lists.
+
+    The shortest list drives the intersection and every other list is
+    probed by bisect, so the cost is O(m log n) for a shortest list of m.
+
+    Args:
+        postings (List[Sequence[int]]): ascending row id lists
+
+    Returns:
+        List[int]: the ascending row ids present in every list
+    """
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = list(postings[0])
+    for posting in postings[1:]:
+        if not result:
+            break
+        matches = []
+        low = 0
+        high = len(posting)
+        for row in result:
+            low = bisect_left(posting, row, low, high)
+            if low == high:
+                break
+            if posting[low] == row:
+                matches.append(row)
+        result = matches
+    return result
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Defines SortIndex and the opaque cursors used for keyset pagination.
+"""
+import base64
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+Key = Union[int, str]
+
+
+def merge_ordering(keys: Sequence[Key], order: array, new_keys: Iterable[Key],
+                   first_row: int) -> Tuple[Sequence[Key], array]:
+    """
+    Merges rows whose ids follow every row of an ordering into a copy of it.
+
+    The sort is stable, so each new row lands after every equal key,
+    where its larger row id belongs. The existing keys form one sorted
+    run, which the sort merges in linear time; the cost is O(n + m log m)
+    for m new rows, against O(n) per row for inserting them one by one.
+
+    Args:
+        keys (Sequence[Key]): the sorted keys, a list or an array
+        order (array): the row id of each key
+        new_keys (Iterable[Key]): the key of each new row, in row order
+        first_row (int): the row id of the first new row
+
+    Returns:
+        tuple(keys, order): new containers of the same types; the
+        arguments are left untouched for readers still using them
+    """
+    all_keys = list(keys)
+    all_keys.extend(new_keys)
+    rows = order.tolist()
+    rows.extend(range(first_row, first_row + len(all_keys) - len(keys)))
+    positions = sorted(range(len(all_keys)), key=all_keys.__getitem__)
+    merged = [all_keys[position] for position in positions]
+    if isinstance(keys, array):
+        merged = array(keys.typecode, merged)
+    return merged, array("I", [rows[position] for position in positions])
+
+
+def encode_cursor(sort_by: str, descending: bool, direction: str, key: Key, row: int) -> str:
+    """
+    Builds an opaque cursor pointing just after or before one row.
+
+    Args:
+        sort_by (str): the sort key the cursor belongs to
+        descending (bool): the sort order the cursor belongs to
+        direction (str): "after" or "before"
+        key (Key): the sort key value of the row
+        row (int): the row id, breaking ties between equal keys
+
+    Returns:
+        str: a URL-safe token
+    """
+    payload = json.dumps([sort_by, descending, direction, key, row], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, str, Key, int]:
+    """
+    Reverses encode_cursor.
+
+    Args:
+        cursor (str): a token produced by encode_cursor
+
+    Returns:
+        tuple(sort_by, descending, direction, key, row)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_by, descending, direction, key, row = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor") from None
+    if (direction not in ("after", "before") or not isinstance(descending, bool)
+            or not isinstance(row, int)):
+        raise ValueError("Malformed cursor")
+    return sort_by, descending, direction, key, row
+
+
+class SortIndex:
+    """
+    Row ids of a dataset ordered by one column, ties broken by row id.
+
+    The permutation is kept in an array('I') next to the sorted key values
+    (an integer array for numeric columns), so a (key, row) cursor is
+    located with two bisects instead of re-sorting or scanning. Both live
+    in the single ordering attribute, which extend replaces in one
+    assignment, so a reader never pairs keys and rows of different sizes.
+    """
+
+    def __init__(self, keys: Iterable[Key], numeric: bool = False):
+        """
+        Args:
+            keys (Iterable[Key]): the sort key of every row, in row order
+            numeric (bool): whether keys are integers
+        """
+        keys = list(keys)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        if numeric:
+            sorted_keys = array("q", (keys[row] for row in order))
+        else:
+            sorted_keys = [keys[row] for row in order]
+        self.ordering = (sorted_keys, array("I", order))
+
+    def __len__(self) -> int:
+        return len(self.ordering[1])
+
+    def extend(self, keys: Iterable[Key], first_row: int) -> None:
+        """
+        Adds rows whose ids follow every row already in the ordering.
+
+        The rows are merged into new arrays, which then replace the
+        ordering at once; see merge_ordering.
+
+        Args:
+            keys (Iterable[Key]): the sort key of each new row, in row order
+            first_row (int): the row id of the first new row
+        """
+        self.ordering = merge_ordering(*self.ordering, keys, first_row)
+
+    @staticmethod
+    def _bounds(keys: Sequence[Key], order: array, key: Key, row: int) -> Tuple[int, int]:
+        """
+        Locates (key, row) in an ordering.
+
+        Returns:
+            tuple(before, through): the number of entries strictly before
+            (key, row), and the number of entries up to and including it.
+        """
+        low = bisect_left(keys, key)
+        high = bisect_right(keys, key, low)
+        return (bisect_left(order, row, low, high),
+                bisect_right(order, row, low, high))
+
+    def page(self, page_size: int, cursor: Optional[Tuple[str, Key, int]] = None,
+             descending: bool = False) -> Tuple[List[int], bool, bool]:
+        """
+        Returns the row ids of one page of the ordering.
+
+        Args:
+            page_size (int): the maximum number of row ids to return
+            cursor (tuple(direction, key, row)): where the page starts
+                ("after") or ends ("before"); None for the first page
+            descending (bool): walk the ordering from the largest key
+
+        Returns:
+            tuple(row_ids, has_previous, has_next): the row ids in display
+            order, and whether rows exist before and after the page
+        """
+        keys, order = self.ordering
+        size = len(order)
+        if cursor is None:
+            start, stop = 0, min(page_size, size)
+        else:
+            direction, key, row = cursor
+            before, through = self._bounds(keys, order, key, row)
+            if descending:
+                before, through = size - through, size - before
+            if direction == "after":
+                start, stop = through, min(through + page_size, size)
+            else:
+                start, stop = max(before - page_size, 0), before
+        if descending:
+            row_ids = [order[size - 1 - position] for position in range(start, stop)]
+        else:
+            row_ids = order[start:stop].tolist()
+        return row_ids, start > 0, stop < size
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Defines LiveIndex, a Fenwick tree tracking which dataset rows are live.
+"""
+from array import array
+from typing import Iterator, Optional
+
+
+class LiveIndex:
+    """
+    Set of live row indices in range(size) with O(log n) rank and select.
+
+    A bytearray holds one live flag per row and a Fenwick (binary indexed)
+    tree holds prefix counts of live rows, so deleting or restoring a row,
+    counting the live rows before an index, and finding the k-th live row
+    all cost O(log n) regardless of how dense the deletions are.
+    """
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size (int): the number of rows, all initially live
+        """
+        self._live = bytearray(b"\x01") * size
+        self._count = size
+        self._tree = self._build_tree(size)
+
+    @staticmethod
+    def _build_tree(size: int) -> array:
+        """Builds the tree for size live rows: node i covers lowbit(i) rows."""
+        typecode = "i" if size < (1 << 31) else "q"
+        return array(typecode, (i & -i for i in range(size + 1)))
+
+    def _add(self, index: int, delta: int) -> None:
+        """Adds delta to the count of the row at index."""
+        tree = self._tree
+        size = len(tree)
+        position = index + 1
+        while position < size:
+            tree[position] += delta
+            position += position & -position
+
+    def extend(self, count: int) -> None:
+        """
+        Appends count live rows after the existing ones.
+
+        Args:
+            count (int): the number of rows to add
+        """
+        old_size = len(self._live)
+        old_total = self._count
+        self._live.extend(b"\x01" * count)
+        self._count += count
+        if len(self._live) >= (1 << 31) and self._tree.typecode == "i":
+            self._tree = array("q", self._tree)
+
+        def prefix(position):
+            """Counts the live rows in range(position)."""
+            if position <= old_size:
+                return self.rank(position)
+            return old_total + position - old_size
+
+        tree = self._tree
+        for position in range(old_size + 1, old_size + count + 1):
+            tree.append(prefix(position) - prefix(position - (position & -position)))
+
+    @property
+    def size(self) -> int:
+        """The number of rows tracked, live or deleted."""
+        return len(self._live)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, index) -> bool:
+        return isinstance(index, int) and 0 <= index < len(self._live) and self._live[index] == 1
+
+    def __iter__(self) -> Iterator[int]:
+        return self.iter_from(0)
+
+    def iter_from(self, index: int) -> Iterator[int]:
+        """
+        Yields the live rows at or after index, in ascending order.
+
+        Consecutive live rows cost one flag check each, and every run of
+        deleted rows is crossed with one select, O(log n) however long the
+        run is, so a page costs O(page_size * log n) at worst.
+
+        Args:
+            index (int): where to start looking
+        """
+        live = self._live
+        size = len(live)
+        index = max(index, 0)
+        rank = None  # Live rows before index, counted once a run is crossed
+        while index < size:
+            if not live[index]:
+                if rank is None:
+                    rank = self.rank(index)
+                if rank >= self._count:
+                    return
+                index = self.select(rank)
+            yield index
+            index += 1
+            if rank is not None:
+                rank += 1
+
+    def deleted(self) -> Iterator[int]:
+        """Yields the deleted rows, in ascending order."""
+        live = self._live
+        index = live.find(0)
+        while index != -1:
+            yield index
+            index = live.find(0, index + 1)
+
+    def delete(self, index: int) -> bool:
+        """
+        Marks a row as deleted.
+
+        Args:
+            index (int): the row to delete
+
+        Returns:
+            bool: True if the row was live, False if it was already deleted.
+        """
+        if not 0 <= index < len(self._live):
+            raise IndexError("row index out of range")
+        if not self._live[index]:
+            return False
+        self._live[index] = 0
+        self._count -= 1
+        self._add(index, -1)
+        return True
+
+    def restore(self, index: int) -> bool:
+        """
+        Marks a deleted row as live again.
+
+        Args:
+            index (int): the row to restore
+
+        Returns:
+            bool: True if the row was deleted, False if it was already live.
+        """
+        if not 0 <= index < len(self._live):
+            raise IndexError("row index out of range")
+        if self._live[index]:
+            return False
+        self._live[index] = 1
+        self._count += 1
+        self._add(index, 1)
+        return True
+
+    def rank(self, index: int) -> int:
+        """
+        Counts the live rows strictly before index.
+
+        Args:
+            index (int): a position in range(size + 1)
+
+        Returns:
+            int: the number of live rows in range(index)
+        """
+        tree = self._tree
+        total = 0
+        position = min(index, len(self._live))
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    def select(self, k: int) -> int:
+        """
+        Finds the k-th live row (0-based) by descending the tree.
+
+        Args:
+            k (int): the rank of the row to find, in range(len(self))
+
+        Returns:
+            int: the index of that row
+        """
+        if not 0 <= k < self._count:
+            raise IndexError("live row rank out of range")
+        tree = self._tree
+        size = len(tree) - 1
+        position = 0
+        step = 1 << size.bit_length()
+        while step:
+            candidate = position + step
+            if candidate <= size and tree[candidate] <= k:
+                position = candidate
+                k -= tree[candidate]
+            step >>= 1
+        return position
+
+    def next_live(self, index: int) -> Optional[int]:
+        """
+        Finds the first live row at or after index.
+
+        Args:
+            index (int): where to start looking
+
+        Returns:
+            Optional[int]: the row index, or None when no live row follows.
+        """
+        k = self.rank(index)
+        return self.select(k) if k < self._count else None
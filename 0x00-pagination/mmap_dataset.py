@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Defines MmapDataset, a lazily parsed view over a memory-mapped CSV file.
+"""
+import csv
+import io
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, List, Optional
+
+INDEX_MAGIC = b"PGIDX001"
+INDEX_HEADER = struct.Struct("<8sQQ")  # magic, source size, source mtime_ns
+NEWLINE = re.compile(b"\n")
+
+
+def build_line_index(buffer, start: int = 0, stop: Optional[int] = None) -> array:
+    """
+    Records the byte offset at which every line of buffer starts.
+
+    The returned array holds one offset per line plus a final entry for
+    the end of the data, so line i spans offsets[i]:offsets[i + 1].
+    A trailing line without a newline is included.
+
+    Args:
+        buffer: a bytes-like object (bytes, mmap, memoryview)
+        start (int): the offset at which the first line starts
+        stop (int): the offset at which to stop, by default len(buffer)
+
+    Returns:
+        array('Q'): the line start offsets followed by the end offset
+    """
+    stop = len(buffer) if stop is None else stop
+    offsets = array("Q", [start])
+    offsets.extend(match.end() for match in NEWLINE.finditer(buffer, start, stop))
+    if offsets[-1] != stop:
+        offsets.append(stop)
+    return offsets
+
+
+def parse_rows(data: bytes, encoding: str = "utf-8") -> List[List]:
+    """Parses a run of complete CSV lines into rows."""
+    return list(csv.reader(io.StringIO(data.decode(encoding), newline="")))
+
+
+class MmapDataset(Sequence):
+    """
+    Read-only sequence of CSV rows backed by a memory-mapped file.
+
+    Opening the dataset only maps the file and builds (or loads) a compact
+    array('Q') of row start offsets; rows are parsed on access, so a page
+    read touches just the bytes of the rows it returns. Rows must not
+    contain quoted line breaks, which holds for the baby names data.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None,
+                 persist_index: bool = False, encoding: str = "utf-8"):
+        """
+        Args:
+            path (str): the CSV file to map; its first line is a header
+            index_path (str): where the offset index is persisted, defaults
+                to path + ".idx"
+            persist_index (bool): write the index next to the CSV after
+                building it, and reuse it while the CSV is unchanged
+            encoding (str): the text encoding of the CSV file
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._stamp = (stat.st_size, stat.st_mtime_ns)
+        if stat.st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b""
+        self._offsets = self._load_index() if persist_index else None
+        if self._offsets is None:
+            header_end = self._map.find(b"\n") + 1 or len(self._map)
+            self._offsets = build_line_index(self._map, header_end)
+            if persist_index:
+                self._save_index()
+
+    def _load_index(self) -> Optional[array]:
+        """Reads a persisted index if it matches the current CSV file."""
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or (size, mtime_ns) != self._stamp:
+                    return None
+                offsets = array("Q")
+                offsets.frombytes(f.read())
+                return offsets
+        except (OSError, struct.error):
+            return None
+
+    def _save_index(self) -> None:
+        """Persists the offset index, replacing any previous one atomically."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, *self._stamp))
+            f.write(self._offsets.tobytes())
+        os.replace(tmp_path, self.index_path)
+
+    @property
+    def stamp(self):
+        """The (size, mtime_ns) of the CSV file when it was last mapped."""
+        return self._stamp
+
+    def extend(self, stop: int) -> int:
+        """
+        Maps the file again, unmapping the previous map, and indexes the
+        lines appended since it was opened.
+
+        Args:
+            stop (int): the offset up to which new lines are indexed, which
+                must be the end of a line at or after the current end
+
+        Returns:
+            int: the number of rows added
+        """
+        end = self._offsets[-1]
+        if stop <= end:
+            return 0
+        stat = os.fstat(self._file.fileno())
+        old_map = self._map
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if isinstance(old_map, mmap.mmap):
+            old_map.close()
+        self._stamp = (stat.st_size, stat.st_mtime_ns)
+        added = build_line_index(self._map, end, stop)[1:]
+        self._offsets.extend(added)
+        return len(added)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        """
+        Parses one row, or a list of rows for a slice.
+
+        Args:
+            index (int | slice): row position(s) to read
+
+        Returns:
+            List[str] for an int index, List[List[str]] for a slice.
+        """
+        offsets = self._offsets
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return parse_rows(self._map[offsets[start]:offsets[stop]], self.encoding)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return parse_rows(self._map[offsets[index]:offsets[index + 1]], self.encoding)[0]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        chunk = 4096
+        for start in range(0, len(self), chunk):
+            yield from self[start:start + chunk]
+
+    def close(self) -> None:
+        """Unmaps the file and closes it."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Defines PageCache, a bounded and versioned cache of page results.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Union
+
+
+class LRUPolicy:
+    """Evicts the entry that was read or written least recently."""
+
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def insert(self, key: Hashable) -> None:
+        """Records a new entry."""
+        self._order[key] = None
+
+    def hit(self, key: Hashable) -> None:
+        """Records a read of an entry."""
+        self._order.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Forgets an entry."""
+        self._order.pop(key, None)
+
+    def victim(self) -> Hashable:
+        """Returns the entry to evict next."""
+        return next(iter(self._order))
+
+
+class FIFOPolicy(LRUPolicy):
+    """Evicts the entry that was inserted first, ignoring reads."""
+
+    def hit(self, key: Hashable) -> None:
+        """Reads do not change the eviction order."""
+
+
+POLICIES = {"lru": LRUPolicy, "fifo": FIFOPolicy}
+
+
+class PageCache:
+    """
+    Caches page results, each stamped with the dataset version it came from.
+
+    An entry is only served while the caller's current version matches its
+    stamp, so results computed before a reload or a deletion are never
+    returned; stale entries count as misses and are dropped. The eviction
+    order is delegated to a policy object with insert/hit/remove/victim
+    methods ("lru" and "fifo" are built in). Cached values are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 256, policy: Union[str, object] = "lru"):
+        """
+        Args:
+            maxsize (int): the maximum number of entries kept
+            policy (str | object): "lru", "fifo" or a policy instance
+        """
+        assert isinstance(maxsize, int) and maxsize > 0, "maxsize must be a positive integer"
+        self.maxsize = maxsize
+        self.policy = POLICIES[policy]() if isinstance(policy, str) else policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version) -> Optional[object]:
+        """
+        Looks up a result computed at the given dataset version.
+
+        Args:
+            key (Hashable): identifies the request, e.g. (page, page_size)
+            version: the current dataset version
+
+        Returns:
+            The cached result, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                self.policy.hit(key)
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.policy.remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version, value: object) -> None:
+        """
+        Stores a result, evicting entries beyond maxsize.
+
+        Args:
+            key (Hashable): identifies the request
+            version: the dataset version read before computing value
+            value (object): the result to cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self.policy.remove(key)
+            else:
+                while len(self._entries) >= self.maxsize:
+                    victim = self.policy.victim()
+                    self.policy.remove(victim)
+                    del self._entries[victim]
+                    self.evictions += 1
+            self._entries[key] = (version, value)
+            self.policy.insert(key)
+
+    def clear(self) -> None:
+        """Drops every entry, keeping the counters."""
+        with self._lock:
+            for key in self._entries:
+                self.policy.remove(key)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._entries), "maxsize": self.maxsize}
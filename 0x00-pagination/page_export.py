@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Defines writers streaming dataset rows to a file object.
+"""
+import csv
+import json
+from typing import IO, Iterable, List, Optional
+
+
+def write_csv(rows: Iterable[List], f: IO[str], header: Optional[List] = None) -> int:
+    """
+    Streams rows to a text file object as CSV.
+
+    Args:
+        rows (Iterable[List]): the rows to write, consumed lazily
+        f (IO[str]): a text file object, ideally opened with newline=""
+        header (List): an optional header row written first
+
+    Returns:
+        int: the number of data rows written
+    """
+    writer = csv.writer(f)
+    if header is not None:
+        writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[List], f: IO[str], header: Optional[List] = None) -> int:
+    """
+    Streams rows to a text file object as JSON lines.
+
+    Args:
+        rows (Iterable[List]): the rows to write, consumed lazily
+        f (IO[str]): a text file object
+        header (List): optional field names; when given every row is
+            written as an object keyed by them instead of as an array
+
+    Returns:
+        int: the number of rows written
+    """
+    encode = json.JSONEncoder().encode
+    count = 0
+    for row in rows:
+        f.write(encode(dict(zip(header, row)) if header is not None else row))
+        f.write("\n")
+        count += 1
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
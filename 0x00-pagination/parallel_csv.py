@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Defines multi-process CSV parsing over newline-aligned byte ranges.
+"""
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Optional, Tuple, Union
+from columnar_dataset import dictionary_encode
+from mmap_dataset import parse_rows
+
+MIN_CHUNK_BYTES = 1 << 20
+PARALLEL_MIN_BYTES = 16 << 20  # Smaller files parse faster on one process
+
+
+def split_ranges(path: str, parts: int, start: int = 0,
+                 size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Splits a file into byte ranges that each begin at the start of a line.
+
+    Args:
+        path (str): the file to split
+        parts (int): the desired number of ranges
+        start (int): the offset of the first byte to cover
+        size (int): the offset to stop at, by default the file size
+
+    Returns:
+        List[tuple(start, stop)]: consecutive ranges covering start to size
+    """
+    size = os.path.getsize(path) if size is None else size
+    step = max((size - start) // max(parts, 1), MIN_CHUNK_BYTES)
+    bounds = [start]
+    with open(path, "rb") as f:
+        while bounds[-1] + step < size:
+            f.seek(bounds[-1] + step - 1)
+            f.readline()
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_range(path: str, start: int, stop: int, encoding: str = "utf-8") -> List[List]:
+    """
+    Parses the complete CSV lines stored between two byte offsets.
+
+    Args:
+        path (str): the CSV file
+        start (int): a line start offset
+        stop (int): a line start offset (or the file size) after start
+
+    Returns:
+        List[List]: the rows in the range
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        return parse_rows(f.read(stop - start), encoding)
+
+
+def encode_range(path: str, start: int, stop: int,
+                 encoding: str = "utf-8") -> Union[Tuple, List[List]]:
+    """
+    Parses a range like parse_range and dictionary-encodes its columns.
+
+    Each distinct value is sent back once and every row as one integer
+    per column, which pickles far smaller than the rows themselves.
+    Rows of differing widths (a blank line parses as []) cannot be
+    encoded; they are sent back as they are.
+
+    Returns:
+        tuple(tables, codes, length): see columnar_dataset.dictionary_encode,
+        or List[List]: the rows, when they are not all as wide
+    """
+    rows = parse_range(path, start, stop, encoding)
+    try:
+        return dictionary_encode(rows)
+    except ValueError:
+        return rows
+
+
+def merge_encoded(chunks: Iterable[Union[Tuple, List[List]]]
+                  ) -> Tuple[List[List[str]], List[array], int]:
+    """
+    Concatenates chunks from encode_range, in order, into one encoding.
+
+    Args:
+        chunks (Iterable): (tables, codes, length) triples, or lists of rows
+
+    Returns:
+        tuple(tables, codes, length): the encoding of all the chunks' rows
+
+    Raises:
+        ValueError: a row is not as wide as the first one; the message
+            numbers rows across the file, as dictionary_encode does
+    """
+    lookups = []
+    tables = []
+    codes = []
+    length = 0
+    for chunk in chunks:
+        if isinstance(chunk, list):
+            width = len(lookups) if lookups else len(chunk[0])
+            for offset, row in enumerate(chunk):
+                if len(row) != width:
+                    raise ValueError("row {} has {} fields, expected {}".format(
+                        length + offset, len(row), width))
+            chunk = dictionary_encode(chunk)
+        chunk_tables, chunk_codes, chunk_length = chunk
+        if not chunk_length:
+            continue
+        if not lookups:
+            lookups = [{} for _ in chunk_tables]
+            tables = [[] for _ in chunk_tables]
+            codes = [array("I") for _ in chunk_tables]
+        if len(chunk_tables) != len(lookups):
+            raise ValueError("row {} has {} fields, expected {}".format(
+                length, len(chunk_tables), len(lookups)))
+        for lookup, table, column, chunk_table, chunk_column in zip(
+                lookups, tables, codes, chunk_tables, chunk_codes):
+            remap = []
+            for value in chunk_table:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(table)
+                    table.append(sys.intern(value))
+                remap.append(code)
+            column.extend(map(remap.__getitem__, chunk_column))
+        length += chunk_length
+    return tables, codes, length
+
+
+def decode_rows(tables: List[List[str]], codes: List[array], length: int) -> List[List]:
+    """Turns a dictionary encoding back into a list of rows."""
+    if not length:
+        return []
+    columns = [list(map(table.__getitem__, column)) for table, column in zip(tables, codes)]
+    return list(map(list, zip(*columns)))
+
+
+def use_processes(workers: int, size: int) -> bool:
+    """
+    Tells whether parsing size bytes on worker processes can beat one process.
+
+    Worker start-up and result transfer only pay off with several CPUs
+    and at least PARALLEL_MIN_BYTES to parse.
+
+    Args:
+        workers (int): the number of worker processes asked for
+        size (int): the number of bytes to parse
+    """
+    return workers > 1 and (os.cpu_count() or 1) > 1 and size >= PARALLEL_MIN_BYTES
+
+
+def read_encoded_parallel(path: str, workers: int, encoding: str = "utf-8",
+                          size: Optional[int] = None) -> Tuple[List[List[str]], List[array], int]:
+    """
+    Parses and dictionary-encodes a CSV file, minus its header row, on
+    several processes, or on the calling one when that would be faster
+    (see use_processes). Rows must not contain quoted line breaks.
+
+    Args:
+        path (str): the CSV file
+        workers (int): the number of worker processes
+        size (int): how many bytes of the file to parse, by default all
+
+    Returns:
+        tuple(tables, codes, length): see columnar_dataset.dictionary_encode
+    """
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+    ranges = split_ranges(path, workers * 4, header_end, size)
+    if len(ranges) <= 1 or not use_processes(workers, ranges[-1][1] - header_end):
+        return dictionary_encode(row for start, stop in ranges
+                                 for row in parse_range(path, start, stop, encoding))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, stops = zip(*ranges)
+        return merge_encoded(executor.map(encode_range, repeat(path), starts, stops,
+                                          repeat(encoding)))
+
+
+def read_rows_parallel(path: str, workers: int, encoding: str = "utf-8",
+                       size: Optional[int] = None) -> List[List]:
+    """
+    Parses a CSV file, minus its header row, on several processes.
+
+    Ranges are parsed independently and concatenated in file order, so
+    row i is the same row a sequential csv.reader pass would yield at i,
+    blank lines ([]) and ragged rows included. Workers send their rows
+    back dictionary-encoded when they are all as wide. On a single CPU, or
+    below PARALLEL_MIN_BYTES, the file is parsed on the calling process.
+    Rows must not contain quoted line breaks.
+
+    Args:
+        path (str): the CSV file
+        workers (int): the number of worker processes
+        size (int): how many bytes of the file to parse, by default all
+
+    Returns:
+        List[List]: every data row of the file
+    """
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+    ranges = split_ranges(path, workers * 4, header_end, size)
+    if len(ranges) <= 1 or not use_processes(workers, ranges[-1][1] - header_end):
+        return [row for start, stop in ranges for row in parse_range(path, start, stop, encoding)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, stops = zip(*ranges)
+        rows = []
+        for chunk in executor.map(encode_range, repeat(path), starts, stops,
+                                  repeat(encoding)):
+            rows.extend(chunk if isinstance(chunk, list) else decode_rows(*chunk))
+        return rows
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Defines Prefetcher, a background read-ahead buffer for page results.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+
+class Prefetcher:
+    """
+    Computes likely next pages on a background thread and parks the results.
+
+    After serving a page, a server schedules the page its response points
+    to; when that page is requested it is taken from the buffer instead of
+    being computed again. Results are stamped with the dataset version read
+    before scheduling, like PageCache entries, and only taken while the
+    version still matches. At most maxsize results are parked; the oldest
+    is dropped first. A single worker thread does the reading, so
+    read-ahead never competes with itself for the storage backend.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        """
+        Args:
+            maxsize (int): the maximum number of pages scheduled or parked
+        """
+        assert isinstance(maxsize, int) and maxsize > 0, "maxsize must be a positive integer"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.scheduled = 0
+        self.wasted = 0  # Scheduled pages dropped, stale or failed before use
+        self._futures = OrderedDict()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, version, compute: Callable[[], object]) -> None:
+        """
+        Starts computing a page in the background, unless it already is.
+
+        Args:
+            key (Hashable): identifies the page, as the caller will ask for it
+            version: the dataset version read before scheduling
+            compute (Callable): produces the page result
+        """
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    return
+                self._discard(key)
+            while len(self._futures) >= self.maxsize:
+                self._discard(next(iter(self._futures)))
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="prefetch")
+            self._futures[key] = (version, self._executor.submit(compute))
+            self.scheduled += 1
+
+    def _discard(self, key: Hashable) -> None:
+        """Drops a scheduled page, cancelling it if it has not started."""
+        self._futures.pop(key)[1].cancel()
+        self.wasted += 1
+
+    def take(self, key: Hashable, version) -> Optional[object]:
+        """
+        Removes and returns a prefetched page computed at the given version.
+
+        A page still being computed is waited for, which is never slower
+        than computing it again.
+
+        Args:
+            key (Hashable): identifies the page
+            version: the current dataset version
+
+        Returns:
+            The page result, or None when it was not prefetched, is stale,
+            or failed to compute.
+        """
+        with self._lock:
+            entry = self._futures.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version:
+                entry[1].cancel()
+                self.wasted += 1
+                self.misses += 1
+                return None
+        try:
+            result = entry[1].result()
+        except Exception:
+            result = None
+        with self._lock:
+            if result is None:
+                self.wasted += 1
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def clear(self) -> None:
+        """Drops every scheduled page, keeping the counters."""
+        with self._lock:
+            for key in list(self._futures):
+                self._discard(key)
+
+    def close(self) -> None:
+        """Drops every scheduled page and stops the worker thread."""
+        self.clear()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the hit, miss, scheduled and wasted counters and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "scheduled": self.scheduled, "wasted": self.wasted,
+                    "size": len(self._futures), "maxsize": self.maxsize,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
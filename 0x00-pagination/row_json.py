@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Defines RowJsonCache and the assembly of JSON responses from fragments.
+"""
+import json
+import threading
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+_encode = json.JSONEncoder().encode
+
+
+def iter_runs(indexes: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """
+    Groups ascending indexes into contiguous runs.
+
+    Yields:
+        tuple(start, stop): one half-open range per run
+    """
+    run_start = 0
+    for position in range(1, len(indexes) + 1):
+        if position == len(indexes) or indexes[position] != indexes[position - 1] + 1:
+            yield indexes[run_start], indexes[position - 1] + 1
+            run_start = position
+
+
+class RowJsonCache:
+    """
+    Keeps the JSON encoding of dataset rows as bytes, rendered once per row.
+
+    Rows are rendered on first use, a contiguous run at a time, or all at
+    once with render_all. Rows appended to the dataset are picked up
+    automatically; a reloaded dataset needs a new cache.
+    """
+
+    def __init__(self, dataset: Sequence[List]):
+        self._dataset = dataset
+        self._fragments: List[bytes] = []
+        self._lock = threading.Lock()
+
+    def render_all(self) -> None:
+        """Renders every row of the dataset now."""
+        self.fragments(range(len(self._dataset)))
+
+    def fragments(self, indexes: Sequence[int]) -> List[bytes]:
+        """
+        Returns the JSON encoding of the rows at the given ascending indexes.
+
+        Args:
+            indexes (Sequence[int]): positions in the dataset, ascending
+
+        Returns:
+            List[bytes]: one fragment per index, e.g. b'["2011", "FEMALE", ...]'
+        """
+        fragments = self._fragments
+        if len(fragments) < len(self._dataset) or any(fragments[i] is None for i in indexes):
+            with self._lock:
+                if len(fragments) < len(self._dataset):
+                    fragments.extend([None] * (len(self._dataset) - len(fragments)))
+                missing = [i for i in indexes if fragments[i] is None]
+                for start, stop in iter_runs(missing):
+                    for index, row in enumerate(self._dataset[start:stop], start):
+                        fragments[index] = _encode(row).encode()
+        return [fragments[i] for i in indexes]
+
+
+def encode_envelope(fields: Dict, data: List[bytes]) -> bytes:
+    """
+    Serializes a response dict whose "data" entry is given as row fragments.
+
+    The output is byte-for-byte what json.dumps(fields).encode() would
+    produce if fields["data"] held the decoded rows.
+
+    Args:
+        fields (Dict): the response metadata, in output order, with a
+            "data" key marking where the rows go
+        data (List[bytes]): the pre-rendered rows
+
+    Returns:
+        bytes: the JSON document
+    """
+    parts = []
+    for key, value in fields.items():
+        rendered = b"[" + b", ".join(data) + b"]" if key == "data" else _encode(value).encode()
+        parts.append(_encode(key).encode() + b": " + rendered)
+    return b"{" + b", ".join(parts) + b"}"
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Defines ReadWriteLock, a writer-preferring shared/exclusive lock.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """
+    Lets many readers or a single writer hold the lock at a time.
+
+    A waiting writer blocks new readers, so a steady stream of page reads
+    cannot starve deletions. The lock is not reentrant: a thread holding
+    it must not acquire it again.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read_lock(self) -> Iterator[None]:
+        """Holds the lock shared for the duration of the with block."""
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Holds the lock exclusively for the duration of the with block."""
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
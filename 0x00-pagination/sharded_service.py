@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Defines ShardedService, pagination served by shard processes over shared rows.
+
+The parent publishes the dataset once in shared memory and starts one
+process per shard; each shard attaches to the segment and owns a
+contiguous range of rows, with its own deletion index over that range.
+The ShardedService object in the parent routes every request to the
+shards holding the rows it needs and merges their answers.
+
+Usage: ./sharded_service.py [csv] [shards]
+"""
+import multiprocessing
+import sys
+import threading
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+from shared_dataset import SharedDataset, unlink_dataset
+get_pagination_range = __import__('0-simple_helper_function').get_pagination_range
+del_pagination = __import__('3-hypermedia_del_pagination')
+
+
+class _RowRange(Sequence):
+    """The rows in range(start, stop) of a dataset, numbered from 0."""
+
+    def __init__(self, dataset: Sequence[List], start: int, stop: int):
+        self._dataset = dataset
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return self._dataset[self._start + start:self._start + stop:step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self._dataset[self._start + index]
+
+
+def _serve_shard(conn, shm_name: str, start: int, stop: int) -> None:
+    """
+    Runs one shard: answers requests about rows start..stop-1 until told to stop.
+
+    Requests are tuples whose first item names the operation; positions in
+    requests and answers are local to the shard. Every answer is a pair
+    (ok, value) where value is the exception raised when ok is False.
+    """
+    shared = SharedDataset.attach(shm_name)
+    rows = _RowRange(shared, start, stop)
+    indexed = del_pagination.IndexedDataset(rows)
+    hyper_indexes = del_pagination.Server._hyper_indexes
+    try:
+        while True:
+            request = conn.recv()
+            operation = request[0]
+            if operation == "stop":
+                break
+            try:
+                if operation == "page":
+                    value = rows[request[1]:request[2]]
+                elif operation == "hyper":
+                    indexes = hyper_indexes(indexed, request[1], request[2])[0]
+                    value = (indexes, indexed.rows(indexes))
+                elif operation == "delete":
+                    del indexed[request[1]]
+                    value = None
+                elif operation == "restore":
+                    indexed.restore(request[1])
+                    value = None
+                else:
+                    raise ValueError("Unknown operation: {}".format(operation))
+            except Exception as error:  # Re-raised by the router
+                conn.send((False, error))
+            else:
+                conn.send((True, value))
+    finally:
+        conn.close()
+        del rows, indexed
+        shared.close()
+
+
+class ShardedService:
+    """
+    Routes pagination requests to shard processes sharing one dataset.
+
+    get_page and get_hyper_index return what the single-process Servers
+    return. A page spanning several shards is requested from all of them
+    before any answer is awaited, so the shards work on it in parallel.
+    Deletions are applied by the shard owning the row; a page crossing
+    shards is not isolated from deletions made while it is being read.
+    """
+
+    def __init__(self, server, shards: int = 2, start_method: Optional[str] = None):
+        """
+        Publishes the dataset of server and starts the shard processes.
+
+        Args:
+            server (BaseServer): reads the CSV; its DATA_FILE is published
+            shards (int): the number of shard processes
+            start_method (str): the multiprocessing start method, by default
+                the platform's
+        """
+        assert isinstance(shards, int) and shards > 0, "shards must be a positive integer"
+        self.segment = server.share_dataset()
+        total = len(SharedDataset(self.segment))
+        self.total = total
+        self.bounds = [total * shard // shards for shard in range(shards + 1)]
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._locks = []
+        self._processes = []
+        for shard in range(shards):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_serve_shard, daemon=True,
+                                      args=(child_end, self.segment.name,
+                                            self.bounds[shard], self.bounds[shard + 1]))
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+    def __enter__(self) -> "ShardedService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _shard_of(self, index: int) -> int:
+        """Returns the shard owning row index."""
+        shard = 0
+        while self.bounds[shard + 1] <= index:
+            shard += 1
+        return shard
+
+    def _call(self, requests: Dict[int, tuple]) -> Dict[int, object]:
+        """Sends one request per shard, then collects every answer."""
+        shards = sorted(requests)
+        for shard in shards:  # Ascending lock order avoids deadlocks
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._connections[shard].send(requests[shard])
+            answers = {shard: self._connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+        for ok, value in answers.values():
+            if not ok:
+                raise value
+        return {shard: value for shard, (ok, value) in answers.items()}
+
+    def get_page(self, current_page: int = 1, items_per_page: int = 10) -> List[List]:
+        """
+        Retrieves a specific page of data, like Server.get_page.
+
+        Args:
+            current_page (int): The desired page number.
+            items_per_page (int): The number of items per page.
+
+        Returns:
+            List[List]: A subset of the dataset for the requested page.
+        """
+        assert isinstance(current_page, int) and current_page > 0
+        assert isinstance(items_per_page, int) and items_per_page > 0
+        start_index, end_index = get_pagination_range(current_page, items_per_page)
+        end_index = min(end_index, self.total)
+        requests = {}
+        for shard in range(len(self._connections)):
+            low = max(start_index, self.bounds[shard])
+            high = min(end_index, self.bounds[shard + 1])
+            if low < high:
+                offset = self.bounds[shard]
+                requests[shard] = ("page", low - offset, high - offset)
+        answers = self._call(requests) if requests else {}
+        return [row for shard in sorted(answers) for row in answers[shard]]
+
+    def get_hyper_index(self, start_index: int = None, page_size: int = 10) -> Dict:
+        """
+        Provides a deletion-resilient page of data, like Server.get_hyper_index.
+
+        Shards are asked in turn until the page is full or the rows run out.
+
+        Args:
+            start_index (int): The index of the first item to display.
+            page_size (int): Number of records to include on the page.
+
+        Returns:
+            Dict: start_index, page_size, data and next_index.
+        """
+        assert start_index is not None and 0 <= start_index < self.total, \
+            "start_index must be within dataset range"
+        indexes = []
+        data = []
+        shard = self._shard_of(start_index)
+        local_start = start_index - self.bounds[shard]
+        while shard < len(self._connections) and len(indexes) < page_size:
+            offset = self.bounds[shard]
+            if offset + local_start < self.bounds[shard + 1]:
+                answer = self._call({shard: ("hyper", local_start, page_size - len(indexes))})
+                shard_indexes, rows = answer[shard]
+                indexes.extend(offset + index for index in shard_indexes)
+                data.extend(rows)
+            shard += 1
+            local_start = 0
+
+        next_index = indexes[-1] + 1 if indexes and len(indexes) == page_size else None
+        if next_index is not None and next_index >= self.total:
+            next_index = None
+        return {
+            "start_index": start_index,
+            "page_size": len(data),
+            "data": data,
+            "next_index": next_index
+        }
+
+    def delete(self, index: int) -> None:
+        """Deletes a record; raises KeyError if it is already deleted."""
+        if not 0 <= index < self.total:
+            raise KeyError(index)
+        shard = self._shard_of(index)
+        try:
+            self._call({shard: ("delete", index - self.bounds[shard])})
+        except KeyError:
+            raise KeyError(index) from None
+
+    def restore(self, index: int) -> None:
+        """Restores a previously deleted record."""
+        if not 0 <= index < self.total:
+            raise KeyError(index)
+        shard = self._shard_of(index)
+        try:
+            self._call({shard: ("restore", index - self.bounds[shard])})
+        except KeyError:
+            raise KeyError(index) from None
+
+    def close(self) -> None:
+        """Stops the shard processes and frees the shared memory."""
+        for shard, connection in enumerate(self._connections):
+            with self._locks[shard]:
+                try:
+                    connection.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(5)
+        self._connections = []
+        self._processes = []
+        if self.segment is not None:
+            unlink_dataset(self.segment)
+            self.segment = None
+
+
+if __name__ == "__main__":
+    BaseServer = __import__('base_server').BaseServer
+
+    class CsvServer(BaseServer):
+        DATA_FILE = sys.argv[1] if len(sys.argv) > 1 else BaseServer.DATA_FILE
+
+    with ShardedService(CsvServer(), int(sys.argv[2]) if len(sys.argv) > 2 else 4) as service:
+        print(service.get_page(1, 3))
+        page = service.get_hyper_index(service.bounds[1] - 2, 4)
+        print(page["start_index"], page["next_index"], len(page["data"]))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Defines SharedDataset, a snapshot-encoded dataset held in shared memory.
+
+A parent process publishes the dataset once with publish_dataset; any
+number of worker processes then attach to the segment by name and read
+rows in place, so the row records exist once however many workers run.
+"""
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, List, Optional, Tuple
+from dataset_snapshot import SnapshotDataset, encode_snapshot
+
+
+def publish_dataset(records: Iterable[List[str]], name: Optional[str] = None,
+                    stamp: Tuple[int, int] = (0, 0)) -> shared_memory.SharedMemory:
+    """
+    Encodes rows in the snapshot layout into a new shared memory segment.
+
+    The caller owns the segment: it must release it with unlink_dataset
+    once no worker needs it any more.
+
+    Args:
+        records (Iterable[List[str]]): the header row followed by data rows
+        name (str): the segment name, by default a random one
+        stamp (tuple): the (size, mtime_ns) of the source CSV
+
+    Returns:
+        SharedMemory: the segment; workers attach with its .name
+    """
+    data = encode_snapshot(records, stamp)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(len(data), 1))
+    segment.buf[:len(data)] = data
+    return segment
+
+
+def unlink_dataset(segment: shared_memory.SharedMemory) -> None:
+    """Closes and unlinks a segment returned by publish_dataset."""
+    if sys.version_info < (3, 13):
+        # Workers sharing this process's resource tracker withdrew its
+        # registration when attaching; unlink() expects to find one
+        resource_tracker.register(segment._name, "shared_memory")
+    segment.close()
+    segment.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attaches to an existing segment without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching registers the segment with the resource tracker,
+    # which would unlink it when the worker exits; the registration is
+    # withdrawn right away, leaving ownership with the publisher
+    segment = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class SharedDataset(SnapshotDataset):
+    """
+    SnapshotDataset reading its records from a shared memory segment.
+
+    Row records are viewed in place; only the table of distinct strings is
+    decoded in each attaching process.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory):
+        """
+        Args:
+            segment (SharedMemory): a segment written by publish_dataset
+
+        Raises:
+            ValueError: the segment does not hold a dataset
+        """
+        super().__init__(segment.buf)
+        self.segment = segment
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDataset":
+        """
+        Attaches to a published dataset by segment name.
+
+        Raises:
+            FileNotFoundError: no segment has that name
+            ValueError: the segment does not hold a dataset
+        """
+        segment = _attach(name)
+        try:
+            return cls(segment)
+        except ValueError:
+            segment.close()
+            raise
+
+    def close(self) -> None:
+        """Detaches from the segment; rows can no longer be read."""
+        super().close()
+        self.segment.close()
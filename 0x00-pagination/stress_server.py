@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress check for the pagination servers.
+
+Verifies that concurrent first requests load the dataset exactly once,
+and that deletions and restorations running alongside page reads leave
+pages and the live index consistent. Exits non-zero on failure.
+
+Usage: ./stress_server.py [rows] [threads]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+from synthetic_names import generate_names_csv
+HyperServer = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def run_threads(count: int, target) -> list:
+    """Starts count threads on target(number) together; returns their errors."""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(number):
+        barrier.wait()
+        try:
+            target(number)
+        except Exception as error:  # Reported by the caller
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def check_single_flight(path: str, threads: int) -> None:
+    """Asserts N concurrent first requests trigger one load and one index build."""
+    loads = []
+
+    class CountingServer(HyperServer):
+        DATA_FILE = path
+
+        def _open_dataset(self):
+            loads.append(threading.get_ident())
+            return super()._open_dataset()
+
+    server = CountingServer()
+    errors = run_threads(threads, lambda n: (server.get_page(n + 1, 10),
+                                              server.get_filtered_page(1, 10, gender="MALE")))
+    assert not errors, errors
+    assert len(loads) == 1, "dataset loaded {} times".format(len(loads))
+
+
+def check_deletions(path: str, threads: int, rounds: int = 300) -> None:
+    """Runs deleters and readers together and checks every page they see."""
+
+    class StressServer(DelServer):
+        DATA_FILE = path
+
+    server = StressServer()
+    size = len(server.load_dataset())
+
+    def work(number):
+        rng = random.Random(number)
+        for _ in range(rounds):
+            if number % 2:
+                index = rng.randrange(size)
+                if rng.random() < 0.7:
+                    try:
+                        server.delete(index)
+                    except KeyError:
+                        pass  # Already deleted by another thread
+                else:
+                    server.restore(index)
+            else:
+                page = server.get_hyper_index(rng.randrange(size), 25)
+                assert page["page_size"] == len(page["data"]) <= 25
+                if page["next_index"] is not None:
+                    assert page["next_index"] > page["start_index"]
+
+    errors = run_threads(threads, work)
+    assert not errors, errors
+    live_index = server.load_indexed_dataset().live_index
+    live = list(live_index)
+    assert len(live) == len(live_index) == live_index.rank(size)
+    assert all(live_index.select(k) == index for k, index in enumerate(live))
+    pages = server.iter_hyper_index(0, 97)
+    assert sum(page["page_size"] for page in pages) == len(live)
+
+
+def main(rows: int = 20000, threads: int = 16) -> None:
+    """Generates a dataset and runs every check."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "names.csv")
+        generate_names_csv(path, rows)
+        check_single_flight(path, threads)
+        check_deletions(path, threads)
+    print("OK")
+
+
+if __name__ == "__main__":
+    try:
+        main(*(int(arg) for arg in sys.argv[1:3]))
+    except AssertionError as error:
+        print("FAIL:", error)
+        sys.exit(1)
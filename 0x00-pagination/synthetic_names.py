@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Generates synthetic popular baby names CSV files for benchmarks.
+"""
+import csv
+import random
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name", "Count", "Rank"]
+YEARS = [str(year) for year in range(2011, 2020)]
+GENDERS = ["FEMALE", "MALE"]
+ETHNICITIES = ["ASIAN AND PACIFIC ISLANDER", "BLACK NON HISPANIC",
+               "HISPANIC", "WHITE NON HISPANIC"]
+SYLLABLES = ["a", "ri", "la", "no", "ah", "em", "ma", "li", "am", "so",
+             "phi", "ja", "cob", "ol", "iv", "is", "ael", "den", "ev", "zo"]
+
+
+def generate_names_csv(path: str, rows: int, seed: int = 0) -> None:
+    """
+    Writes a CSV shaped like Popular_Baby_Names.csv.
+
+    Args:
+        path (str): the file to write
+        rows (int): the number of data rows, excluding the header
+        seed (int): the random seed, so runs are reproducible
+    """
+    rng = random.Random(seed)
+    names = sorted({"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+                    for _ in range(5000)})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for _ in range(rows):
+            writer.writerow([rng.choice(YEARS), rng.choice(GENDERS), rng.choice(ETHNICITIES),
+                             rng.choice(names), rng.randint(10, 300), rng.randint(1, 100)])
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests of AsyncServer and its HTTP endpoint.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from async_server import AsyncServer, PaginationServer
+from synthetic_names import generate_names_csv
+
+
+class TestAsyncServer(unittest.IsolatedAsyncioTestCase):
+    """Awaitable pages equal the pages of the wrapped server."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, 120)
+        self.server_class = type("TestServer", (PaginationServer,), {"DATA_FILE": self.path})
+
+    def server(self, **options) -> AsyncServer:
+        """Wraps a fresh PaginationServer, closing its dataset after the test."""
+        server = self.server_class(**options)
+        self.addCleanup(lambda: getattr(server._dataset, "close", lambda: None)())
+        return AsyncServer(server)
+
+    async def test_pages(self):
+        for storage in ("rows", "mmap"):
+            server = self.server(storage=storage)
+            reference = self.server_class()
+            self.assertEqual(await server.get_page(3, 10), reference.get_page(3, 10))
+            self.assertEqual(await server.get_pagination_info(2, 25),
+                             reference.get_pagination_info(2, 25))
+            self.assertEqual(await server.get_hyper_index(7, 10),
+                             reference.get_hyper_index(7, 10))
+
+    async def test_single_load(self):
+        server = self.server()
+        with mock.patch.object(server.server, "load_indexed_dataset",
+                               wraps=server.server.load_indexed_dataset) as load:
+            pages = await asyncio.gather(*(server.get_page(page, 10) for page in range(1, 9)))
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(pages, [server.server.get_page(page, 10) for page in range(1, 9)])
+
+    async def test_failed_load_is_retried(self):
+        server = self.server()
+        server.server.DATA_FILE = self.path + ".missing"
+        with self.assertRaises(FileNotFoundError):
+            await server.get_page()
+        server.server.DATA_FILE = self.path
+        self.assertEqual(len(await server.get_page()), 10)
+
+    async def request(self, port: int, target: str) -> tuple:
+        """Sends one GET and returns the status code and decoded body."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("GET {} HTTP/1.1\r\nConnection: close\r\n\r\n".format(target).encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def test_http(self):
+        server = self.server()
+        listener = await server.serve_http(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reference = self.server_class()
+            self.assertEqual(await self.request(port, "/page?page=2&page_size=5"),
+                             (200, reference.get_page(2, 5)))
+            self.assertEqual(await self.request(port, "/pagination_info?page=3"),
+                             (200, reference.get_pagination_info(3, 10)))
+            self.assertEqual(await self.request(port, "/hyper_index?index=4&page_size=3"),
+                             (200, reference.get_hyper_index(4, 3)))
+            self.assertEqual((await self.request(port, "/page?page=0"))[0], 400)
+            self.assertEqual((await self.request(port, "/page?page=x"))[0], 400)
+            self.assertEqual((await self.request(port, "/elsewhere"))[0], 404)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Tests of BaseServer: storage backends, lazy loading, refresh and export.
+"""
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from base_server import BaseServer
+from synthetic_names import generate_names_csv
+
+APPENDED = "2019,MALE,HISPANIC,Noah,10,1\r\n2019,FEMALE,WHITE NON HISPANIC,Ava,11,2\r\n"
+
+
+class ServerTestCase(unittest.TestCase):
+    """Gives each test a fresh CSV and a BaseServer subclass reading it."""
+
+    ROWS = 500
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "names.csv")
+        generate_names_csv(self.path, self.ROWS)
+        self.server_class = type("TestServer", (BaseServer,), {"DATA_FILE": self.path})
+
+    def rows(self) -> list:
+        """The data rows of the CSV as csv.reader reads them."""
+        with open(self.path, newline="") as f:
+            return list(csv.reader(f))[1:]
+
+    def server(self, **options) -> BaseServer:
+        """Creates a server, closing its dataset after the test."""
+        server = self.server_class(**options)
+        self.addCleanup(lambda: getattr(server._dataset, "close", lambda: None)())
+        return server
+
+    def append(self, text: str = APPENDED) -> None:
+        """Appends raw text to the CSV."""
+        with open(self.path, "a", newline="") as f:
+            f.write(text)
+
+
+class TestStorages(ServerTestCase):
+    """Every storage backend serves the rows of the CSV."""
+
+    def test_backends_agree(self):
+        expected = self.rows()
+        for storage in ("rows", "columnar", "mmap", "snapshot", "compressed"):
+            dataset = self.server(storage=storage, block_rows=64).load_dataset()
+            self.assertEqual(len(dataset), len(expected), storage)
+            self.assertEqual(dataset[0:10], expected[0:10], storage)
+            self.assertEqual(dataset[480:520], expected[480:], storage)
+            self.assertEqual(list(dataset), expected, storage)
+
+    def test_unknown_storage(self):
+        with self.assertRaises(AssertionError):
+            self.server_class(storage="tape")
+        with self.assertRaises(AssertionError):
+            self.server_class(storage="shared")
+
+    def test_snapshot_is_rebuilt_when_stale(self):
+        server = self.server(storage="snapshot")
+        self.assertEqual(len(server.load_dataset()), self.ROWS)
+        self.assertTrue(os.path.exists(self.path + ".snap"))
+        self.append()
+        self.assertEqual(len(self.server(storage="snapshot").load_dataset()), self.ROWS + 2)
+
+    def test_from_snapshot_with_quoted_newlines(self):
+        self.append('2019,MALE,HISPANIC,"Two\nlines",10,1\r\n')
+        snapshot = os.path.join(self.directory, "custom.snap")
+        server = self.server_class.from_snapshot(snapshot)
+        self.addCleanup(lambda: server._dataset.close())
+        self.assertEqual(server.load_dataset()[-1], self.rows()[-1])
+        self.assertEqual(server.load_dataset()[-1][3], "Two\nlines")
+
+    def test_rows_storage_imports_no_backend(self):
+        code = ("import sys\n"
+                "server = __import__('1-simple_pagination').Server()\n"
+                "server.DATA_FILE = sys.argv[1]\n"
+                "server.get_page(1, 10)\n"
+                "print([name for name in ('columnar_dataset', 'mmap_dataset', "
+                "'dataset_snapshot', 'compressed_dataset', 'shared_dataset', "
+                "'parallel_csv') if name in sys.modules])\n")
+        output = subprocess.run([sys.executable, "-c", code, self.path], check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+class TestLoading(ServerTestCase):
+    """The dataset is loaded once, however many threads ask for it."""
+
+    def test_single_flight(self):
+        server = self.server()
+        calls = []
+        read_rows = server.read_rows
+        barrier = threading.Barrier(8)
+
+        def counting_read_rows(size=None):
+            calls.append(size)
+            return read_rows(size)
+
+        results = []
+
+        def load():
+            barrier.wait()
+            results.append(server.load_dataset())
+
+        with mock.patch.object(server, "read_rows", counting_read_rows):
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+class TestRefresh(ServerTestCase):
+    """refresh() tails appended rows and reloads rewritten files."""
+
+    def test_unchanged(self):
+        server = self.server()
+        self.assertEqual(server.refresh(), "unchanged")
+        server.load_dataset()
+        self.assertEqual(server.refresh(), "unchanged")
+        self.assertEqual(server.version, 0)
+
+    def test_append_in_place(self):
+        for storage in ("rows", "columnar", "mmap"):
+            generate_names_csv(self.path, self.ROWS)
+            server = self.server(storage=storage)
+            dataset = server.load_dataset()
+            self.append()
+            self.assertEqual(server.refresh(), "appended", storage)
+            self.assertIs(server.load_dataset(), dataset)
+            self.assertEqual(list(dataset), self.rows(), storage)
+            self.assertEqual(server.version, 1)
+
+    def test_partial_line_waits(self):
+        server = self.server()
+        server.load_dataset()
+        self.append("2019,MALE,HISP")
+        self.assertEqual(server.refresh(), "unchanged")
+        self.assertEqual(len(server.load_dataset()), self.ROWS)
+        self.append("ANIC,Noah,10,1\r\n")
+        self.assertEqual(server.refresh(), "appended")
+        self.assertEqual(server.load_dataset()[-1], ["2019", "MALE", "HISPANIC", "Noah", "10", "1"])
+
+    def test_rewrite_reloads(self):
+        server = self.server()
+        old = server.load_dataset()
+        generate_names_csv(self.path, self.ROWS + 20, seed=1)
+        self.assertEqual(server.refresh(), "reloaded")
+        self.assertIsNot(server.load_dataset(), old)
+        self.assertEqual(list(server.load_dataset()), self.rows())
+
+    def test_reload_closes_the_replaced_dataset(self):
+        for storage in ("snapshot", "compressed"):
+            generate_names_csv(self.path, self.ROWS)
+            server = self.server(storage=storage)
+            old = server.load_dataset()
+            self.append()
+            self.assertEqual(server.refresh(), "reloaded", storage)
+            self.assertEqual(len(server.load_dataset()), self.ROWS + 2)
+            with self.assertRaises((ValueError, TypeError)):
+                old[0]
+
+    def test_refresh_interval(self):
+        server = self.server(refresh_interval=0)
+        server.load_dataset()
+        self.append()
+        self.assertEqual(len(server.load_dataset()), self.ROWS + 2)
+
+    def test_hooks(self):
+        events = []
+        server_class = type("HookServer", (self.server_class,), {
+            "_on_rows_appended": lambda self, first_row: events.append(("appended", first_row)),
+            "_on_reload": lambda self: events.append(("reload",))})
+        server = server_class()
+        server.load_dataset()
+        self.append()
+        server.refresh()
+        generate_names_csv(self.path, 10)
+        server.refresh()
+        self.assertEqual(events, [("appended", self.ROWS), ("reload",)])
+
+
+class TestExport(ServerTestCase):
+    """Pages and exports stream the whole dataset."""
+
+    def test_iter_pages(self):
+        server = self.server()
+        pages = list(server.iter_pages(64))
+        self.assertEqual(len(pages), 8)
+        self.assertEqual([row for page in pages for row in page], self.rows())
+        self.assertEqual(next(server.iter_pages(100, 3)), self.rows()[200:300])
+        self.assertEqual(list(server.iter_pages(10, 51)), [])
+        self.assertEqual(list(server.iter_rows(7)), self.rows())
+        with self.assertRaises(AssertionError):
+            next(server.iter_pages(0))
+
+    def test_export_csv(self):
+        f = io.StringIO(newline="")
+        self.assertEqual(self.server(storage="mmap").export(f, page_size=33), self.ROWS)
+        with open(self.path, newline="") as source:
+            self.assertEqual(f.getvalue(), source.read())
+
+    def test_export_jsonl(self):
+        f = io.StringIO()
+        self.server().export(f, "jsonl", header=False)
+        self.assertEqual([json.loads(line) for line in f.getvalue().splitlines()], self.rows())
+        with self.assertRaises(AssertionError):
+            self.server().export(f, "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
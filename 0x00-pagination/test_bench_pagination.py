@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests of the pagination benchmark helpers, on a small dataset.
+"""
+import os
+import tempfile
+import unittest
+from bench_pagination import DELETION_DENSITIES, VARIANTS, measure, percentile, prepare, run_case
+
+
+class TestBenchPagination(unittest.TestCase):
+    """Each case runs its scenarios and reports their summaries."""
+
+    def test_percentile_and_measure(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 0.5), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.99), 4)
+        calls = []
+        summary = measure(calls.append, [1, 2, 3])
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(summary["requests"], 3)
+        self.assertLessEqual(summary["p50_us"], summary["p99_us"])
+
+    def test_run_case(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = prepare(directory, 500, ["snapshot", "compressed"])
+            self.assertTrue(os.path.exists(path + ".snap"))
+            self.assertTrue(os.path.exists(path + ".blk"))
+            scenarios = {}
+            for variant in VARIANTS:
+                result = run_case(path, "rows", variant, 20, 0)
+                self.assertGreater(result["peak_rss_kb"], 0)
+                scenarios.update(result["scenarios"])
+        expected = {"get_page_shallow", "get_page_deep", "get_pagination_info"}
+        expected.update("get_hyper_index_{:d}pct_deleted".format(round(density * 100))
+                        for density in DELETION_DENSITIES)
+        self.assertEqual(set(scenarios), expected)
+        self.assertTrue(all(summary["requests"] == 20 for summary in scenarios.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests of ColumnarDataset.
+"""
+import unittest
+from columnar_dataset import ColumnarDataset, IntColumn, StringColumn, dictionary_encode
+
+ROWS = [["2016", "FEMALE", "ASIAN", "Olivia", "172", "1"],
+        ["2016", "MALE", "HISPANIC", "Liam", "380", "1"],
+        ["2011", "FEMALE", "ASIAN", "Chloe", "012", "-3"]]
+
+
+class TestColumnarDataset(unittest.TestCase):
+    """Rows read back exactly as csv.reader produced them."""
+
+    def test_rows_round_trip(self):
+        dataset = ColumnarDataset.from_rows(ROWS)
+        self.assertEqual(len(dataset), 3)
+        self.assertEqual(list(dataset), ROWS)
+        self.assertEqual(dataset[1], ROWS[1])
+        self.assertEqual(dataset[-1], ROWS[-1])
+        self.assertEqual(dataset[1:10], ROWS[1:])
+        self.assertEqual(dataset[::2], ROWS[::2])
+        self.assertEqual(dataset[5:], [])
+        with self.assertRaises(IndexError):
+            dataset[3]
+
+    def test_column_encodings(self):
+        dataset = ColumnarDataset.from_rows(ROWS)
+        self.assertIsInstance(dataset.column(0), IntColumn)
+        self.assertIsInstance(dataset.column(1), StringColumn)
+        self.assertIsInstance(dataset.column(4), StringColumn)  # "012" is not canonical
+        self.assertIsInstance(dataset.column(5), IntColumn)
+        self.assertGreater(dataset.nbytes(), 0)
+
+    def test_rows_are_fresh_lists(self):
+        dataset = ColumnarDataset.from_rows(ROWS)
+        dataset[0][3] = "changed"
+        self.assertEqual(dataset[0][3], "Olivia")
+
+    def test_extend_reencodes_when_needed(self):
+        dataset = ColumnarDataset.from_rows(ROWS)
+        extra = [["2019", "MALE", "WHITE", "Noah", "not a number", "99999999999"]]
+        dataset.extend(extra)
+        self.assertEqual(list(dataset), ROWS + extra)
+        self.assertIsInstance(dataset.column(4), StringColumn)
+
+    def test_extend_empty_dataset(self):
+        dataset = ColumnarDataset.from_rows([])
+        self.assertEqual(len(dataset), 0)
+        dataset.extend(ROWS)
+        self.assertEqual(list(dataset), ROWS)
+
+    def test_ragged_rows(self):
+        with self.assertRaisesRegex(ValueError, "row 1 has 2 fields, expected 6"):
+            dictionary_encode([ROWS[0], ["a", "b"]])
+        dataset = ColumnarDataset.from_rows(ROWS)
+        with self.assertRaisesRegex(ValueError, "row 3 has 1 fields"):
+            dataset.extend([["a"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
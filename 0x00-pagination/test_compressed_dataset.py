@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests of the block-compressed dataset.
+"""
+import csv
+import os
+import tempfile
+import unittest
+from compressed_dataset import CompressedDataset, write_compressed
+from synthetic_names import generate_names_csv
+
+
+class TestCompressedDataset(unittest.TestCase):
+    """Pages read from compressed blocks equal the CSV rows."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        csv_path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(csv_path, 250)
+        with open(csv_path, newline="") as f:
+            self.records = list(csv.reader(f))
+        self.path = os.path.join(directory.name, "names.blk")
+
+    def open(self, **options) -> CompressedDataset:
+        """Opens the test file, closing it after the test."""
+        dataset = CompressedDataset(self.path, **options)
+        self.addCleanup(dataset.close)
+        return dataset
+
+    def test_round_trip(self):
+        rows = self.records[1:]
+        for codec in ("zlib", "lzma"):
+            write_compressed(self.path, self.records, block_rows=32, codec=codec, stamp=(7, 8))
+            dataset = self.open(cache_blocks=2)
+            self.assertEqual(dataset.header, self.records[0])
+            self.assertEqual(dataset.stamp, (7, 8))
+            self.assertEqual(len(dataset), len(rows))
+            self.assertEqual(list(dataset), rows)
+            self.assertEqual(dataset[30:70], rows[30:70])
+            self.assertEqual(dataset[-1], rows[-1])
+            self.assertEqual(dataset[::40], rows[::40])
+            with self.assertRaises(IndexError):
+                dataset[len(rows)]
+
+    def test_block_cache(self):
+        write_compressed(self.path, self.records, block_rows=10)
+        dataset = self.open(cache_blocks=2)
+        dataset[0:10]
+        dataset[5:15]
+        self.assertEqual(dataset.block_reads, 2)
+        dataset[0]
+        self.assertEqual(dataset.block_reads, 2)
+        dataset[100]
+        dataset[0]
+        self.assertEqual(dataset.block_reads, 3)
+
+    def test_stale(self):
+        write_compressed(self.path, self.records, stamp=(1, 2))
+        with self.assertRaisesRegex(ValueError, "Stale"):
+            CompressedDataset(self.path, expected_stamp=(1, 3))
+
+    def test_truncated_file_raises_value_error(self):
+        write_compressed(self.path, self.records, block_rows=64)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for length in range(0, len(data), 97):
+            with open(self.path, "wb") as f:
+                f.write(data[:length])
+            with self.assertRaises(ValueError):
+                CompressedDataset(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests of the binary dataset snapshot.
+"""
+import os
+import tempfile
+import unittest
+from dataset_snapshot import SnapshotDataset, encode_snapshot, write_snapshot
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name", "Count", "Rank"]
+ROWS = [["2016", "FEMALE", "ASIAN", "Olivia", "172", "1"],
+        ["2016", "MALE", "HISPANIC", "Zoë", "380", "1"],
+        ["2011", "FEMALE", "ASIAN", "Line\nbreak, \"quoted\"", "12", "3"]]
+
+
+class TestSnapshot(unittest.TestCase):
+    """Snapshots return the rows they were written from."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.snap")
+
+    def test_round_trip(self):
+        write_snapshot(self.path, [HEADER] + ROWS, (123, 456))
+        dataset = SnapshotDataset.open(self.path, (123, 456))
+        self.addCleanup(dataset.close)
+        self.assertEqual(dataset.header, HEADER)
+        self.assertEqual(dataset.stamp, (123, 456))
+        self.assertEqual(len(dataset), 3)
+        self.assertEqual(list(dataset), ROWS)
+        self.assertEqual(dataset[1:], ROWS[1:])
+        self.assertEqual(dataset[-1], ROWS[-1])
+        with self.assertRaises(IndexError):
+            dataset[3]
+
+    def test_from_bytes(self):
+        dataset = SnapshotDataset(encode_snapshot([HEADER] + ROWS))
+        self.assertEqual(list(dataset), ROWS)
+
+    def test_stale_and_invalid(self):
+        write_snapshot(self.path, [HEADER] + ROWS, (1, 2))
+        with self.assertRaisesRegex(ValueError, "Stale"):
+            SnapshotDataset.open(self.path, (1, 3))
+        data = encode_snapshot([HEADER] + ROWS)
+        with self.assertRaises(ValueError):
+            SnapshotDataset(b"x" * len(data))
+        with self.assertRaises(ValueError):
+            SnapshotDataset(data[:-4])
+        with self.assertRaises(ValueError):
+            SnapshotDataset(data[:10])
+
+    def test_close_releases_the_map(self):
+        write_snapshot(self.path, [HEADER] + ROWS)
+        dataset = SnapshotDataset.open(self.path)
+        buffer = dataset._buffer
+        dataset.close()
+        self.assertTrue(buffer.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
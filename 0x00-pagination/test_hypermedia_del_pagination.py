@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests of the deletion-resilient hypermedia Server.
+"""
+import csv
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+from synthetic_names import generate_names_csv
+Server = __import__('3-hypermedia_del_pagination').Server
+
+
+class TestDeletionResilientPagination(unittest.TestCase):
+    """Pages skip deleted rows and never repeat or miss a live one."""
+
+    ROWS = 300
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, self.ROWS)
+        with open(self.path, newline="") as f:
+            self.rows = list(csv.reader(f))[1:]
+        self.server_class = type("TestServer", (Server,), {"DATA_FILE": self.path})
+        self.server = self.server_class()
+
+    def expected(self, start_index: int, page_size: int, deleted: set) -> dict:
+        """The page a brute force scan of the live rows yields."""
+        live = [index for index in range(start_index, self.ROWS) if index not in deleted]
+        indexes = live[:page_size]
+        next_index = indexes[-1] + 1 if len(indexes) == page_size else None
+        if next_index is not None and next_index >= self.ROWS:
+            next_index = None
+        return {"start_index": start_index, "page_size": len(indexes),
+                "data": [self.rows[index] for index in indexes], "next_index": next_index}
+
+    def test_pages_against_brute_force(self):
+        rng = random.Random(0)
+        deleted = set()
+        for density in (0.0, 0.1, 0.9, 1.0):
+            for index in rng.sample(range(self.ROWS), int(self.ROWS * density)):
+                if index not in deleted:
+                    self.server.delete(index)
+                    deleted.add(index)
+            for start_index in (0, 1, 37, 150, 299):
+                for page_size in (1, 10, 100):
+                    self.assertEqual(self.server.get_hyper_index(start_index, page_size),
+                                     self.expected(start_index, page_size, deleted))
+
+    def test_deleting_between_pages(self):
+        first = self.server.get_hyper_index(0, 10)
+        self.server.delete(first["next_index"])
+        self.server.delete(first["next_index"] + 1)
+        second = self.server.get_hyper_index(first["next_index"], 10)
+        self.assertEqual(second["data"], self.rows[12:22])
+
+    def test_delete_and_restore(self):
+        with self.assertRaises(KeyError):
+            self.server.restore(self.ROWS)
+        self.server.delete(5)
+        with self.assertRaises(KeyError):
+            self.server.delete(5)
+        self.server.restore(5)
+        self.assertEqual(self.server.get_hyper_index(5, 1)["data"], [self.rows[5]])
+        with self.assertRaises(AssertionError):
+            self.server.get_hyper_index(self.ROWS, 10)
+
+    def test_iter_hyper_index(self):
+        for index in range(0, self.ROWS, 3):
+            self.server.delete(index)
+        pages = list(self.server.iter_hyper_index(0, 17))
+        rows = [row for page in pages for row in page["data"]]
+        self.assertEqual(rows, [row for index, row in enumerate(self.rows) if index % 3])
+
+    def test_json_equals_json_dumps(self):
+        for index in range(0, self.ROWS, 2):
+            self.server.delete(index)
+        for start_index in (0, 1, 150, 298):
+            self.assertEqual(self.server.get_hyper_index_json(start_index, 10),
+                             json.dumps(self.server.get_hyper_index(start_index, 10)).encode())
+
+    def test_page_cache_sees_deletions(self):
+        server = self.server_class(cache_size=8)
+        first = server.get_hyper_index(0, 10)
+        self.assertIs(server.get_hyper_index(0, 10), first)
+        server.delete(3)
+        self.assertEqual(server.get_hyper_index(0, 10), self.expected(0, 10, {3}))
+
+    def test_prefetch_sees_deletions(self):
+        server = self.server_class(prefetch=2)
+        self.addCleanup(server.prefetcher.close)
+        server.get_hyper_index(0, 10)
+        server.delete(12)
+        self.assertEqual(server.get_hyper_index(10, 10), self.expected(10, 10, {12}))
+
+    def test_appended_rows_are_live(self):
+        self.server.delete(0)
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n")
+        self.assertEqual(self.server.refresh(), "appended")
+        page = self.server.get_hyper_index(self.ROWS - 1, 10)
+        self.assertEqual(page["data"][-1], ["2019", "MALE", "HISPANIC", "Noah", "10", "1"])
+        self.assertNotIn(0, self.server.load_indexed_dataset())
+
+    def test_deletions_survive_a_reload(self):
+        server = self.server_class(storage="snapshot")
+        self.addCleanup(lambda: server._dataset.close())
+        for index in (0, 1, 2, 250):
+            server.delete(index)
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n")
+        self.assertEqual(server.refresh(), "reloaded")
+        self.assertEqual(server.get_hyper_index(0, 1)["data"], [self.rows[3]])
+        self.assertNotIn(250, server.load_indexed_dataset())
+        self.assertEqual(len(server.load_indexed_dataset()), self.ROWS + 1 - 4)
+
+    def test_concurrent_deletions(self):
+        errors = []
+
+        def delete(offset):
+            try:
+                for index in range(offset, self.ROWS, 4):
+                    self.server.delete(index)
+                    self.server.get_hyper_index(0, 20)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=delete, args=(offset,)) for offset in (0, 1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        deleted = {index for index in range(self.ROWS) if index % 4 != 3}
+        self.assertEqual(self.server.get_hyper_index(0, 10), self.expected(0, 10, deleted))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests of the hypermedia Server: metadata, JSON, caching, read-ahead,
+keyset pages and filtered pages.
+"""
+import csv
+import json
+import os
+import tempfile
+import unittest
+from keyset_index import decode_cursor, encode_cursor
+from synthetic_names import generate_names_csv
+Server = __import__('2-hypermedia_pagination').Server
+
+
+class HypermediaTestCase(unittest.TestCase):
+    """Gives each test a fresh CSV and a Server subclass reading it."""
+
+    ROWS = 437
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, self.ROWS)
+        self.server_class = type("TestServer", (Server,), {"DATA_FILE": self.path})
+
+    def rows(self) -> list:
+        """The data rows of the CSV as csv.reader reads them."""
+        with open(self.path, newline="") as f:
+            return list(csv.reader(f))[1:]
+
+    def server(self, **options) -> Server:
+        """Creates a server, stopping its read-ahead thread after the test."""
+        server = self.server_class(**options)
+        if server.prefetcher is not None:
+            self.addCleanup(server.prefetcher.close)
+        return server
+
+
+class TestHypermedia(HypermediaTestCase):
+    """get_pagination_info and its JSON form."""
+
+    def test_pagination_info(self):
+        server = self.server()
+        info = server.get_pagination_info(2, 100)
+        self.assertEqual(info, {"current_page": 2, "items_per_page": 100, "total_pages": 5,
+                                "data": self.rows()[100:200], "previous_page": 1,
+                                "next_page": 3})
+        last = server.get_pagination_info(5, 100)
+        self.assertEqual((last["items_per_page"], last["next_page"]), (37, None))
+        beyond = server.get_pagination_info(9, 100)
+        self.assertEqual((beyond["data"], beyond["items_per_page"]), ([], 0))
+
+    def test_json_equals_json_dumps(self):
+        server = self.server()
+        for page, page_size in ((1, 10), (4, 100), (5, 100), (50, 10), (1, 1000)):
+            self.assertEqual(server.get_pagination_info_json(page, page_size),
+                             json.dumps(server.get_pagination_info(page, page_size)).encode())
+        prerendered = self.server(prerender_json=True)
+        self.assertEqual(prerendered.get_pagination_info_json(3, 7),
+                         json.dumps(server.get_pagination_info(3, 7)).encode())
+
+    def test_page_cache(self):
+        server = self.server(cache_size=4)
+        first = server.get_pagination_info(1, 10)
+        self.assertIs(server.get_pagination_info(1, 10), first)
+        self.assertEqual(server.cache_stats()["hits"], 1)
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n")
+        server.refresh()
+        refreshed = server.get_pagination_info(1, 10)
+        self.assertIsNot(refreshed, first)
+        self.assertEqual(refreshed["total_pages"], 44)
+        self.assertIsNone(self.server().cache_stats())
+
+    def test_prefetch(self):
+        server = self.server(prefetch=2)
+        expected = [server._pagination_info(page, 50) for page in range(1, 10)]
+        self.assertEqual([server.get_pagination_info(page, 50) for page in range(1, 10)],
+                         expected)
+        stats = server.prefetch_stats()
+        self.assertEqual(stats["hits"], 8)
+        self.assertEqual(stats["misses"], 1)
+        self.assertIsNone(self.server().prefetch_stats())
+
+    def test_prefetch_is_discarded_after_refresh(self):
+        server = self.server(prefetch=2)
+        server.get_pagination_info(1, 10)
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n")
+        server.refresh()
+        self.assertEqual(server.get_pagination_info(2, 10), server._pagination_info(2, 10))
+        self.assertEqual(server.prefetch_stats()["hits"], 0)
+
+
+class TestKeysetPagination(HypermediaTestCase):
+    """Cursors walk a sort order without gaps or repeats."""
+
+    def expected(self, sort_by: str, descending: bool) -> list:
+        """The rows sorted by (key, row id)."""
+        column = Server.COLUMNS[sort_by]
+        convert = int if sort_by in Server.NUMERIC_COLUMNS else str
+        rows = self.rows()
+        order = sorted(range(len(rows)), key=lambda row: (convert(rows[row][column]), row))
+        return [rows[row] for row in (order[::-1] if descending else order)]
+
+    def test_walk_forward_and_back(self):
+        server = self.server()
+        for sort_by in ("name", "count"):
+            for descending in (False, True):
+                pages, response = [], server.get_keyset_page(sort_by, None, 30, descending)
+                self.assertIsNone(response["prev_cursor"])
+                while True:
+                    pages.append(response)
+                    if response["next_cursor"] is None:
+                        break
+                    response = server.get_keyset_page(sort_by, response["next_cursor"], 30,
+                                                      descending)
+                rows = [row for page in pages for row in page["data"]]
+                self.assertEqual(rows, self.expected(sort_by, descending))
+                back = server.get_keyset_page(sort_by, pages[-1]["prev_cursor"], 30, descending)
+                self.assertEqual(back["data"], pages[-2]["data"])
+
+    def test_cursor_is_bound_to_its_sort_order(self):
+        server = self.server()
+        cursor = server.get_keyset_page("name", None, 10)["next_cursor"]
+        self.assertEqual(decode_cursor(cursor)[:3], ("name", False, "after"))
+        with self.assertRaises(AssertionError):
+            server.get_keyset_page("count", cursor, 10)
+        with self.assertRaises(AssertionError):
+            server.get_keyset_page("name", cursor, 10, descending=True)
+        with self.assertRaises(AssertionError):
+            server.get_keyset_page("count", encode_cursor("count", False, "after", "10", 3))
+        with self.assertRaises(ValueError):
+            server.get_keyset_page("name", "garbage")
+        with self.assertRaises(AssertionError):
+            server.get_keyset_page("unknown")
+
+    def test_appended_rows_extend_the_index(self):
+        server = self.server()
+        index = server.sort_index("name")
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Aaaa,10,1\r\n")
+        self.assertEqual(server.refresh(), "appended")
+        self.assertIs(server.sort_index("name"), index)
+        self.assertEqual(len(index), self.ROWS + 1)
+        page = server.get_keyset_page("name", None, 10)
+        self.assertEqual(page["data"], self.expected("name", False)[:10])
+
+
+class TestFilteredPagination(HypermediaTestCase):
+    """Filtered pages hold exactly the rows a scan would keep."""
+
+    def expected(self, year=None, gender=None, ethnicity=None, name_prefix=None) -> list:
+        """The rows matching every given filter, in file order."""
+        return [row for row in self.rows()
+                if (year is None or row[0] == str(year))
+                and (gender is None or row[1] == gender)
+                and (ethnicity is None or row[2] == ethnicity)
+                and (name_prefix is None or row[3].casefold().startswith(name_prefix.casefold()))]
+
+    def test_filters(self):
+        server = self.server()
+        for filters in ({}, {"year": 2015}, {"gender": "MALE"}, {"name_prefix": "ri"},
+                        {"year": "2012", "gender": "FEMALE"},
+                        {"gender": "MALE", "ethnicity": "HISPANIC", "name_prefix": "A"},
+                        {"year": 1900}):
+            expected = self.expected(**filters)
+            pages = [server.get_filtered_page(page, 15, **filters)
+                     for page in range(1, len(expected) // 15 + 2)]
+            self.assertEqual([row for page in pages for row in page["data"]], expected)
+            self.assertEqual(pages[0]["total_pages"], (len(expected) + 14) // 15)
+            self.assertEqual(set(pages[0]["filters"]), set(filters))
+
+    def test_appended_rows_are_indexed(self):
+        server = self.server()
+        server.get_filtered_page(name_prefix="zz")
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Zzyzx,10,1\r\n")
+        server.refresh()
+        page = server.get_filtered_page(name_prefix="ZZ")
+        self.assertEqual(page["data"], self.expected(name_prefix="zz"))
+        self.assertEqual(page["data"][-1][3], "Zzyzx")
+        self.assertEqual(server.get_filtered_page(year=2019, gender="MALE")["total_pages"],
+                         (len(self.expected(year=2019, gender="MALE")) + 9) // 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
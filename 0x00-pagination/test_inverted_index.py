@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests of InvertedIndex, PrefixIndex and intersect.
+"""
+import random
+import unittest
+from inverted_index import InvertedIndex, PrefixIndex, intersect
+
+
+class TestInvertedIndex(unittest.TestCase):
+    """Posting lists and prefix ranges agree with a scan."""
+
+    def test_postings(self):
+        values = ["a", "b", "a", "c", "a"]
+        index = InvertedIndex(values)
+        self.assertEqual(list(index.rows("a")), [0, 2, 4])
+        self.assertEqual(list(index.rows("missing")), [])
+        index.extend(["c", "a"], 5)
+        self.assertEqual(list(index.rows("a")), [0, 2, 4, 6])
+        self.assertEqual(list(index.rows("c")), [3, 5])
+
+    def test_intersect(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            postings = [sorted(rng.sample(range(200), rng.randrange(0, 120)))
+                        for _ in range(rng.randrange(1, 4))]
+            expected = sorted(set.intersection(*map(set, postings)))
+            self.assertEqual(intersect(postings), expected)
+        self.assertEqual(intersect([]), [])
+
+    def test_prefix_rows(self):
+        names = ["Olivia", "oliver", "Ava", "Olive", "Noah", "OLGA"]
+        index = PrefixIndex(names)
+        for prefix in ("ol", "OLIV", "a", "x", ""):
+            expected = [row for row, name in enumerate(names)
+                        if name.casefold().startswith(prefix.casefold())]
+            self.assertEqual(list(index.rows(prefix)), expected)
+
+    def test_prefix_cache_follows_extend(self):
+        index = PrefixIndex(["Olivia", "Ava"])
+        first = index.rows("ol")
+        self.assertIs(index.rows("OL"), first)
+        index.extend(["Oliver", "Noah"], 2)
+        self.assertEqual(list(index.rows("ol")), [0, 2])
+        self.assertEqual(list(first), [0])
+
+    def test_prefix_cache_is_bounded(self):
+        index = PrefixIndex(["name{}".format(number) for number in range(200)])
+        for number in range(200):
+            index.rows("name{}".format(number))
+            self.assertLessEqual(len(index._matches), PrefixIndex.CACHED_PREFIXES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests of SortIndex, merge_ordering and the keyset cursors.
+"""
+import random
+import unittest
+from array import array
+from keyset_index import SortIndex, decode_cursor, encode_cursor, merge_ordering
+
+
+class TestCursor(unittest.TestCase):
+    """Cursors round trip and reject malformed tokens."""
+
+    def test_round_trip(self):
+        for args in (("name", False, "after", "Olivia", 12),
+                     ("count", True, "before", 250, 0)):
+            cursor = encode_cursor(*args)
+            self.assertNotIn("=", cursor)
+            self.assertEqual(decode_cursor(cursor), args)
+
+    def test_malformed(self):
+        for cursor in ("", "not a cursor", encode_cursor("name", False, "sideways", "A", 1),
+                       encode_cursor("name", 0, "after", "A", 1),
+                       encode_cursor("name", False, "after", "A", "1")):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class TestSortIndex(unittest.TestCase):
+    """SortIndex pages follow a sort by (key, row) in both directions."""
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.keys = [rng.randrange(20) for _ in range(157)]
+        self.index = SortIndex(self.keys, numeric=True)
+
+    def expected(self, descending: bool) -> list:
+        """The row ids sorted by (key, row), possibly reversed."""
+        order = sorted(range(len(self.keys)), key=lambda row: (self.keys[row], row))
+        return order[::-1] if descending else order
+
+    def walk(self, page_size: int, descending: bool) -> list:
+        """Follows "after" cursors from the first page to the last one."""
+        rows, cursor = [], None
+        while True:
+            page, has_previous, has_next = self.index.page(page_size, cursor, descending)
+            self.assertEqual(has_previous, bool(rows))
+            rows.extend(page)
+            if not has_next:
+                return rows
+            cursor = ("after", self.keys[page[-1]], page[-1])
+
+    def test_forward_walk(self):
+        for descending in (False, True):
+            self.assertEqual(self.walk(10, descending), self.expected(descending))
+
+    def test_backward_pages(self):
+        for descending in (False, True):
+            order = self.expected(descending)
+            row = order[35]
+            page, has_previous, has_next = self.index.page(
+                10, ("before", self.keys[row], row), descending)
+            self.assertEqual(page, order[25:35])
+            self.assertTrue(has_previous and has_next)
+            row = order[4]
+            page, has_previous, _ = self.index.page(10, ("before", self.keys[row], row), descending)
+            self.assertEqual(page, order[:4])
+            self.assertFalse(has_previous)
+
+    def test_extend_equals_rebuild(self):
+        rng = random.Random(1)
+        extra = [rng.randrange(25) for _ in range(40)]
+        self.index.extend(extra[:15], len(self.keys))
+        self.index.extend(extra[15:], len(self.keys) + 15)
+        self.keys.extend(extra)
+        rebuilt = SortIndex(self.keys, numeric=True)
+        self.assertEqual(self.index.ordering, rebuilt.ordering)
+        self.assertEqual(self.walk(7, False), self.expected(False))
+
+    def test_merge_ordering_leaves_its_arguments(self):
+        keys = array("q", [1, 3, 3])
+        order = array("I", [2, 0, 1])
+        merged_keys, merged_order = merge_ordering(keys, order, [3, 0], 3)
+        self.assertEqual((keys, order), (array("q", [1, 3, 3]), array("I", [2, 0, 1])))
+        self.assertEqual(merged_keys, array("q", [0, 1, 3, 3, 3]))
+        self.assertEqual(merged_order, array("I", [4, 2, 0, 1, 3]))
+
+    def test_string_keys(self):
+        index = SortIndex(["b", "a", "b", "c"])
+        self.assertEqual(index.page(3), ([1, 0, 2], False, True))
+        self.assertEqual(index.page(3, ("after", "b", 2)), ([3], True, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
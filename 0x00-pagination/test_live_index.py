@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests of LiveIndex against a brute force set of live rows.
+"""
+import random
+import unittest
+from itertools import islice
+from unittest import mock
+from live_index import LiveIndex
+
+
+class TestLiveIndex(unittest.TestCase):
+    """LiveIndex rank, select and iteration agree with a plain list."""
+
+    def assert_matches(self, index: LiveIndex, live: list) -> None:
+        """Checks every query of index against the live flags."""
+        alive = [row for row, flag in enumerate(live) if flag]
+        self.assertEqual(len(index), len(alive))
+        self.assertEqual(index.size, len(live))
+        self.assertEqual(list(index), alive)
+        self.assertEqual(list(index.deleted()), [row for row, flag in enumerate(live) if not flag])
+        for row in range(len(live) + 1):
+            self.assertEqual(index.rank(row), sum(live[:row]))
+        for k, row in enumerate(alive):
+            self.assertEqual(index.select(k), row)
+
+    def test_random_deletions_and_restores(self):
+        rng = random.Random(0)
+        live = [1] * 300
+        index = LiveIndex(300)
+        for _ in range(600):
+            row = rng.randrange(300)
+            if rng.random() < 0.7:
+                self.assertEqual(index.delete(row), bool(live[row]))
+                live[row] = 0
+            else:
+                self.assertEqual(index.restore(row), not live[row])
+                live[row] = 1
+        self.assert_matches(index, live)
+
+    def test_iter_from_crosses_long_deleted_runs(self):
+        index = LiveIndex(1000)
+        for row in range(1000):
+            if row % 250 < 240:
+                index.delete(row)
+        expected = [row for row in range(1000) if row % 250 >= 240]
+        for start in (0, 5, 239, 240, 245, 500, 999, 1000, 2000):
+            self.assertEqual(list(index.iter_from(start)),
+                             [row for row in expected if row >= start])
+        self.assertEqual(list(islice(index.iter_from(3), 12)), expected[:12])
+
+    def test_iter_from_selects_once_per_deleted_run(self):
+        index = LiveIndex(10000)
+        for row in range(10000):
+            if row not in (5000, 9999):
+                index.delete(row)
+        with mock.patch.object(index, "select", wraps=index.select) as select:
+            self.assertEqual(list(index.iter_from(0)), [5000, 9999])
+        self.assertEqual(select.call_count, 2)
+
+    def test_iter_from_with_everything_deleted(self):
+        index = LiveIndex(50)
+        for row in range(50):
+            index.delete(row)
+        self.assertEqual(list(index.iter_from(0)), [])
+        self.assertIsNone(index.next_live(0))
+        index.restore(49)
+        self.assertEqual(list(index.iter_from(0)), [49])
+        self.assertEqual(index.next_live(10), 49)
+
+    def test_extend(self):
+        rng = random.Random(1)
+        live = [1] * 37
+        index = LiveIndex(37)
+        for row in rng.sample(range(37), 20):
+            index.delete(row)
+            live[row] = 0
+        for count in (1, 7, 64, 3):
+            index.extend(count)
+            live.extend([1] * count)
+            for row in rng.sample(range(len(live)), 5):
+                index.delete(row)
+                live[row] = 0
+            self.assert_matches(index, live)
+
+    def test_bounds(self):
+        index = LiveIndex(3)
+        with self.assertRaises(IndexError):
+            index.delete(3)
+        with self.assertRaises(IndexError):
+            index.restore(-1)
+        with self.assertRaises(IndexError):
+            index.select(3)
+        self.assertNotIn(3, index)
+        self.assertNotIn("0", index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests of MmapDataset and its persisted line index.
+"""
+import csv
+import os
+import tempfile
+import unittest
+from mmap_dataset import MmapDataset, build_line_index
+from synthetic_names import generate_names_csv
+
+
+class TestMmapDataset(unittest.TestCase):
+    """Rows parsed from the map equal the rows of csv.reader."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, 300)
+        with open(self.path, newline="") as f:
+            self.rows = list(csv.reader(f))[1:]
+
+    def open(self, **options) -> MmapDataset:
+        """Opens the test CSV, closing it after the test."""
+        dataset = MmapDataset(self.path, **options)
+        self.addCleanup(dataset.close)
+        return dataset
+
+    def test_build_line_index(self):
+        self.assertEqual(list(build_line_index(b"ab\ncd\n")), [0, 3, 6])
+        self.assertEqual(list(build_line_index(b"ab\ncd")), [0, 3, 5])
+        self.assertEqual(list(build_line_index(b"h\nab\ncd", 2)), [2, 5, 7])
+
+    def test_rows(self):
+        dataset = self.open()
+        self.assertEqual(len(dataset), len(self.rows))
+        self.assertEqual(dataset[0], self.rows[0])
+        self.assertEqual(dataset[-1], self.rows[-1])
+        self.assertEqual(dataset[100:110], self.rows[100:110])
+        self.assertEqual(dataset[290:400], self.rows[290:])
+        self.assertEqual(dataset[::50], self.rows[::50])
+        self.assertEqual(list(dataset), self.rows)
+        with self.assertRaises(IndexError):
+            dataset[len(self.rows)]
+
+    def test_persisted_index(self):
+        self.open(persist_index=True)
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+        dataset = self.open(persist_index=True)
+        self.assertIsNotNone(dataset._load_index())
+        self.assertEqual(list(dataset), self.rows)
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n")
+        dataset = self.open(persist_index=True)
+        self.assertEqual(dataset[-1], ["2019", "MALE", "HISPANIC", "Noah", "10", "1"])
+        self.assertEqual(len(dataset), len(self.rows) + 1)
+
+    def test_extend_replaces_the_map(self):
+        dataset = self.open()
+        old_map = dataset._map
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE,HISPANIC,Noah,10,1\r\n2019,FEMALE,HISPANIC,Ava,11,2\r\n")
+        self.assertEqual(dataset.extend(os.path.getsize(self.path)), 2)
+        self.assertTrue(old_map.closed)
+        self.assertEqual(len(dataset), len(self.rows) + 2)
+        self.assertEqual(dataset[-1], ["2019", "FEMALE", "HISPANIC", "Ava", "11", "2"])
+        self.assertEqual(dataset[:5], self.rows[:5])
+        self.assertEqual(dataset.stamp[0], os.path.getsize(self.path))
+        self.assertEqual(dataset.extend(os.path.getsize(self.path)), 0)
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        dataset = self.open()
+        self.assertEqual(len(dataset), 0)
+        self.assertEqual(dataset[:10], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests of PageCache.
+"""
+import unittest
+from page_cache import PageCache
+
+
+class TestPageCache(unittest.TestCase):
+    """Entries are served only at the version they were computed at."""
+
+    def test_versions(self):
+        cache = PageCache(4)
+        cache.put("page", 1, "old")
+        self.assertEqual(cache.get("page", 1), "old")
+        self.assertIsNone(cache.get("page", 2))
+        self.assertIsNone(cache.get("page", 1))  # The stale entry was dropped
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "evictions": 0,
+                                         "size": 0, "maxsize": 4})
+
+    def test_lru(self):
+        cache = PageCache(2, "lru")
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        cache.get("a", 0)
+        cache.put("c", 0, 3)
+        self.assertIsNone(cache.get("b", 0))
+        self.assertEqual(cache.get("a", 0), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_fifo(self):
+        cache = PageCache(2, "fifo")
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        cache.get("a", 0)
+        cache.put("c", 0, 3)
+        self.assertIsNone(cache.get("a", 0))
+        self.assertEqual(cache.get("b", 0), 2)
+
+    def test_update_and_clear(self):
+        cache = PageCache(2)
+        cache.put("a", 0, 1)
+        cache.put("a", 1, 2)
+        self.assertEqual(cache.get("a", 1), 2)
+        self.assertEqual(cache.stats()["size"], 1)
+        cache.clear()
+        self.assertIsNone(cache.get("a", 1))
+        cache.put("b", 0, 3)
+        self.assertEqual(cache.get("b", 0), 3)
+
+    def test_maxsize(self):
+        with self.assertRaises(AssertionError):
+            PageCache(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
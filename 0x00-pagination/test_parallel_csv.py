@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests of the multi-process CSV reader.
+"""
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+import parallel_csv
+from columnar_dataset import dictionary_encode
+from synthetic_names import generate_names_csv
+
+
+def force_processes():
+    """Patches parallel_csv so that even a small file is split across processes."""
+    patches = [mock.patch.object(parallel_csv, "PARALLEL_MIN_BYTES", 0),
+               mock.patch.object(parallel_csv, "MIN_CHUNK_BYTES", 1000),
+               mock.patch.object(parallel_csv.os, "cpu_count", return_value=4)]
+    for patch in patches:
+        patch.start()
+    return patches
+
+
+class TestParallelCsv(unittest.TestCase):
+    """Parallel parsing returns exactly what one csv.reader pass returns."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, 2000)
+
+    def serial_rows(self) -> list:
+        """The data rows as csv.reader reads them."""
+        with open(self.path, newline="") as f:
+            return list(csv.reader(f))[1:]
+
+    def parallel(self):
+        """Enables the process path for the rest of the test."""
+        for patch in force_processes():
+            self.addCleanup(patch.stop)
+
+    def test_split_ranges_align_on_lines(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with mock.patch.object(parallel_csv, "MIN_CHUNK_BYTES", 1000):
+            ranges = parallel_csv.split_ranges(self.path, 8, 10)
+        self.assertEqual(ranges[0][0], 10)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(stop, start)
+            self.assertEqual(data[start - 1:start], b"\n")
+
+    def test_use_processes(self):
+        with mock.patch.object(parallel_csv.os, "cpu_count", return_value=1):
+            self.assertFalse(parallel_csv.use_processes(4, 1 << 30))
+        with mock.patch.object(parallel_csv.os, "cpu_count", return_value=8):
+            self.assertTrue(parallel_csv.use_processes(4, parallel_csv.PARALLEL_MIN_BYTES))
+            self.assertFalse(parallel_csv.use_processes(4, parallel_csv.PARALLEL_MIN_BYTES - 1))
+            self.assertFalse(parallel_csv.use_processes(1, 1 << 30))
+
+    def test_rows_equal_serial(self):
+        expected = self.serial_rows()
+        self.assertEqual(parallel_csv.read_rows_parallel(self.path, 3), expected)
+        self.parallel()
+        self.assertEqual(parallel_csv.read_rows_parallel(self.path, 3), expected)
+        size = os.path.getsize(self.path) // 2
+        with open(self.path, "rb") as f:
+            size = f.read(size).rfind(b"\n") + 1
+        self.assertEqual(parallel_csv.read_rows_parallel(self.path, 3, size=size),
+                         expected[:len(parallel_csv.parse_range(self.path, 0, size)) - 1])
+
+    def test_encoded_equals_serial(self):
+        self.parallel()
+        tables, codes, length = parallel_csv.read_encoded_parallel(self.path, 3)
+        self.assertEqual(parallel_csv.decode_rows(tables, codes, length), self.serial_rows())
+
+    def test_ragged_rows_on_the_process_path(self):
+        with open(self.path, "a", newline="") as f:
+            f.write("\r\n2019,MALE\r\n")
+        expected = self.serial_rows()
+        self.assertEqual(expected[-2:], [[], ["2019", "MALE"]])
+        self.parallel()
+        self.assertEqual(parallel_csv.read_rows_parallel(self.path, 3), expected)
+
+    def test_ragged_rows_raise_the_same_error_on_both_paths(self):
+        with open(self.path, "a", newline="") as f:
+            f.write("2019,MALE\r\n")
+        with self.assertRaises(ValueError) as serial:
+            dictionary_encode(self.serial_rows())
+        self.parallel()
+        with self.assertRaises(ValueError) as parallel:
+            parallel_csv.read_encoded_parallel(self.path, 3)
+        self.assertEqual(str(parallel.exception), str(serial.exception))
+
+    def test_merge_encoded(self):
+        rows = self.serial_rows()[:30]
+        chunks = [dictionary_encode(rows[:10]), rows[10:20], dictionary_encode([]),
+                  dictionary_encode(rows[20:])]
+        self.assertEqual(parallel_csv.merge_encoded(chunks), dictionary_encode(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests of Prefetcher.
+"""
+import threading
+import unittest
+from prefetch import Prefetcher
+
+
+class TestPrefetcher(unittest.TestCase):
+    """Pages computed ahead are taken once, at their version only."""
+
+    def setUp(self):
+        self.prefetcher = Prefetcher(2)
+        self.addCleanup(self.prefetcher.close)
+
+    def test_take(self):
+        self.prefetcher.schedule("page", 0, lambda: "result")
+        self.assertEqual(self.prefetcher.take("page", 0), "result")
+        self.assertIsNone(self.prefetcher.take("page", 0))
+        stats = self.prefetcher.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["scheduled"]), (1, 1, 1))
+
+    def test_stale_version(self):
+        self.prefetcher.schedule("page", 0, lambda: "result")
+        self.assertIsNone(self.prefetcher.take("page", 1))
+        self.assertEqual(self.prefetcher.stats()["wasted"], 1)
+
+    def test_schedule_once_per_version(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            calls.append(1)
+            return "result"
+
+        self.prefetcher.schedule("page", 0, compute)
+        self.prefetcher.schedule("page", 0, compute)
+        release.set()
+        self.assertEqual(self.prefetcher.take("page", 0), "result")
+        self.assertEqual(len(calls), 1)
+
+    def test_oldest_is_dropped(self):
+        release = threading.Event()
+        self.prefetcher.schedule("blocker", 0, lambda: release.wait(5))
+        self.prefetcher.schedule("a", 0, lambda: "a")
+        self.prefetcher.schedule("b", 0, lambda: "b")
+        release.set()
+        self.assertEqual(self.prefetcher.stats()["size"], 2)
+        self.assertIsNone(self.prefetcher.take("blocker", 0))
+        self.assertEqual(self.prefetcher.take("b", 0), "b")
+
+    def test_failure_is_a_miss(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        self.prefetcher.schedule("page", 0, fail)
+        self.assertIsNone(self.prefetcher.take("page", 0))
+        self.assertEqual(self.prefetcher.stats()["wasted"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests of the pre-rendered row JSON and the page export writers.
+"""
+import csv
+import io
+import json
+import unittest
+from page_export import write_csv, write_jsonl
+from row_json import RowJsonCache, encode_envelope, iter_runs
+
+ROWS = [["2016", "FEMALE", "ASIAN", "Zoë", "172", "1"],
+        ["2016", "MALE", "HISPANIC", "Quote \"q\"", "380", "1"],
+        ["2011", "FEMALE", "ASIAN", "Comma, name", "12", "3"]]
+
+
+class TestRowJson(unittest.TestCase):
+    """Responses assembled from fragments equal json.dumps of the dict."""
+
+    def test_iter_runs(self):
+        self.assertEqual(list(iter_runs([1, 2, 3, 7, 9, 10])), [(1, 4), (7, 8), (9, 11)])
+        self.assertEqual(list(iter_runs([])), [])
+
+    def test_fragments(self):
+        cache = RowJsonCache(ROWS)
+        self.assertEqual([json.loads(fragment) for fragment in cache.fragments([0, 2])],
+                         [ROWS[0], ROWS[2]])
+        cache.render_all()
+        self.assertEqual(cache.fragments(range(3)),
+                         [json.dumps(row).encode() for row in ROWS])
+
+    def test_appended_rows(self):
+        rows = list(ROWS)
+        cache = RowJsonCache(rows)
+        cache.fragments([0])
+        rows.append(["2019", "MALE", "WHITE", "Noah", "1", "1"])
+        self.assertEqual(cache.fragments([3]), [json.dumps(rows[3]).encode()])
+
+    def test_envelope(self):
+        fields = {"page": 1, "data": None, "next": None, "name": "é"}
+        expected = json.dumps(dict(fields, data=ROWS)).encode()
+        fragments = RowJsonCache(ROWS).fragments(range(3))
+        self.assertEqual(encode_envelope(fields, fragments), expected)
+        self.assertEqual(encode_envelope({"data": None}, []), json.dumps({"data": []}).encode())
+
+
+class TestPageExport(unittest.TestCase):
+    """The writers stream rows as CSV or JSON lines."""
+
+    def test_csv(self):
+        f = io.StringIO(newline="")
+        self.assertEqual(write_csv(iter(ROWS), f, ["a"] * 6), 3)
+        self.assertEqual(list(csv.reader(io.StringIO(f.getvalue(), newline=""))),
+                         [["a"] * 6] + ROWS)
+
+    def test_jsonl(self):
+        f = io.StringIO()
+        self.assertEqual(write_jsonl(iter(ROWS), f), 3)
+        self.assertEqual([json.loads(line) for line in f.getvalue().splitlines()], ROWS)
+        header = ["year", "gender", "ethnicity", "name", "count", "rank"]
+        f = io.StringIO()
+        write_jsonl(ROWS[:1], f, header)
+        self.assertEqual(json.loads(f.getvalue()), dict(zip(header, ROWS[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests of the shared memory dataset and ShardedService.
+"""
+import csv
+import os
+import tempfile
+import unittest
+from base_server import BaseServer
+from shared_dataset import SharedDataset, publish_dataset, unlink_dataset
+from sharded_service import ShardedService
+from synthetic_names import generate_names_csv
+Server = __import__('3-hypermedia_del_pagination').Server
+
+
+class TestSharedDataset(unittest.TestCase):
+    """Rows published in shared memory read back in another server."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(self.path, 200)
+        with open(self.path, newline="") as f:
+            self.records = list(csv.reader(f))
+
+    def test_attach(self):
+        segment = publish_dataset(self.records)
+        self.addCleanup(unlink_dataset, segment)
+        dataset = SharedDataset.attach(segment.name)
+        self.assertEqual(dataset.header, self.records[0])
+        self.assertEqual(list(dataset), self.records[1:])
+        dataset.close()
+
+    def test_shared_storage(self):
+        publisher = type("TestServer", (BaseServer,), {"DATA_FILE": self.path})()
+        segment = publisher.share_dataset()
+        self.addCleanup(unlink_dataset, segment)
+        server = type("TestServer", (BaseServer,), {"DATA_FILE": self.path})(
+            storage="shared", shm_name=segment.name)
+        self.assertEqual(server.load_dataset()[10:20], self.records[11:21])
+        self.assertEqual(server.refresh(), "unchanged")
+        server.load_dataset().close()
+
+    def test_missing_segment(self):
+        with self.assertRaises(FileNotFoundError):
+            SharedDataset.attach("no-such-pagination-segment")
+
+
+class TestShardedService(unittest.TestCase):
+    """A sharded service answers like a single Server."""
+
+    ROWS = 250
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(path, cls.ROWS)
+        cls.server_class = type("TestServer", (Server,), {"DATA_FILE": path})
+        cls.service = ShardedService(cls.server_class(), shards=3)
+        cls.addClassCleanup(cls.service.close)
+
+    def setUp(self):
+        self.server = self.server_class()
+
+    def tearDown(self):
+        for index in list(self.server.load_indexed_dataset().live_index.deleted()):
+            self.service.restore(index)
+
+    def delete(self, index: int) -> None:
+        """Deletes a row from both the service and the reference server."""
+        self.service.delete(index)
+        self.server.delete(index)
+
+    def test_get_page(self):
+        rows = self.server.load_dataset()
+        for page, page_size in ((1, 10), (8, 11), (9, 30), (3, 100), (26, 10), (30, 10)):
+            self.assertEqual(self.service.get_page(page, page_size),
+                             rows[(page - 1) * page_size:page * page_size])
+
+    def test_get_hyper_index(self):
+        for index in list(range(70, 95)) + list(range(160, 175)) + [249]:
+            self.delete(index)
+        for start_index in (0, 65, 80, 82, 150, 170, 240):
+            for page_size in (5, 20, 120):
+                self.assertEqual(self.service.get_hyper_index(start_index, page_size),
+                                 self.server.get_hyper_index(start_index, page_size))
+
+    def test_errors_carry_the_global_index(self):
+        self.delete(200)
+        with self.assertRaises(KeyError) as raised:
+            self.service.delete(200)
+        self.assertEqual(raised.exception.args, (200,))
+        with self.assertRaises(KeyError) as raised:
+            self.service.restore(self.ROWS)
+        self.assertEqual(raised.exception.args, (self.ROWS,))
+        with self.assertRaises(AssertionError):
+            self.service.get_hyper_index(self.ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
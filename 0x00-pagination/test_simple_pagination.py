@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests of get_pagination_range and the simple pagination Server.
+"""
+import csv
+import os
+import tempfile
+import unittest
+from synthetic_names import generate_names_csv
+get_pagination_range = __import__('0-simple_helper_function').get_pagination_range
+Server = __import__('1-simple_pagination').Server
+
+
+class TestSimplePagination(unittest.TestCase):
+    """Pages are the slices their range designates."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "names.csv")
+        generate_names_csv(path, 95)
+        with open(path, newline="") as f:
+            self.rows = list(csv.reader(f))[1:]
+        self.server = type("TestServer", (Server,), {"DATA_FILE": path})()
+
+    def test_get_pagination_range(self):
+        self.assertEqual(get_pagination_range(1, 7), (0, 7))
+        self.assertEqual(get_pagination_range(3, 15), (30, 45))
+        self.assertEqual(get_pagination_range(10**12, 10), (10**13 - 10, 10**13))
+
+    def test_get_page(self):
+        self.assertEqual(self.server.get_page(), self.rows[:10])
+        self.assertEqual(self.server.get_page(3, 20), self.rows[40:60])
+        self.assertEqual(self.server.get_page(10, 10), self.rows[90:])
+        self.assertEqual(self.server.get_page(11, 10), [])
+        self.assertEqual(self.server.get_page(3000, 100), [])
+
+    def test_get_page_arguments(self):
+        for page, page_size in ((0, 10), (1, 0), (-1, 10), ("1", 10), (1, 2.0)):
+            with self.assertRaises(AssertionError):
+                self.server.get_page(page, page_size)
+
+    def test_get_pages(self):
+        pages = [1, 5, 10, 11, 2]
+        self.assertEqual(self.server.get_pages(pages, 10),
+                         [self.server.get_page(page, 10) for page in pages])
+        self.assertEqual(self.server.get_pages(iter([2]), 50), [self.rows[50:]])
+        self.assertEqual(self.server.get_pages([]), [])
+        with self.assertRaises(AssertionError):
+            self.server.get_pages([1, 0])
+        with self.assertRaises(AssertionError):
+            self.server.get_pages([1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
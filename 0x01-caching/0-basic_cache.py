@@ -1,31 +1,56 @@
 #!/usr/bin/env python3
 """ BasicCache module for caching key-value pairs """
 
-from base_caching import BaseCaching
+from bounded_caching import BoundedCaching
 
 
-class BasicCache(BaseCaching):
+class BasicCache(BoundedCaching):
     """
     BasicCache class for storing and retrieving key-value pairs.
+    It is unbounded unless given a capacity, and then evicts the oldest
+    entries first.
     Methods:
-        store_item(key, value) - adds a key-value pair to the cache
+        store_item(key, value, ttl) - adds a key-value pair to the cache
         retrieve_item(key) - retrieves the value associated with a key
     """
 
-    def __init__(self):
+    MAX_ITEMS = None  # No limit unless a capacity is given
+
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
         """
         Initialize the BasicCache instance using the parent class initializer.
+        Args:
+            max_items: The maximum number of entries, None for no limit
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
+        """
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+
+    def victim(self, exclude=None):
+        """
+        Choose the oldest entry for eviction.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
         """
-        super().__init__()
+        return self.first_key(iter(self.cache_data), exclude)
 
-    def store_item(self, key, value):
+    def store_item(self, key, value, ttl=None):
         """
         Add a key-value pair to the cache.
         Args:
             key: The key to store
             value: The value to associate with the key
+            ttl: How long the entry lives, default_ttl if None
         """
-        if key is not None and value is not None:
+        if key is not None and value is not None and self.make_room(key, value, ttl):
             self.cache_data[key] = value
 
     def retrieve_item(self, key):
@@ -36,4 +61,5 @@ class BasicCache(BaseCaching):
         Returns:
             The value associated with the key, or None if the key is not found.
         """
+        self.reclaim()
         return self.cache_data.get(key) if key is not None else None
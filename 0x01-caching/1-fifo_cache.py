@@ -1,25 +1,46 @@
 #!/usr/bin/env python3
 """ FIFOCache module implementing FIFO caching strategy """
 
-from base_caching import BaseCaching
+from collections import OrderedDict
+from bounded_caching import BoundedCaching
 
 
-class FIFOCache(BaseCaching):
+class FIFOCache(BoundedCaching):
     """
     FIFOCache implements a First-In-First-Out (FIFO) caching system.
     Methods:
-        store_item(key, value) - adds a key-value pair following FIFO policy
+        store_item(key, value, ttl) - adds a key-value pair following FIFO policy
         retrieve_item(key) - retrieves the value associated with a key
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
         """
         Initialize the FIFOCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
         """
-        super().__init__()
-        self.access_order = []  # Tracks insertion order for FIFO management
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+        self.cache_data = OrderedDict()  # Insertion order is the FIFO order
 
-    def store_item(self, key, value):
+    def victim(self, exclude=None):
+        """
+        Choose the oldest entry for eviction.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        return self.first_key(iter(self.cache_data), exclude)
+
+    def store_item(self, key, value, ttl=None):
         """
         Add a key-value pair to the cache following FIFO policy.
         If the cache exceeds its limit, removes the oldest entry.
@@ -27,15 +48,11 @@ class FIFOCache(BaseCaching):
         Args:
             key: The key to store
             value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
         """
         if key is not None and value is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                oldest_key = self.access_order.pop(0)
-                print("DISCARD:", oldest_key)
-                del self.cache_data[oldest_key]
-
-            self.access_order.append(key)
-            self.cache_data[key] = value
+            if self.make_room(key, value, ttl):
+                self.cache_data[key] = value  # An update keeps its place in line
 
     def retrieve_item(self, key):
         """
@@ -46,4 +63,5 @@ class FIFOCache(BaseCaching):
         Returns:
             The value associated with the key, or None if the key is not found.
         """
+        self.reclaim()
         return self.cache_data.get(key) if key is not None else None
@@ -1,26 +1,165 @@
 #!/usr/bin/env python3
 """ LFUCache module implementing Least Frequently Used (LFU) caching strategy """
 
-from base_caching import BaseCaching
+from collections import OrderedDict
+from heapq import merge
+from bounded_caching import BoundedCaching
 
 
-class LFUCache(BaseCaching):
+class FrequencyNode:
+    """
+    One bucket of the LFU frequency list.
+    Holds the keys used exactly `frequency` times, least recently used first,
+    each mapped to the tick of its last use.
+    """
+
+    __slots__ = ("frequency", "keys", "prev", "next")
+
+    def __init__(self, frequency):
+        """
+        Initialize an empty bucket.
+        Args:
+            frequency: The use count shared by the keys of the bucket
+        """
+        self.frequency = frequency
+        self.keys = OrderedDict()
+        self.prev = self
+        self.next = self
+
+
+class LFUCache(BoundedCaching):
     """
     LFUCache implements a Least Frequently Used (LFU) caching system.
+    Keys live in frequency buckets kept in a circular doubly linked list in
+    ascending frequency order, so every operation is O(1): a use moves a key
+    to the next bucket, and eviction takes the least recently used key of
+    the first bucket. With aging_interval set, the operation that completes
+    an interval also rebuilds every bucket, which is O(n); spread over the
+    interval that is O(1) amortized, O(n / aging_interval) per operation.
     Methods:
-        store_item(key, value) - adds a key-value pair following LFU policy
+        store_item(key, value, ttl) - adds a key-value pair following LFU policy
         retrieve_item(key) - retrieves the value associated with a key
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None,
+                 aging_interval=None):
         """
         Initialize the LFUCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
+            aging_interval: If set, halve every frequency after this many
+                operations, so keys that were popular long ago can be evicted;
+                each halving takes time proportional to the number of entries
+        """
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+        self.aging_interval = aging_interval
+        self.tick = 0           # Counts operations; orders uses across buckets
+        self.key_nodes = {}     # Maps each key to its frequency bucket
+        self.head = FrequencyNode(0)  # Sentinel: head.next is the least frequent bucket
+
+    def _insert_after(self, node, frequency):
+        """
+        Link a new empty bucket after node.
+        Returns:
+            The new bucket.
+        """
+        bucket = FrequencyNode(frequency)
+        bucket.prev = node
+        bucket.next = node.next
+        node.next.prev = bucket
+        node.next = bucket
+        return bucket
+
+    @staticmethod
+    def _unlink(node):
+        """
+        Remove an empty bucket from the list.
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _use(self, key):
         """
-        super().__init__()
-        self.access_order = []    # Tracks access order to handle ties in LFU eviction
-        self.access_frequency = {}  # Tracks access frequency of each key
+        Move a cached key to the bucket of its next frequency.
+        Args:
+            key: The key that was used
+        """
+        node = self.key_nodes[key]
+        del node.keys[key]
+        bucket = node.next
+        if bucket.frequency != node.frequency + 1:
+            bucket = self._insert_after(node, node.frequency + 1)
+        bucket.keys[key] = self.tick
+        self.key_nodes[key] = bucket
+        if not node.keys:
+            self._unlink(node)
+
+    def victim(self, exclude=None):
+        """
+        Choose the least recently used key among the least frequently used.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        node = self.head.next
+        while node is not self.head:
+            key = self.first_key(node.keys, exclude)
+            if key is not None:
+                return key
+            node = node.next
+        return None
+
+    def forget(self, key):
+        """
+        Remove an evicted key from its frequency bucket.
+        Args:
+            key: The key being evicted
+        """
+        node = self.key_nodes.pop(key)
+        del node.keys[key]
+        if not node.keys:
+            self._unlink(node)
+
+    def _count_operation(self):
+        """
+        Advance the tick, aging the frequencies when an interval has passed.
+        """
+        self.tick += 1
+        if self.aging_interval and self.tick % self.aging_interval == 0:
+            self._age()
+
+    def _age(self):
+        """
+        Halve every frequency (keeping at least 1), merging buckets that meet.
+        Merged buckets stay in least recently used order. This visits every
+        key, O(n), once per aging_interval operations.
+        """
+        merged = OrderedDict()
+        node = self.head.next
+        while node is not self.head:
+            merged.setdefault(max(node.frequency // 2, 1), []).append(node.keys)
+            node = node.next
+
+        self.head.next = self.head.prev = self.head
+        bucket = self.head
+        for frequency, buckets in merged.items():
+            bucket = self._insert_after(bucket, frequency)
+            items = buckets[0].items() if len(buckets) == 1 else \
+                merge(*(keys.items() for keys in buckets), key=lambda item: item[1])
+            bucket.keys = OrderedDict(items)
+            for key in bucket.keys:
+                self.key_nodes[key] = bucket
 
-    def store_item(self, key, value):
+    def store_item(self, key, value, ttl=None):
         """
         Add a key-value pair to the cache following LFU policy.
         If the cache exceeds its limit, removes the least frequently used entry.
@@ -29,44 +168,35 @@ class LFUCache(BaseCaching):
         Args:
             key: The key to store
             value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
         """
         if key is not None and value is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                # Find least frequently used keys
-                min_frequency = min(self.access_frequency.values())
-                least_frequent_keys = [k for k, v in self.access_frequency.items() if v == min_frequency]
-                
-                # If multiple least frequent keys, discard least recently used one
-                if len(least_frequent_keys) > 1:
-                    discard_key = min(least_frequent_keys, key=lambda k: self.access_order.index(k))
-                else:
-                    discard_key = least_frequent_keys[0]
-                
-                print("DISCARD:", discard_key)
-                del self.cache_data[discard_key]
-                del self.access_order[self.access_order.index(discard_key)]
-                del self.access_frequency[discard_key]
-
-            # Update frequency and access order
-            self.access_frequency[key] = self.access_frequency.get(key, 0) + 1
-            if key in self.access_order:
-                self.access_order.remove(key)
-            self.access_order.append(key)
+            if not self.make_room(key, value, ttl):
+                return
+            if key in self.cache_data:
+                self._use(key)
+            else:
+                bucket = self.head.next
+                if bucket.frequency != 1:
+                    bucket = self._insert_after(self.head, 1)
+                bucket.keys[key] = self.tick
+                self.key_nodes[key] = bucket
             self.cache_data[key] = value
+            self._count_operation()
 
     def retrieve_item(self, key):
         """
         Retrieve the value associated with a key from the cache.
-        If accessed, updates the key's frequency and its position in the access order.
+        If accessed, moves the key to the bucket of its next frequency.
         
         Args:
             key: The key to retrieve the value for
         Returns:
             The value associated with the key, or None if the key is not found.
         """
+        self.reclaim()
         if key is not None and key in self.cache_data:
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            self.access_frequency[key] += 1
+            self._use(key)
+            self._count_operation()
             return self.cache_data[key]
         return None
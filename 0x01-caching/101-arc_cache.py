@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+""" ARCCache module implementing Adaptive Replacement Cache (ARC) caching strategy """
+
+from collections import OrderedDict
+from bounded_caching import BoundedCaching
+
+
+class ARCCache(BoundedCaching):
+    """
+    ARCCache implements an Adaptive Replacement Cache (ARC) caching system.
+    Cached keys are split between recent (seen once, T1) and frequent (seen
+    again, T2) lists, each least recently used first. Keys evicted from
+    them are remembered without their value in ghost lists B1 and B2; a
+    miss that hits a ghost list moves the target size of T1 towards the
+    side that would have kept the key. A one-off scan only ever fills T1,
+    so it cannot flush the keys of T2. Every operation is O(1).
+    The ghost lists are sized by max_items; with a byte bound only, the
+    number of cached entries stands in for it.
+    Methods:
+        store_item(key, value, ttl) - adds a key-value pair following ARC policy
+        retrieve_item(key) - retrieves the value associated with a key
+    """
+
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
+        """
+        Initialize the ARCCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
+        """
+        self.recent = OrderedDict()         # T1: cached keys seen once
+        self.frequent = OrderedDict()       # T2: cached keys seen at least twice
+        self.recent_ghosts = OrderedDict()  # B1: keys evicted from T1
+        self.frequent_ghosts = OrderedDict()  # B2: keys evicted from T2
+        self.target = 0.0                   # p: the size T1 should have
+        self.incoming_ghost = False         # The key being stored is in B2
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+
+    def _capacity(self):
+        """
+        Return the number of entries the lists are sized for.
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return max(len(self.cache_data), 1)
+
+    def victim(self, exclude=None):
+        """
+        Choose the least recently used key of T1 while T1 is over its target
+        size, otherwise the least recently used key of T2.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        size = len(self.recent)
+        if size and (size > self.target or (self.incoming_ghost and size == self.target)):
+            lists = (self.recent, self.frequent)
+        else:
+            lists = (self.frequent, self.recent)
+        for keys in lists:
+            key = self.first_key(keys, exclude)
+            if key is not None:
+                return key
+        return None
+
+    def forget(self, key):
+        """
+        Move a key leaving the cache to the ghost list of its list.
+        Args:
+            key: The key being removed
+        """
+        if key in self.recent:
+            del self.recent[key]
+            self.recent_ghosts[key] = None
+        else:
+            del self.frequent[key]
+            self.frequent_ghosts[key] = None
+        self._trim_ghosts()
+
+    def _trim_ghosts(self):
+        """
+        Drop the oldest ghosts until T1 + B1 hold at most the capacity and
+        all four lists at most twice the capacity.
+        """
+        capacity = self._capacity()
+        self.target = min(self.target, capacity)
+        while self.recent_ghosts and len(self.recent) + len(self.recent_ghosts) > capacity:
+            self.recent_ghosts.popitem(last=False)
+        while self.frequent_ghosts and (len(self.recent) + len(self.frequent) + len(
+                self.recent_ghosts) + len(self.frequent_ghosts) > 2 * capacity):
+            self.frequent_ghosts.popitem(last=False)
+
+    def _use(self, key):
+        """
+        Move a cached key to the most recently used end of T2.
+        Args:
+            key: The key that was used
+        """
+        if key in self.recent:
+            del self.recent[key]
+            self.frequent[key] = None
+        else:
+            self.frequent.move_to_end(key)
+
+    def store_item(self, key, value, ttl=None):
+        """
+        Add a key-value pair to the cache following ARC policy.
+        A key found in a ghost list adapts the target size of T1 and is
+        cached as frequent; any other new key is cached as recent.
+
+        Args:
+            key: The key to store
+            value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
+        """
+        if key is None or value is None:
+            return
+        ghost = None
+        if key not in self.cache_data:
+            if key in self.recent_ghosts:
+                ghost = self.recent_ghosts
+                step = max(len(self.frequent_ghosts) / len(self.recent_ghosts), 1)
+                self.target = min(self.target + step, self._capacity())
+            elif key in self.frequent_ghosts:
+                ghost = self.frequent_ghosts
+                step = max(len(self.recent_ghosts) / len(self.frequent_ghosts), 1)
+                self.target = max(self.target - step, 0)
+            self.incoming_ghost = ghost is self.frequent_ghosts
+            if ghost is not None:
+                del ghost[key]
+        try:
+            stored = self.make_room(key, value, ttl)
+        finally:
+            self.incoming_ghost = False
+        if not stored:
+            return
+        if key in self.cache_data:
+            self._use(key)
+        elif ghost is not None:
+            self.frequent[key] = None
+        else:
+            self.recent[key] = None
+        self.cache_data[key] = value
+        self._trim_ghosts()
+
+    def retrieve_item(self, key):
+        """
+        Retrieve the value associated with a key from the cache.
+        If accessed, moves the key to the most recently used end of T2.
+
+        Args:
+            key: The key to retrieve the value for
+        Returns:
+            The value associated with the key, or None if the key is not found.
+        """
+        self.reclaim()
+        if key is not None and key in self.cache_data:
+            self._use(key)
+            return self.cache_data[key]
+        return None
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+""" TinyLFUCache module implementing Window TinyLFU (W-TinyLFU) caching strategy """
+
+from collections import OrderedDict
+from bounded_caching import UNCHANGED, BoundedCaching
+
+
+class CountMinSketch:
+    """
+    Approximate access counts in a fixed amount of memory.
+    Each key increments one 4-bit counter in each of `depth` rows and its
+    estimate is the smallest of them. After `sample_size` increments every
+    counter is halved, so the counts follow recent popularity; the reset
+    touches every counter but happens once per sample, so increments stay
+    O(1) amortized.
+    """
+
+    DEPTH = 4
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT = 15
+
+    def __init__(self, width):
+        """
+        Initialize zeroed counters.
+        Args:
+            width: The number of counters per row, rounded up to a power of two
+        """
+        bits = max(width - 1, 1).bit_length()
+        self.shift = 64 - bits  # Rows are indexed by the top bits of a 64-bit hash
+        self.rows = [bytearray(1 << bits) for _ in range(self.DEPTH)]
+        self.sample_size = 10 << bits
+        self.additions = 0
+
+    def increment(self, key):
+        """
+        Count one access to key.
+        """
+        spread = hash(key) & 0xFFFFFFFFFFFFFFFF
+        shift = self.shift
+        for row, seed in zip(self.rows, self.SEEDS):
+            index = ((spread * seed) & 0xFFFFFFFFFFFFFFFF) >> shift
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.reset()
+
+    def estimate(self, key):
+        """
+        Return the estimated number of recent accesses to key.
+        """
+        spread = hash(key) & 0xFFFFFFFFFFFFFFFF
+        shift = self.shift
+        return min(row[((spread * seed) & 0xFFFFFFFFFFFFFFFF) >> shift]
+                   for row, seed in zip(self.rows, self.SEEDS))
+
+    def reset(self):
+        """
+        Halve every counter.
+        """
+        halve = bytes(count >> 1 for count in range(256))
+        self.rows = [row.translate(halve) for row in self.rows]
+        self.additions //= 2
+
+
+class TinyLFUCache(BoundedCaching):
+    """
+    TinyLFUCache implements a Window TinyLFU (W-TinyLFU) caching system.
+    New keys enter a small window LRU (1% of the capacity). The rest of
+    the cache is a segmented LRU: keys leaving the window are put on
+    probation, and a probation key used again is protected (80% of the
+    main space). When the cache is full, the key leaving the window only
+    takes the place of the next probation victim if a count-min sketch of
+    recent accesses says it is used more often; otherwise it is the one
+    evicted. Scans therefore pass through the window without displacing
+    the frequently used keys, while the sketch's periodic halving lets
+    old favourites go. Every operation is O(1) amortized.
+    The segments and the sketch are sized by max_items; with a byte bound
+    only, the number of cached entries stands in for it, and the sketch
+    is rebuilt twice as wide whenever the entries outgrow it.
+    Each request counts once in the sketch: a put right after a get miss
+    for the same key is the same request.
+    Methods:
+        store_item(key, value, ttl) - adds a key-value pair following W-TinyLFU policy
+        retrieve_item(key) - retrieves the value associated with a key
+    """
+
+    WINDOW_SHARE = 0.01
+    PROTECTED_SHARE = 0.8
+    SKETCH_WIDTH = 4  # Sketch counters per row, per entry of capacity
+
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
+        """
+        Initialize the TinyLFUCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
+        """
+        self.window = OrderedDict()     # Least recently used first
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = None
+        self.missed = None  # The key of the last get, if it missed
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+
+    def _capacity(self):
+        """
+        Return the number of entries the segments are sized for.
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return max(len(self.cache_data), 1)
+
+    def resize(self, max_items=UNCHANGED, max_bytes=UNCHANGED):
+        """
+        Set new bounds, evicting at once, and size the sketch for them.
+        A bound that is not given stays as it is.
+        Args:
+            max_items: The maximum number of entries, None for no limit
+            max_bytes: The maximum total size of the values, None for no limit
+        """
+        super().resize(max_items, max_bytes)
+        self._size_sketch()
+
+    def _size_sketch(self):
+        """
+        Replace the sketch by a wider one if the capacity outgrew it.
+        """
+        width = max(self._capacity() * self.SKETCH_WIDTH, 16)
+        if self.sketch is None or len(self.sketch.rows[0]) < width:
+            self.sketch = CountMinSketch(width)
+
+    def _window_size(self):
+        """
+        Return the number of entries the window holds before spilling over.
+        """
+        return max(int(self._capacity() * self.WINDOW_SHARE), 1)
+
+    def victim(self, exclude=None):
+        """
+        Choose between the oldest window key and the oldest probation key.
+        While the window is full, its oldest key is the candidate: if the
+        sketch counts it as more frequent than the probation victim, it
+        moves to probation and the probation victim is evicted instead.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        main = self.first_key(self.probation, exclude)
+        if main is None:
+            main = self.first_key(self.protected, exclude)
+        candidate = self.first_key(self.window, exclude)
+        if candidate is None:
+            return main
+        if main is None:
+            return candidate
+        if len(self.window) < self._window_size():
+            return main
+        if self.sketch.estimate(candidate) > self.sketch.estimate(main):
+            del self.window[candidate]
+            self.probation[candidate] = None
+            return main
+        return candidate
+
+    def forget(self, key):
+        """
+        Remove a key leaving the cache from its segment.
+        Args:
+            key: The key being removed
+        """
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def _use(self, key):
+        """
+        Refresh a cached key: protect it if it was on probation.
+        Args:
+            key: The key that was used
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            limit = max(int((self._capacity() - self._window_size()) * self.PROTECTED_SHARE), 1)
+            if len(self.protected) > limit:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def store_item(self, key, value, ttl=None):
+        """
+        Add a key-value pair to the cache following W-TinyLFU policy.
+        A new key enters the window; while the cache has room, keys leaving
+        the window go on probation without any eviction.
+
+        Args:
+            key: The key to store
+            value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
+        """
+        if key is None or value is None:
+            return
+        if key != self.missed:
+            self.sketch.increment(key)
+        self.missed = None
+        if not self.make_room(key, value, ttl):
+            return
+        if key in self.cache_data:
+            self._use(key)
+            self.cache_data[key] = value
+        else:
+            self.cache_data[key] = value  # Counted when sizing the window
+            self.window[key] = None
+            if len(self.window) > self._window_size():
+                spilled, _ = self.window.popitem(last=False)
+                self.probation[spilled] = None
+        if self.max_items is None:
+            self._size_sketch()
+
+    def retrieve_item(self, key):
+        """
+        Retrieve the value associated with a key from the cache.
+        Every lookup, hit or miss, is counted by the sketch; a miss is
+        remembered so that storing the key next does not count it again.
+
+        Args:
+            key: The key to retrieve the value for
+        Returns:
+            The value associated with the key, or None if the key is not found.
+        """
+        self.reclaim()
+        self.missed = None
+        if key is None:
+            return None
+        self.sketch.increment(key)
+        if key in self.cache_data:
+            self._use(key)
+            return self.cache_data[key]
+        self.missed = key
+        return None
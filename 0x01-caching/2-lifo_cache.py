@@ -1,25 +1,46 @@
 #!/usr/bin/env python3
 """ LIFOCache module implementing LIFO caching strategy """
 
-from base_caching import BaseCaching
+from collections import OrderedDict
+from bounded_caching import BoundedCaching
 
 
-class LIFOCache(BaseCaching):
+class LIFOCache(BoundedCaching):
     """
     LIFOCache implements a Last-In-First-Out (LIFO) caching system.
     Methods:
-        store_item(key, value) - adds a key-value pair following LIFO policy
+        store_item(key, value, ttl) - adds a key-value pair following LIFO policy
         retrieve_item(key) - retrieves the value associated with a key
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
         """
         Initialize the LIFOCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
         """
-        super().__init__()
-        self.access_stack = []  # Tracks insertion order for LIFO management
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+        self.cache_data = OrderedDict()  # The last entry is the top of the stack
 
-    def store_item(self, key, value):
+    def victim(self, exclude=None):
+        """
+        Choose the most recently added entry for eviction.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        return self.first_key(reversed(self.cache_data), exclude)
+
+    def store_item(self, key, value, ttl=None):
         """
         Add a key-value pair to the cache following LIFO policy.
         If the cache exceeds its limit, removes the most recently added entry.
@@ -27,18 +48,12 @@ class LIFOCache(BaseCaching):
         Args:
             key: The key to store
             value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
         """
         if key is not None and value is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                last_key = self.access_stack.pop()
-                print("DISCARD:", last_key)
-                del self.cache_data[last_key]
-
-            if key in self.access_stack:
-                self.access_stack.remove(key)
-                
-            self.access_stack.append(key)
-            self.cache_data[key] = value
+            if self.make_room(key, value, ttl):
+                self.cache_data[key] = value
+                self.cache_data.move_to_end(key)
 
     def retrieve_item(self, key):
         """
@@ -49,4 +64,5 @@ class LIFOCache(BaseCaching):
         Returns:
             The value associated with the key, or None if the key is not found.
         """
+        self.reclaim()
         return self.cache_data.get(key) if key is not None else None
@@ -1,25 +1,46 @@
 #!/usr/bin/env python3
 """ MRUCache module implementing Most Recently Used (MRU) caching strategy """
 
-from base_caching import BaseCaching
+from collections import OrderedDict
+from bounded_caching import BoundedCaching
 
 
-class MRUCache(BaseCaching):
+class MRUCache(BoundedCaching):
     """
     MRUCache implements a Most Recently Used (MRU) caching system.
     Methods:
-        store_item(key, value) - adds a key-value pair following MRU policy
+        store_item(key, value, ttl) - adds a key-value pair following MRU policy
         retrieve_item(key) - retrieves the value associated with a key
     """
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
         """
         Initialize the MRUCache instance using the parent's initializer.
+        Args:
+            max_items: The maximum number of entries (MAX_ITEMS by default)
+            max_bytes: The maximum total size of the values in bytes
+            sizer: Returns the size of a value in bytes
+            default_ttl: How long entries live when stored without a ttl
+            clock: Returns the current time, time.monotonic by default
+            listeners: Callables told of every eviction as (key, value, cause)
+            metrics: A CacheMetrics to record into, None to record nothing
         """
-        super().__init__()
-        self.recent_usage = []  # Tracks key usage order for MRU management
+        super().__init__(max_items, max_bytes, sizer, default_ttl, clock,
+                         listeners, metrics)
+        self.cache_data = OrderedDict()  # Ordered from least to most recently used
 
-    def store_item(self, key, value):
+    def victim(self, exclude=None):
+        """
+        Choose the most recently used entry for eviction.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        return self.first_key(reversed(self.cache_data), exclude)
+
+    def store_item(self, key, value, ttl=None):
         """
         Add a key-value pair to the cache following MRU policy.
         If the cache exceeds its limit, removes the most recently used entry.
@@ -27,18 +48,12 @@ class MRUCache(BaseCaching):
         Args:
             key: The key to store
             value: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
         """
         if key is not None and value is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                most_recent_key = self.recent_usage.pop()
-                print("DISCARD:", most_recent_key)
-                del self.cache_data[most_recent_key]
-
-            if key in self.recent_usage:
-                self.recent_usage.remove(key)
-                
-            self.recent_usage.append(key)
-            self.cache_data[key] = value
+            if self.make_room(key, value, ttl):
+                self.cache_data[key] = value
+                self.cache_data.move_to_end(key)
 
     def retrieve_item(self, key):
         """
@@ -50,8 +65,8 @@ class MRUCache(BaseCaching):
         Returns:
             The value associated with the key, or None if the key is not found.
         """
+        self.reclaim()
         if key is not None and key in self.cache_data:
-            self.recent_usage.remove(key)
-            self.recent_usage.append(key)
+            self.cache_data.move_to_end(key)
             return self.cache_data[key]
         return None
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+""" Benchmark of the per-operation cost of the caching policies by capacity
+
+Usage: ./bench_caches.py [operations]
+"""
+import sys
+import time
+
+POLICIES = {
+    "FIFOCache": __import__('1-fifo_cache').FIFOCache,
+    "LIFOCache": __import__('2-lifo_cache').LIFOCache,
+    "LRUCache": __import__('3-lru_cache').LRUCache,
+    "MRUCache": __import__('4-mru_cache').MRUCache,
+    "LFUCache": __import__('100-lfu_cache').LFUCache,
+    "ARCCache": __import__('101-arc_cache').ARCCache,
+    "TinyLFUCache": __import__('102-tinylfu_cache').TinyLFUCache,
+}
+CAPACITIES = (4, 100, 10000, 1000000)
+
+
+def per_operation_ns(cache_class, capacity, operations):
+    """
+    Times hits and evicting inserts on a full cache of the given capacity.
+
+    Returns:
+        tuple(hit_ns, evict_ns): the mean cost of one operation of each kind
+    """
+    cache = cache_class(max_items=capacity)
+    for key in range(capacity):
+        cache.put(key, key)
+
+    keys = [key % capacity for key in range(0, operations * 7919, 7919)]
+    started = time.perf_counter_ns()
+    for key in keys:
+        cache.get(key)
+    hit_ns = (time.perf_counter_ns() - started) / operations
+
+    keys = range(capacity, capacity + operations)
+    started = time.perf_counter_ns()
+    for key in keys:
+        cache.put(key, key)
+    evict_ns = (time.perf_counter_ns() - started) / operations
+    return hit_ns, evict_ns
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{:<12} {:>9} {:>10} {:>10}".format("policy", "capacity", "hit ns", "evict ns"))
+    for name, cache_class in POLICIES.items():
+        for capacity in CAPACITIES:
+            hit_ns, evict_ns = per_operation_ns(cache_class, capacity, operations)
+            print("{:<12} {:>9} {:>10.0f} {:>10.0f}".format(name, capacity, hit_ns, evict_ns))
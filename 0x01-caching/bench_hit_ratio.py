@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+""" Benchmark of the hit ratio of the caching policies on synthetic traces
+
+Every trace is generated from a fixed seed, so runs are comparable:
+    zipf      - skewed popularity (alpha 0.99) over 10000 keys
+    zipf+scan - the same, interrupted by one-off sequential scans
+    loop      - the same 1500 keys requested over and over in order
+    shift     - skewed popularity whose favourite keys change halfway
+Each request is a get(); a miss is followed by a put() of the key.
+
+Usage: ./bench_hit_ratio.py [requests]
+"""
+import itertools
+import random
+import sys
+
+POLICIES = {
+    "FIFO": __import__('1-fifo_cache').FIFOCache,
+    "LIFO": __import__('2-lifo_cache').LIFOCache,
+    "LRU": __import__('3-lru_cache').LRUCache,
+    "MRU": __import__('4-mru_cache').MRUCache,
+    "LFU": __import__('100-lfu_cache').LFUCache,
+    "ARC": __import__('101-arc_cache').ARCCache,
+    "TinyLFU": __import__('102-tinylfu_cache').TinyLFUCache,
+}
+CAPACITIES = (100, 1000)
+KEYS = 10000
+
+
+def zipf(rng, requests, keys=KEYS, alpha=0.99, offset=0):
+    """
+    Returns requests keys drawn with probability proportional to 1 / rank ** alpha.
+    """
+    weights = itertools.accumulate(1 / rank ** alpha for rank in range(1, keys + 1))
+    return [key + offset for key in
+            rng.choices(range(keys), cum_weights=list(weights), k=requests)]
+
+
+def traces(requests, seed=0):
+    """
+    Returns a dict of trace name to list of keys.
+    """
+    rng = random.Random(seed)
+    scanned = zipf(rng, requests)
+    scan_key = KEYS
+    for start in range(requests // 10, requests, requests // 5 or 1):
+        length = min(requests // 20, requests - start)
+        scanned[start:start + length] = range(scan_key, scan_key + length)
+        scan_key += length
+    half = requests // 2
+    return {
+        "zipf": zipf(rng, requests),
+        "zipf+scan": scanned,
+        "loop": [key % 1500 for key in range(requests)],
+        "shift": zipf(rng, half) + zipf(rng, requests - half, offset=KEYS),
+    }
+
+
+def hit_ratio(cache_class, capacity, trace):
+    """
+    Replays a trace on an empty cache.
+
+    Returns:
+        float: the fraction of requests that were hits
+    """
+    cache = cache_class(max_items=capacity)
+    hits = 0
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(("{:<10} {:>8}" + " {:>7}" * len(POLICIES)).format("trace", "capacity", *POLICIES))
+    for name, trace in traces(requests).items():
+        for capacity in CAPACITIES:
+            ratios = [hit_ratio(cache_class, capacity, trace) for cache_class in POLICIES.values()]
+            print(("{:<10} {:>8}" + " {:>7.3f}" * len(ratios)).format(name, capacity, *ratios))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" Benchmark of ShardedCache throughput by thread and shard count
+
+Usage: ./bench_sharded_cache.py [operations per thread]
+"""
+import random
+import sys
+import threading
+import time
+from sharded_cache import ShardedCache
+
+LRUCache = __import__('3-lru_cache').LRUCache
+THREADS = (1, 4, 16, 64)
+SHARDS = (1, 4, 16, 64)
+KEYS = 100000
+
+
+def throughput(threads, shards, operations):
+    """
+    Runs threads workers doing 90% reads and 10% writes on one cache.
+    Returns:
+        tuple(ops_per_second, hit_rate)
+    """
+    cache = ShardedCache(LRUCache, shards, max_items=KEYS // 4)
+    barrier = threading.Barrier(threads + 1)
+
+    def work(seed):
+        rng = random.Random(seed)
+        keys = [int(KEYS * rng.random() ** 3) for _ in range(operations)]
+        barrier.wait()
+        for number, key in enumerate(keys):
+            if number % 10:
+                cache.get(key)
+            else:
+                cache.put(key, number)
+
+    workers = [threading.Thread(target=work, args=(seed,)) for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    return threads * operations / elapsed, cache.stats()["hit_rate"]
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{:>7} {:>6} {:>12} {:>8}".format("threads", "shards", "ops/s", "hit rate"))
+    for threads in THREADS:
+        for shards in SHARDS:
+            ops, hit_rate = throughput(threads, shards, operations)
+            print("{:>7} {:>6} {:>12.0f} {:>8.3f}".format(threads, shards, ops, hit_rate))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+""" BoundedCaching module adding per-instance capacity, TTLs and metrics to BaseCaching """
+
+import sys
+import time
+from base_caching import BaseCaching
+from timing_wheel import TimingWheel
+
+UNCHANGED = object()  # Default of resize(): keep the current bound
+
+
+class BoundedCaching(BaseCaching):
+    """
+    BoundedCaching gives each cache its own capacity, as a maximum number of
+    items, a maximum total size of the values in bytes, or both.
+    Subclasses decide which entry goes first by implementing victim(), and
+    drop their own bookkeeping for an evicted key in forget().
+    Entries may also expire: a per-entry or default time to live is filed
+    in a TimingWheel, and expired entries are reclaimed in bulk before every
+    read, write or eviction, so reads miss them and the policy never evicts
+    a live entry while an expired one is still cached.
+    Every removal other than an explicit one is reported to the eviction
+    listeners as listener(key, value, cause), cause being "capacity",
+    "oversized" or "expired"; nothing is printed unless
+    cache_metrics.print_discard is one of them. With a CacheMetrics, put()
+    and get() also count hits, misses, inserts, updates and evictions, and
+    time sampled operations.
+    Methods:
+        make_room(key, value, ttl) - evicts entries until value fits under key
+        reclaim() - removes the entries that have expired
+        resize(max_items, max_bytes) - changes the capacity, evicting at once
+        evict(key, cause) - removes an entry and tells the listeners
+    """
+
+    TTL_TICK = 1.0  # Granularity of the timing wheel, in clock units
+
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, listeners=None, metrics=None):
+        """
+        Initialize the capacity; with neither bound given, MAX_ITEMS applies.
+        Args:
+            max_items: The maximum number of entries, None for no limit
+            max_bytes: The maximum total size of the values, None for no limit
+            sizer: Returns the size of a value in bytes; sys.getsizeof by
+                default, which does not count the objects a value refers to
+            default_ttl: How long entries stored without a ttl live, None
+                for ever
+            clock: Returns the current time; time.monotonic by default
+            listeners: Callables told of every eviction, e.g. print_discard
+            metrics: A CacheMetrics to record into, None to record nothing
+        """
+        super().__init__()
+        if max_items is None and max_bytes is None:
+            max_items = self.MAX_ITEMS
+        self.default_ttl = default_ttl
+        self.clock = clock or time.monotonic
+        self.wheel = None  # Created with the first entry that expires
+        self.listeners = list(listeners or ())
+        self.metrics = metrics
+        self.sizer = sizer or sys.getsizeof
+        self.item_sizes = {}  # Size of each value, kept only with max_bytes
+        self.total_bytes = 0
+        self.max_items = None
+        self.max_bytes = None
+        self.resize(max_items, max_bytes)
+
+    def victim(self, exclude=None):
+        """
+        Choose the next entry to evict.
+        Args:
+            exclude: A key that must not be chosen
+        Returns:
+            The key to evict, or None if there is no other entry.
+        """
+        raise NotImplementedError("victim must be implemented in your cache class")
+
+    def forget(self, key):
+        """
+        Drop the policy bookkeeping of a key leaving the cache.
+        Args:
+            key: The key being removed
+        """
+
+    @staticmethod
+    def first_key(keys, exclude=None):
+        """
+        Return the first key of an iterable that is not exclude, or None.
+        """
+        for key in keys:
+            if key != exclude:
+                return key
+        return None
+
+    def remove(self, key):
+        """
+        Remove an entry and every record kept about it.
+        Args:
+            key: The key to remove
+        """
+        self.forget(key)
+        del self.cache_data[key]
+        if self.max_bytes is not None:
+            self.total_bytes -= self.item_sizes.pop(key)
+        if self.wheel is not None:
+            self.wheel.cancel(key)
+
+    def evict(self, key, cause="capacity"):
+        """
+        Remove an entry the cache chose to drop and report it.
+        Args:
+            key: The key to remove
+            cause: Why it goes, "capacity", "oversized" or "expired"
+        """
+        value = self.cache_data[key]
+        self.remove(key)
+        if self.metrics is not None:
+            self.metrics.evictions[cause] += 1
+        for listener in self.listeners:
+            listener(key, value, cause)
+
+    def reclaim(self):
+        """
+        Remove every entry whose time to live has passed.
+        """
+        if self.wheel is not None:
+            for key in self.wheel.advance(self.clock()):
+                self.evict(key, "expired")
+
+    def make_room(self, key, value, ttl=None):
+        """
+        Evict entries until value can be stored under key, then account for it.
+        A value larger than max_bytes is not stored, and an older value under
+        the same key is evicted so that it is not served in its place; no
+        other entry is evicted for it.
+        Args:
+            key: The key about to be stored
+            value: The value about to be stored
+            ttl: How long the entry lives, default_ttl if None
+        Returns:
+            True if the value can be stored, False otherwise.
+        """
+        self.reclaim()
+        adding = key not in self.cache_data
+        if self.max_bytes is not None:
+            size = self.sizer(value)
+            if size > self.max_bytes:
+                if not adding:
+                    self.evict(key, "oversized")
+                return False
+        if self.max_items is not None and adding:
+            while len(self.cache_data) >= self.max_items:
+                victim = self.victim(exclude=key)
+                if victim is None:
+                    return False
+                self.evict(victim)
+        if self.max_bytes is not None:
+            old_size = self.item_sizes.get(key, 0)
+            while self.total_bytes - old_size + size > self.max_bytes:
+                self.evict(self.victim(exclude=key))
+            self.item_sizes[key] = size
+            self.total_bytes += size - old_size
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl is not None:
+            now = self.clock()
+            if self.wheel is None:
+                self.wheel = TimingWheel(now, self.TTL_TICK)
+            self.wheel.schedule(key, now + ttl)
+        elif self.wheel is not None:
+            self.wheel.cancel(key)
+        if self.metrics is not None:
+            if adding:
+                self.metrics.inserts += 1
+            else:
+                self.metrics.updates += 1
+        return True
+
+    def resize(self, max_items=UNCHANGED, max_bytes=UNCHANGED):
+        """
+        Set new bounds and evict entries at once until the cache fits them.
+        A bound that is not given stays as it is; if both end up None,
+        MAX_ITEMS applies, as in __init__.
+        Args:
+            max_items: The maximum number of entries, None for no limit
+            max_bytes: The maximum total size of the values, None for no limit
+        """
+        if max_items is UNCHANGED:
+            max_items = self.max_items
+        if max_bytes is UNCHANGED:
+            max_bytes = self.max_bytes
+        if max_items is None and max_bytes is None:
+            max_items = self.MAX_ITEMS
+        if max_bytes is not None and self.max_bytes is None:
+            self.item_sizes = {key: self.sizer(value) for key, value in self.cache_data.items()}
+            self.total_bytes = sum(self.item_sizes.values())
+        elif max_bytes is None:
+            self.item_sizes = {}
+            self.total_bytes = 0
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.reclaim()
+        while self.cache_data and (
+                (max_items is not None and len(self.cache_data) > max_items)
+                or (max_bytes is not None and self.total_bytes > max_bytes)):
+            self.evict(self.victim())
+
+    def put(self, key, item, ttl=None):
+        """
+        Store an item through store_item, recording it in the metrics.
+        Args:
+            key: The key to store
+            item: The value associated with the key
+            ttl: How long the entry lives, default_ttl if None
+        """
+        metrics = self.metrics
+        if metrics is None or not metrics.sample():
+            self.store_item(key, item, ttl)
+            return
+        started = time.perf_counter()
+        self.store_item(key, item, ttl)
+        metrics.observe("put", time.perf_counter() - started)
+
+    def get(self, key):
+        """
+        Retrieve a value through retrieve_item, counting a hit or a miss.
+        Args:
+            key: The key to retrieve the value for
+        Returns:
+            The value associated with the key, or None if the key is not found.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self.retrieve_item(key)
+        if metrics.sample():
+            started = time.perf_counter()
+            value = self.retrieve_item(key)
+            metrics.observe("get", time.perf_counter() - started)
+        else:
+            value = self.retrieve_item(key)
+        if value is None:
+            metrics.misses += 1
+        else:
+            metrics.hits += 1
+        return value
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+""" CacheMetrics module counting cache operations and sampling their latency """
+
+from bisect import bisect_left
+
+EVICTION_CAUSES = ("capacity", "oversized", "expired")
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+                   1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2)  # Upper bounds, in seconds
+
+
+def print_discard(key, value, cause):
+    """
+    Eviction listener printing "DISCARD: key" for every entry the policy
+    evicts, like the original caches did; expired entries are not printed.
+    """
+    if cause != "expired":
+        print("DISCARD:", key)
+
+
+class CacheMetrics:
+    """
+    CacheMetrics holds the counters of one cache: hits, misses, inserts,
+    updates and evictions by cause, and, when sampling is on, a latency
+    histogram per operation. It is not locked; give every cache that may be
+    used from another thread its own instance and merge them for export.
+    Methods:
+        sample() - tells whether the next operation should be timed
+        observe(operation, seconds) - records a timed operation
+        merge(other) - adds the counts of another CacheMetrics
+        as_dict() - returns every counter as plain data
+        prometheus(prefix, labels) - returns the Prometheus text format
+    """
+
+    def __init__(self, sample_every=0, buckets=LATENCY_BUCKETS):
+        """
+        Initialize every counter to zero.
+        Args:
+            sample_every: Time one operation in this many, 0 to time none
+            buckets: The ascending upper bounds of the histogram, in seconds
+        """
+        assert isinstance(sample_every, int) and sample_every >= 0, \
+            "sample_every must be a non-negative integer"
+        self.sample_every = sample_every
+        self.buckets = tuple(buckets)
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.evictions = dict.fromkeys(EVICTION_CAUSES, 0)
+        self.latencies = {}  # Maps an operation to [bucket counts, sum, count]
+        self.countdown = sample_every
+
+    def fork(self):
+        """
+        Return a new, empty CacheMetrics with the same settings.
+        """
+        return CacheMetrics(self.sample_every, self.buckets)
+
+    def sample(self):
+        """
+        Tell whether the current operation should be timed.
+        Returns:
+            True once every sample_every calls, never if sample_every is 0.
+        """
+        if not self.sample_every:
+            return False
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = self.sample_every
+        return True
+
+    def observe(self, operation, seconds):
+        """
+        Record the duration of a timed operation.
+        Args:
+            operation: The operation name, "get" or "put"
+            seconds: How long it took
+        """
+        histogram = self.latencies.get(operation)
+        if histogram is None:
+            histogram = self.latencies[operation] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        histogram[0][bisect_left(self.buckets, seconds)] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+
+    def merge(self, other):
+        """
+        Add the counts of another CacheMetrics with the same buckets.
+        Args:
+            other: The CacheMetrics to add
+        Returns:
+            self, so shards can be folded into one report.
+        """
+        assert other.buckets == self.buckets, "cannot merge different histogram buckets"
+        self.hits += other.hits
+        self.misses += other.misses
+        self.inserts += other.inserts
+        self.updates += other.updates
+        for cause, count in other.evictions.items():
+            self.evictions[cause] = self.evictions.get(cause, 0) + count
+        for operation, (counts, total, count) in other.latencies.items():
+            histogram = self.latencies.setdefault(
+                operation, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            histogram[0] = [mine + theirs for mine, theirs in zip(histogram[0], counts)]
+            histogram[1] += total
+            histogram[2] += count
+        return self
+
+    def as_dict(self):
+        """
+        Return every counter as plain data.
+        Returns:
+            A dict of hits, misses, hit_rate, inserts, updates, evictions by
+            cause and, per sampled operation, its cumulative histogram.
+        """
+        lookups = self.hits + self.misses
+        latencies = {}
+        for operation, (counts, total, count) in self.latencies.items():
+            cumulative = []
+            running = 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            latencies[operation] = {
+                "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"],
+                                    cumulative)),
+                "sum": total, "count": count}
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "inserts": self.inserts, "updates": self.updates,
+                "evictions": dict(self.evictions), "latency_seconds": latencies}
+
+    def prometheus(self, prefix="cache", labels=None):
+        """
+        Return the counters in the Prometheus text exposition format.
+        Args:
+            prefix: Prepended to every metric name
+            labels: A dict of labels added to every sample, e.g. the policy
+        Returns:
+            The metrics as a string, one sample per line.
+        """
+        def render(extra=None):
+            pairs = dict(labels or {}, **(extra or {}))
+            if not pairs:
+                return ""
+            return "{" + ",".join('{}="{}"'.format(
+                name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                for name, value in pairs.items()) + "}"
+
+        data = self.as_dict()
+        lines = []
+        for name, text in (("hits", "Lookups that found a value"),
+                           ("misses", "Lookups that found nothing"),
+                           ("inserts", "Values stored under a new key"),
+                           ("updates", "Values stored under a cached key")):
+            lines += ["# HELP {}_{}_total {}.".format(prefix, name, text),
+                      "# TYPE {}_{}_total counter".format(prefix, name),
+                      "{}_{}_total{} {}".format(prefix, name, render(), data[name])]
+        lines += ["# HELP {}_evictions_total Entries removed, by cause.".format(prefix),
+                  "# TYPE {}_evictions_total counter".format(prefix)]
+        for cause, count in data["evictions"].items():
+            lines.append("{}_evictions_total{} {}".format(prefix, render({"cause": cause}), count))
+        if data["latency_seconds"]:
+            name = "{}_operation_latency_seconds".format(prefix)
+            lines += ["# HELP {} Sampled duration of cache operations.".format(name),
+                      "# TYPE {} histogram".format(name)]
+            for operation, histogram in data["latency_seconds"].items():
+                for bound, count in histogram["buckets"].items():
+                    lines.append("{}_bucket{} {}".format(
+                        name, render({"operation": operation, "le": bound}), count))
+                lines.append("{}_sum{} {}".format(
+                    name, render({"operation": operation}), histogram["sum"]))
+                lines.append("{}_count{} {}".format(
+                    name, render({"operation": operation}), histogram["count"]))
+        return "\n".join(lines) + "\n"
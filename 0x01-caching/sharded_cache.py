@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+""" ShardedCache module spreading keys across independently locked caches """
+
+import threading
+from bounded_caching import UNCHANGED
+
+
+class ShardedCache:
+    """
+    ShardedCache makes any caching policy safe to share between threads.
+    Keys are hashed across N independent instances of the policy, each
+    guarded by its own lock, so threads working on different shards never
+    wait for each other. Eviction follows the policy within each shard.
+    Methods:
+        store_item(key, value, ttl) - adds a key-value pair to the key's shard
+        retrieve_item(key) - retrieves the value associated with a key
+        resize(max_items, max_bytes) - changes the total capacity
+        stats() - returns the counters summed over every shard
+        collect_metrics() - returns the CacheMetrics of every shard merged
+    """
+
+    def __init__(self, cache_class, shards=16, max_items=None, max_bytes=None,
+                 metrics=None, **options):
+        """
+        Initialize one cache per shard.
+        Args:
+            cache_class: The policy, e.g. LRUCache
+            shards: The number of independent caches
+            max_items: The total maximum number of entries, split evenly;
+                with neither bound given, cache_class.MAX_ITEMS in total
+            max_bytes: The total maximum size of the values, split evenly
+            metrics: A CacheMetrics; every shard records into its own copy
+                of it, since shards are locked separately
+            options: Passed on to every cache_class instance; listeners are
+                called with the shard's lock held
+        """
+        if max_items is None and max_bytes is None:
+            max_items = cache_class.MAX_ITEMS
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self.shards = [cache_class(max_items=self._share(max_items, shards, index),
+                                   max_bytes=self._share(max_bytes, shards, index),
+                                   metrics=None if metrics is None else metrics.fork(),
+                                   **options)
+                       for index in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.hits = [0] * shards
+        self.misses = [0] * shards
+
+    @staticmethod
+    def _share(total, shards, index):
+        """
+        Return the part of a total capacity given to one shard.
+        The total is split exactly: the first total % shards shards get one
+        more than the others, so the shares add up to the total.
+        """
+        if total is None:
+            return None
+        return total // shards + (index < total % shards)
+
+    def _shard(self, key):
+        """
+        Return the index of the shard holding key.
+        """
+        return hash(key) % len(self.shards)
+
+    def store_item(self, key, value, ttl=None):
+        """
+        Add a key-value pair to the cache of the key's shard.
+        Args:
+            key: The key to store
+            value: The value associated with the key
+            ttl: How long the entry lives, the shard's default_ttl if None
+        """
+        if key is None or value is None:
+            return
+        index = self._shard(key)
+        with self.locks[index]:
+            self.shards[index].put(key, value, ttl)
+
+    def retrieve_item(self, key):
+        """
+        Retrieve the value associated with a key from the key's shard.
+        Args:
+            key: The key to retrieve the value for
+        Returns:
+            The value associated with the key, or None if the key is not found.
+        """
+        if key is None:
+            return None
+        index = self._shard(key)
+        with self.locks[index]:
+            value = self.shards[index].get(key)
+            if value is None:
+                self.misses[index] += 1
+            else:
+                self.hits[index] += 1
+        return value
+
+    def put(self, key, item, ttl=None):
+        """
+        Add a key-value pair, like BaseCaching.put.
+        """
+        self.store_item(key, item, ttl)
+
+    def get(self, key):
+        """
+        Retrieve a value, like BaseCaching.get.
+        """
+        return self.retrieve_item(key)
+
+    def resize(self, max_items=UNCHANGED, max_bytes=UNCHANGED):
+        """
+        Set a new total capacity, split evenly, evicting at once to fit it.
+        A bound that is not given stays as it is; if both end up None,
+        MAX_ITEMS of the policy applies in total, as in __init__.
+        Args:
+            max_items: The total maximum number of entries, None for no limit
+            max_bytes: The total maximum size of the values, None for no limit
+        """
+        if max_items is UNCHANGED:
+            max_items = self.max_items
+        if max_bytes is UNCHANGED:
+            max_bytes = self.max_bytes
+        if max_items is None and max_bytes is None:
+            max_items = type(self.shards[0]).MAX_ITEMS
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                shard.resize(self._share(max_items, len(self.shards), index),
+                             self._share(max_bytes, len(self.shards), index))
+
+    def __len__(self):
+        """
+        Return the number of entries over every shard.
+        """
+        return sum(len(shard.cache_data) for shard in self.shards)
+
+    def print_cache(self):
+        """
+        Print the entries of every shard, sorted by key like BaseCaching.
+        """
+        items = {}
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                items.update(shard.cache_data)
+        print("Current cache:")
+        for key in sorted(items):
+            print("{}: {}".format(key, items[key]))
+
+    def stats(self):
+        """
+        Return the counters summed over every shard.
+        Returns:
+            A dict of hits, misses, hit_rate, size, and the size of each shard.
+        """
+        sizes = []
+        hits = misses = 0
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                sizes.append(len(shard.cache_data))
+                hits += self.hits[index]
+                misses += self.misses[index]
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "size": sum(sizes), "shard_sizes": sizes}
+
+    def collect_metrics(self):
+        """
+        Merge the metrics of every shard into a new CacheMetrics.
+        Returns:
+            The merged CacheMetrics, or None if the cache records no metrics.
+        """
+        if self.metrics is None:
+            return None
+        merged = self.metrics.fork()
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                merged.merge(shard.metrics)
+        return merged
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+""" Tests of the scan resistant policies: ARC and W-TinyLFU """
+
+import unittest
+from bench_hit_ratio import hit_ratio, traces
+
+LRUCache = __import__('3-lru_cache').LRUCache
+ARCCache = __import__('101-arc_cache').ARCCache
+TinyLFUCache = __import__('102-tinylfu_cache').TinyLFUCache
+CountMinSketch = __import__('102-tinylfu_cache').CountMinSketch
+
+
+class TestARCCache(unittest.TestCase):
+    """
+    ARC keeps frequent keys through scans and bounds its ghost lists.
+    """
+
+    def test_scan_does_not_flush_frequent_keys(self):
+        cache = ARCCache(max_items=4)
+        for key in "AB":
+            cache.put(key, key)
+            cache.get(key)
+        for number in range(20):
+            cache.put(number, number)
+        self.assertEqual(cache.get("A"), "A")
+        self.assertEqual(cache.get("B"), "B")
+
+    def test_ghost_hit_is_cached_as_frequent(self):
+        cache = ARCCache(max_items=4)
+        for key in "AB":
+            cache.put(key, key)
+            cache.get(key)
+        for key in "CDE":
+            cache.put(key, key)
+        self.assertIn("C", cache.recent_ghosts)
+        cache.put("C", "C")
+        self.assertIn("C", cache.frequent)
+        self.assertGreater(cache.target, 0)
+
+    def test_lists_stay_bounded(self):
+        cache = ARCCache(max_items=10)
+        for number in range(5000):
+            key = (number * 31) % 97
+            if cache.get(key) is None:
+                cache.put(key, key)
+            self.assertEqual(len(cache.recent) + len(cache.frequent), len(cache.cache_data))
+            self.assertLessEqual(len(cache.cache_data), 10)
+            self.assertLessEqual(len(cache.recent) + len(cache.recent_ghosts), 10)
+            self.assertLessEqual(len(cache.recent) + len(cache.frequent)
+                                 + len(cache.recent_ghosts) + len(cache.frequent_ghosts), 20)
+
+
+class TestTinyLFUCache(unittest.TestCase):
+    """
+    W-TinyLFU admits keys by frequency, counting each request once.
+    """
+
+    def test_sketch_estimates_and_halves(self):
+        sketch = CountMinSketch(64)
+        for _ in range(6):
+            sketch.increment("hot")
+        self.assertGreaterEqual(sketch.estimate("hot"), 6)
+        sketch.reset()
+        self.assertEqual(sketch.estimate("hot"), 3)
+
+    def test_a_miss_then_put_counts_once(self):
+        cache = TinyLFUCache(max_items=100)
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", 1)
+        self.assertEqual(cache.sketch.estimate("key"), 1)
+        cache.put("key", 2)
+        self.assertEqual(cache.sketch.estimate("key"), 2)
+
+    def test_sketch_is_sized_for_the_capacity(self):
+        cache = TinyLFUCache(max_items=100)
+        self.assertGreaterEqual(len(cache.sketch.rows[0]), 100 * TinyLFUCache.SKETCH_WIDTH)
+        cache.resize(1000)
+        self.assertGreaterEqual(len(cache.sketch.rows[0]), 1000 * TinyLFUCache.SKETCH_WIDTH)
+
+    def test_sketch_grows_with_a_byte_bound_only(self):
+        cache = TinyLFUCache(max_bytes=500, sizer=lambda value: 1)
+        for number in range(400):
+            cache.put(number, number)
+        self.assertEqual(len(cache.cache_data), 400)
+        self.assertGreaterEqual(len(cache.sketch.rows[0]), 400 * TinyLFUCache.SKETCH_WIDTH)
+
+    def test_frequent_keys_survive_a_scan(self):
+        cache = TinyLFUCache(max_items=20)
+        for _ in range(5):
+            for key in range(10):
+                if cache.get(key) is None:
+                    cache.put(key, key)
+        for key in range(1000, 1200):
+            if cache.get(key) is None:
+                cache.put(key, key)
+        self.assertTrue(all(cache.get(key) == key for key in range(10)))
+
+    def test_segments_partition_the_cache(self):
+        cache = TinyLFUCache(max_items=50)
+        for number in range(5000):
+            key = (number * number) % 211
+            if cache.get(key) is None:
+                cache.put(key, key)
+            segments = list(cache.window) + list(cache.probation) + list(cache.protected)
+            self.assertEqual(sorted(segments), sorted(cache.cache_data))
+            self.assertLessEqual(len(cache.cache_data), 50)
+
+
+class TestHitRatio(unittest.TestCase):
+    """
+    On the benchmark traces the adaptive policies beat LRU where they should.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.traces = traces(20000)
+
+    def test_loop_larger_than_the_cache(self):
+        trace = self.traces["loop"]
+        self.assertEqual(hit_ratio(LRUCache, 100, trace), 0.0)
+        self.assertGreater(hit_ratio(TinyLFUCache, 100, trace), 0.0)
+
+    def test_scans(self):
+        trace = self.traces["zipf+scan"]
+        lru = hit_ratio(LRUCache, 100, trace)
+        self.assertGreater(hit_ratio(ARCCache, 100, trace), lru)
+        self.assertGreater(hit_ratio(TinyLFUCache, 100, trace), lru)
+
+
+if __name__ == "__main__":
+    unittest.main()
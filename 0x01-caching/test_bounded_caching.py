@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+""" Tests of the capacities, TTLs and listeners shared by every policy """
+
+import unittest
+from bounded_caching import BoundedCaching
+
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LRUCache = __import__('3-lru_cache').LRUCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+ARCCache = __import__('101-arc_cache').ARCCache
+TinyLFUCache = __import__('102-tinylfu_cache').TinyLFUCache
+
+POLICIES = (FIFOCache, LRUCache, LFUCache, ARCCache, TinyLFUCache)
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to.
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCapacity(unittest.TestCase):
+    """
+    Item and byte bounds, and resizing at runtime.
+    """
+
+    def test_max_items_defaults_to_max_items(self):
+        cache = FIFOCache()
+        self.assertEqual(cache.max_items, BoundedCaching.MAX_ITEMS)
+        self.assertIsNone(cache.max_bytes)
+
+    def test_byte_bound(self):
+        for cache_class in POLICIES:
+            cache = cache_class(max_bytes=10, sizer=len)
+            for number in range(50):
+                cache.put(number, "x" * (number % 4 + 1))
+                self.assertLessEqual(cache.total_bytes, 10)
+                self.assertEqual(cache.total_bytes,
+                                 sum(len(value) for value in cache.cache_data.values()))
+
+    def test_oversized_value_is_not_stored(self):
+        evicted = []
+        cache = FIFOCache(max_bytes=5, sizer=len,
+                          listeners=[lambda *event: evicted.append(event)])
+        cache.put("A", "aa")
+        cache.put("B", "toolarge")
+        self.assertEqual(dict(cache.cache_data), {"A": "aa"})
+        self.assertEqual(evicted, [])
+
+    def test_oversized_update_evicts_only_the_old_value(self):
+        # With both bounds, a full cache must not lose another entry for
+        # a value that is refused anyway
+        evicted = []
+        cache = FIFOCache(max_items=2, max_bytes=5, sizer=len,
+                          listeners=[lambda *event: evicted.append(event)])
+        cache.put("A", "a")
+        cache.put("B", "b")
+        cache.put("C", "toolarge")
+        self.assertEqual(dict(cache.cache_data), {"A": "a", "B": "b"})
+        cache.put("A", "toolarge")
+        self.assertEqual(dict(cache.cache_data), {"B": "b"})
+        self.assertEqual(evicted, [("A", "a", "oversized")])
+        self.assertEqual(cache.total_bytes, 1)
+
+    def test_resize_evicts_at_once(self):
+        for cache_class in POLICIES:
+            cache = cache_class(max_items=10)
+            for number in range(10):
+                cache.put(number, number)
+            cache.resize(3)
+            self.assertEqual(len(cache.cache_data), 3)
+            cache.put("new", 1)
+            self.assertLessEqual(len(cache.cache_data), 3)
+
+    def test_resize_keeps_the_bound_not_given(self):
+        cache = FIFOCache(max_items=3, max_bytes=100, sizer=len)
+        cache.resize(max_bytes=50)
+        self.assertEqual((cache.max_items, cache.max_bytes), (3, 50))
+        cache.resize(max_items=5)
+        self.assertEqual((cache.max_items, cache.max_bytes), (5, 50))
+        cache.resize(max_bytes=None)
+        self.assertEqual((cache.max_items, cache.max_bytes), (5, None))
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_resize_to_no_bound_falls_back_to_max_items(self):
+        cache = FIFOCache(max_bytes=100, sizer=len)
+        cache.resize(max_bytes=None)
+        self.assertEqual(cache.max_items, BoundedCaching.MAX_ITEMS)
+
+    def test_adding_a_byte_bound_sizes_existing_entries(self):
+        cache = LRUCache(max_items=10, sizer=len)
+        for key in "ABCD":
+            cache.put(key, key * 3)
+        cache.resize(max_bytes=7)
+        self.assertEqual(cache.total_bytes, 6)
+        self.assertEqual(sorted(cache.cache_data), ["C", "D"])
+
+
+class TestExpiration(unittest.TestCase):
+    """
+    Entries expire after their time to live, whatever the policy.
+    """
+
+    def test_entries_expire(self):
+        for cache_class in POLICIES:
+            clock = FakeClock()
+            cache = cache_class(max_items=10, default_ttl=5, clock=clock)
+            cache.put("A", 1)
+            cache.put("B", 2, ttl=20)
+            clock.now = 4.9
+            self.assertEqual(cache.get("A"), 1)
+            clock.now = 5.0
+            self.assertIsNone(cache.get("A"))
+            self.assertEqual(cache.get("B"), 2)
+            clock.now = 25
+            self.assertIsNone(cache.get("B"))
+            self.assertEqual(len(cache.cache_data), 0)
+
+    def test_update_without_ttl_cancels_expiry(self):
+        clock = FakeClock()
+        cache = LRUCache(clock=clock)
+        cache.put("A", 1, ttl=1)
+        cache.put("A", 2)
+        clock.now = 100
+        self.assertEqual(cache.get("A"), 2)
+
+    def test_expired_entries_go_before_live_ones(self):
+        evicted = []
+        clock = FakeClock()
+        cache = FIFOCache(max_items=2, clock=clock,
+                          listeners=[lambda *event: evicted.append(event)])
+        cache.put("live", 1)
+        cache.put("short", 2, ttl=1)
+        clock.now = 2
+        cache.put("new", 3)
+        self.assertEqual(sorted(cache.cache_data), ["live", "new"])
+        self.assertEqual(evicted, [("short", 2, "expired")])
+
+
+class TestListeners(unittest.TestCase):
+    """
+    Evictions are reported to listeners instead of being printed.
+    """
+
+    def test_capacity_evictions_are_reported(self):
+        evicted = []
+        cache = FIFOCache(listeners=[lambda *event: evicted.append(event)])
+        for key in "ABCDE":
+            cache.put(key, key.lower())
+        self.assertEqual(evicted, [("A", "a", "capacity")])
+
+    def test_nothing_is_printed(self):
+        import contextlib
+        import io
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cache = LRUCache()
+            for key in "ABCDEF":
+                cache.put(key, key)
+        self.assertEqual(output.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
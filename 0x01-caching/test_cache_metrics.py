@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+""" Tests of CacheMetrics and the counters the caches record into it """
+
+import contextlib
+import io
+import unittest
+from cache_metrics import CacheMetrics, print_discard
+
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+
+
+class TestCacheMetrics(unittest.TestCase):
+    """
+    Caches count their operations into a CacheMetrics.
+    """
+
+    def test_counters(self):
+        metrics = CacheMetrics()
+        cache = FIFOCache(max_items=2, metrics=metrics)
+        cache.put("A", 1)
+        cache.put("A", 2)
+        cache.put("B", 3)
+        cache.put("C", 4)
+        cache.get("A")
+        cache.get("C")
+        report = metrics.as_dict()
+        self.assertEqual((report["inserts"], report["updates"]), (3, 1))
+        self.assertEqual((report["hits"], report["misses"], report["hit_rate"]), (1, 1, 0.5))
+        self.assertEqual(report["evictions"], {"capacity": 1, "oversized": 0, "expired": 0})
+        self.assertEqual(report["latency_seconds"], {})
+
+    def test_sampling(self):
+        metrics = CacheMetrics(sample_every=3)
+        self.assertEqual([metrics.sample() for _ in range(6)],
+                         [False, False, True, False, False, True])
+        cache = FIFOCache(metrics=CacheMetrics(sample_every=1))
+        cache.put("A", 1)
+        cache.get("A")
+        latencies = cache.metrics.as_dict()["latency_seconds"]
+        self.assertEqual(latencies["put"]["count"], 1)
+        self.assertEqual(latencies["get"]["buckets"]["+Inf"], 1)
+
+    def test_merge(self):
+        first, second = CacheMetrics(), CacheMetrics()
+        first.hits, second.hits = 2, 3
+        second.evictions["expired"] = 4
+        second.observe("get", 1e-6)
+        merged = first.fork().merge(first).merge(second)
+        self.assertEqual(merged.hits, 5)
+        self.assertEqual(merged.evictions["expired"], 4)
+        self.assertEqual(merged.latencies["get"][2], 1)
+
+    def test_prometheus(self):
+        metrics = CacheMetrics()
+        metrics.hits = 7
+        text = metrics.prometheus("cache", {"policy": "FIFO"})
+        self.assertIn('cache_hits_total{policy="FIFO"} 7', text)
+
+    def test_print_discard(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cache = FIFOCache(max_items=1, listeners=[print_discard])
+            cache.put("A", 1)
+            cache.put("B", 2)
+        self.assertEqual(output.getvalue(), "DISCARD: A\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
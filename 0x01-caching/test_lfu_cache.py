@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" Tests of the frequency bucket LFUCache """
+
+import unittest
+
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+def reference_victim(uses, last_use):
+    """
+    Return the least frequently, then least recently, used key.
+    """
+    return min(uses, key=lambda key: (uses[key], last_use[key]))
+
+
+class TestLFUCache(unittest.TestCase):
+    """
+    LFUCache evicts the least frequently used key, the least recently used
+    among ties, and forgets old popularity when aging.
+    """
+
+    def test_evicts_least_frequently_used(self):
+        cache = LFUCache()
+        for key in "ABCD":
+            cache.put(key, key)
+        cache.get("A")
+        cache.get("A")
+        cache.get("B")
+        cache.get("D")
+        cache.put("E", "E")
+        self.assertEqual(sorted(cache.cache_data), ["A", "B", "D", "E"])
+
+    def test_ties_evict_least_recently_used(self):
+        cache = LFUCache()
+        for key in "ABCD":
+            cache.put(key, key)
+        for key in "DCBA":
+            cache.get(key)
+        cache.put("E", "E")
+        self.assertNotIn("D", cache.cache_data)
+
+    def test_matches_a_reference_model(self):
+        cache = LFUCache(max_items=20)
+        uses, last_use = {}, {}
+        for tick in range(5000):
+            key = (tick * 7919) % 37 if tick % 3 else tick % 11
+            if tick % 2:
+                if key in uses:
+                    uses[key] += 1
+                    last_use[key] = tick
+                    self.assertEqual(cache.get(key), key)
+                else:
+                    self.assertIsNone(cache.get(key))
+                continue
+            if key not in uses and len(uses) >= 20:
+                victim = reference_victim(uses, last_use)
+                del uses[victim], last_use[victim]
+            uses[key] = uses.get(key, 0) + 1
+            last_use[key] = tick
+            cache.put(key, key)
+            self.assertEqual(sorted(cache.cache_data), sorted(uses))
+
+    def test_aging_lets_old_favourites_go(self):
+        cache = LFUCache(max_items=2, aging_interval=10)
+        cache.put("old", 1)
+        for _ in range(8):
+            cache.get("old")
+        for number in range(40):
+            cache.put("new", number)
+            cache.get("new")
+        cache.put("other", 2)
+        self.assertNotIn("old", cache.cache_data)
+        self.assertIn("new", cache.cache_data)
+
+    def test_aging_keeps_frequencies_positive(self):
+        cache = LFUCache(max_items=4, aging_interval=3)
+        for key in "ABCD":
+            cache.put(key, key)
+        for _ in range(30):
+            cache.get("A")
+        node = cache.head.next
+        while node is not cache.head:
+            self.assertGreaterEqual(node.frequency, 1)
+            self.assertTrue(node.keys)
+            node = node.next
+        self.assertEqual(sorted(cache.key_nodes), ["A", "B", "C", "D"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+""" Tests of the ordered eviction policies: FIFO, LIFO, LRU and MRU """
+
+import unittest
+
+BasicCache = __import__('0-basic_cache').BasicCache
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+LRUCache = __import__('3-lru_cache').LRUCache
+MRUCache = __import__('4-mru_cache').MRUCache
+
+
+def fill(cache, keys):
+    """
+    Put every key in cache, with its lower case as value.
+    """
+    for key in keys:
+        cache.put(key, key.lower())
+    return cache
+
+
+class TestOrderedCaches(unittest.TestCase):
+    """
+    Each policy evicts the entry its order designates, in O(1).
+    """
+
+    def test_basic_cache_is_unbounded(self):
+        cache = fill(BasicCache(), "ABCDEFGH")
+        self.assertEqual(len(cache.cache_data), 8)
+        self.assertEqual(cache.get("A"), "a")
+        self.assertIsNone(cache.get("Z"))
+        self.assertIsNone(cache.get(None))
+
+    def test_fifo_evicts_the_oldest_entry(self):
+        cache = fill(FIFOCache(), "ABCD")
+        cache.get("A")
+        cache.put("E", "e")
+        self.assertEqual(list(cache.cache_data), ["B", "C", "D", "E"])
+
+    def test_fifo_update_keeps_its_place(self):
+        cache = fill(FIFOCache(), "ABCD")
+        cache.put("A", "updated")
+        cache.put("E", "e")
+        self.assertNotIn("A", cache.cache_data)
+        self.assertEqual(cache.get("B"), "b")
+
+    def test_lifo_evicts_the_newest_entry(self):
+        cache = fill(LIFOCache(), "ABCD")
+        cache.put("E", "e")
+        self.assertEqual(sorted(cache.cache_data), ["A", "B", "C", "E"])
+        cache.put("B", "updated")
+        cache.put("F", "f")
+        self.assertEqual(sorted(cache.cache_data), ["A", "C", "E", "F"])
+
+    def test_lru_evicts_the_least_recently_used_entry(self):
+        cache = fill(LRUCache(), "ABCD")
+        cache.get("A")
+        cache.put("E", "e")
+        self.assertEqual(sorted(cache.cache_data), ["A", "C", "D", "E"])
+
+    def test_mru_evicts_the_most_recently_used_entry(self):
+        cache = fill(MRUCache(), "ABCD")
+        cache.get("B")
+        cache.put("E", "e")
+        self.assertEqual(sorted(cache.cache_data), ["A", "C", "D", "E"])
+
+    def test_none_is_ignored(self):
+        for cache_class in (FIFOCache, LIFOCache, LRUCache, MRUCache):
+            cache = cache_class()
+            cache.put(None, "value")
+            cache.put("key", None)
+            self.assertEqual(len(cache.cache_data), 0)
+            self.assertIsNone(cache.get(None))
+
+    def test_capacity_holds_under_many_operations(self):
+        for cache_class in (FIFOCache, LIFOCache, LRUCache, MRUCache):
+            cache = cache_class(max_items=50)
+            for number in range(10000):
+                cache.put(number % 300, number)
+                cache.get(number % 70)
+                self.assertLessEqual(len(cache.cache_data), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
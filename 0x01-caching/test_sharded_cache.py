@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+""" Tests of ShardedCache """
+
+import threading
+import unittest
+from cache_metrics import CacheMetrics
+from sharded_cache import ShardedCache
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class TestShardedCache(unittest.TestCase):
+    """
+    ShardedCache splits its capacity exactly and is safe across threads.
+    """
+
+    def test_capacity_is_split_exactly(self):
+        cache = ShardedCache(LRUCache, shards=4, max_items=10, max_bytes=103)
+        self.assertEqual([shard.max_items for shard in cache.shards], [3, 3, 2, 2])
+        self.assertEqual(sum(shard.max_bytes for shard in cache.shards), 103)
+
+    def test_default_capacity_is_the_policy_max_items(self):
+        cache = ShardedCache(LRUCache, shards=2)
+        self.assertEqual(cache.max_items, LRUCache.MAX_ITEMS)
+        self.assertEqual(sum(shard.max_items for shard in cache.shards), LRUCache.MAX_ITEMS)
+
+    def test_get_and_put(self):
+        cache = ShardedCache(LRUCache, shards=8, max_items=1000)
+        for number in range(500):
+            cache.put(number, str(number))
+        self.assertEqual(len(cache), 500)
+        self.assertEqual(cache.get(123), "123")
+        self.assertIsNone(cache.get(1000))
+        self.assertIsNone(cache.get(None))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 500))
+
+    def test_resize_keeps_the_bound_not_given(self):
+        cache = ShardedCache(LRUCache, shards=4, max_items=40, max_bytes=4000)
+        cache.resize(max_items=8)
+        self.assertEqual((cache.max_items, cache.max_bytes), (8, 4000))
+        self.assertEqual(sum(shard.max_items for shard in cache.shards), 8)
+        self.assertEqual(sum(shard.max_bytes for shard in cache.shards), 4000)
+        cache.resize(max_bytes=None)
+        self.assertEqual([shard.max_bytes for shard in cache.shards], [None] * 4)
+
+    def test_concurrent_use_respects_capacity(self):
+        cache = ShardedCache(LRUCache, shards=4, max_items=64)
+
+        def work(seed):
+            for number in range(2000):
+                key = (number * seed) % 257
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in (3, 5, 7, 11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(len(cache), 64)
+        for shard in cache.shards:
+            for key, value in shard.cache_data.items():
+                self.assertEqual(key, value)
+        stats = cache.stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 8000)
+
+    def test_metrics_are_collected_per_shard(self):
+        cache = ShardedCache(LRUCache, shards=4, max_items=4, metrics=CacheMetrics())
+        for number in range(10):
+            cache.put(number, number)
+            cache.get(number)
+        merged = cache.collect_metrics()
+        self.assertEqual(merged.inserts, 10)
+        self.assertEqual(merged.hits, 10)
+        self.assertEqual(merged.evictions["capacity"], 10 - len(cache))
+        self.assertIsNone(ShardedCache(LRUCache).collect_metrics())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+""" Tests of TimingWheel """
+
+import random
+import unittest
+from timing_wheel import TimingWheel
+
+
+class TestTimingWheel(unittest.TestCase):
+    """
+    advance() returns exactly the keys whose deadline has passed.
+    """
+
+    def test_keys_expire_at_their_deadline(self):
+        wheel = TimingWheel(0, tick=1.0)
+        wheel.schedule("a", 2.5)
+        wheel.schedule("b", 3.0)
+        self.assertEqual(wheel.advance(2.4), [])
+        self.assertEqual(wheel.advance(2.5), ["a"])
+        self.assertEqual(wheel.advance(2.9), [])
+        self.assertEqual(wheel.advance(3.0), ["b"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimingWheel(0)
+        wheel.schedule("a", 5)
+        wheel.schedule("b", 5)
+        wheel.cancel("a")
+        wheel.cancel("missing")
+        wheel.schedule("b", 50)
+        self.assertNotIn("a", wheel)
+        self.assertEqual(wheel.advance(10), [])
+        self.assertEqual(wheel.advance(50), ["b"])
+
+    def test_far_deadlines_cascade_and_overflow(self):
+        wheel = TimingWheel(0, tick=1.0, slots=4, levels=2)
+        deadlines = {"near": 3, "level1": 13, "overflow": 100, "far": 1000.5}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+        expired = {}
+        for now in range(0, 1002):
+            for key in wheel.advance(now):
+                expired[key] = now
+        self.assertEqual(expired, {"near": 3, "level1": 13, "overflow": 100, "far": 1001})
+
+    def test_matches_a_reference_model(self):
+        rng = random.Random(0)
+        wheel = TimingWheel(0, tick=0.5, slots=8, levels=3)
+        deadlines = {}
+        now = 0.0
+        for _ in range(3000):
+            action = rng.random()
+            key = rng.randrange(200)
+            if action < 0.6:
+                deadline = now + rng.expovariate(1 / 30)
+                wheel.schedule(key, deadline)
+                deadlines[key] = deadline
+            elif action < 0.7:
+                wheel.cancel(key)
+                deadlines.pop(key, None)
+            else:
+                now += rng.random() * 5
+                expected = sorted(key for key, deadline in deadlines.items() if deadline <= now)
+                self.assertEqual(sorted(wheel.advance(now)), expected)
+                for key in expected:
+                    del deadlines[key]
+            self.assertEqual(len(wheel), len(deadlines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+""" TimingWheel module scheduling key expirations in amortized O(1) """
+
+import heapq
+
+
+class TimingWheel:
+    """
+    TimingWheel is a hierarchical timing wheel of expiration deadlines.
+    Time is cut into ticks. Level 0 has one slot per tick; each slot of
+    level L covers `slots` slots of level L - 1. A deadline is filed in the
+    lowest level that reaches it and cascades down one level when the wheel
+    gets to its slot, so scheduling, cancelling and expiring a key cost
+    O(1) amortized, and ticks where nothing is filed are skipped. Deadlines
+    beyond the last level wait in an overflow heap until they come in range.
+    Keys of the current tick are kept in a small heap ordered by exact
+    deadline, so advance() never returns a key early nor keeps one whose
+    deadline has passed.
+    Methods:
+        schedule(key, deadline) - sets (or replaces) the deadline of a key
+        cancel(key) - forgets the deadline of a key
+        advance(now) - returns the keys whose deadline is at or before now
+    """
+
+    def __init__(self, start, tick=1.0, slots=64, levels=4):
+        """
+        Initialize an empty wheel.
+        Args:
+            start: The current time, on the clock deadlines will use
+            tick: The duration of one level 0 slot
+            slots: The number of slots per level, a power of two
+            levels: The number of levels
+        """
+        assert slots > 1 and slots & (slots - 1) == 0, "slots must be a power of two"
+        self.tick = tick
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.levels = levels
+        self.span = 1 << (self.bits * levels)  # Ticks covered by all the levels
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.counts = [0] * levels  # Keys filed in each level
+        self.overflow = []          # Heap of (tick, sequence, key, deadline)
+        self.due = []               # Heap of (deadline, sequence, key) for past ticks
+        self.location = {}          # Maps each key to where its deadline is filed
+        self.current = int(start // tick)
+        self.sequence = 0
+
+    def __len__(self):
+        """
+        Return the number of keys with a deadline.
+        """
+        return len(self.location)
+
+    def __contains__(self, key):
+        """
+        Tell whether key has a deadline.
+        """
+        return key in self.location
+
+    def _file(self, key, deadline):
+        """
+        Put a deadline in the slot, overflow heap or due heap it belongs to.
+        """
+        when = int(deadline // self.tick)
+        delta = when - self.current
+        if delta <= 0:
+            self.sequence += 1
+            heapq.heappush(self.due, (deadline, self.sequence, key))
+            self.location[key] = ("due", self.sequence)
+        elif delta >= self.span:
+            self.sequence += 1
+            heapq.heappush(self.overflow, (when, self.sequence, key, deadline))
+            self.location[key] = ("overflow", self.sequence)
+        else:
+            level = (delta.bit_length() - 1) // self.bits
+            slot = (when >> (self.bits * level)) & self.mask
+            self.wheels[level][slot][key] = deadline
+            self.location[key] = (level, slot)
+            self.counts[level] += 1
+
+    def schedule(self, key, deadline):
+        """
+        Set the deadline of a key, replacing any earlier one.
+        Args:
+            key: The key to expire
+            deadline: The time at which it expires
+        """
+        self.cancel(key)
+        self._file(key, deadline)
+
+    def cancel(self, key):
+        """
+        Forget the deadline of a key, if it has one.
+        Args:
+            key: The key that no longer expires
+        """
+        where = self.location.pop(key, None)
+        if where is not None and where[0] not in ("due", "overflow"):
+            del self.wheels[where[0]][where[1]][key]
+            self.counts[where[0]] -= 1
+        # Entries of the heaps are skipped lazily once their key has moved
+
+    def _next_event(self):
+        """
+        Return the next tick at which a filed deadline moves, or None.
+        """
+        ticks = []
+        for level, count in enumerate(self.counts):
+            if count:
+                span = 1 << (self.bits * level)
+                ticks.append((self.current // span + 1) * span)
+                break
+        overflow = self.overflow
+        while overflow and self.location.get(overflow[0][2]) != ("overflow", overflow[0][1]):
+            heapq.heappop(overflow)
+        if overflow:
+            ticks.append(max(overflow[0][0] - self.span + 1, self.current + 1))
+        return min(ticks) if ticks else None
+
+    def advance(self, now):
+        """
+        Move the wheel to now and collect the keys that expired.
+        Args:
+            now: The current time
+        Returns:
+            A list of keys whose deadline is at or before now; their
+            deadlines are forgotten.
+        """
+        target = int(now // self.tick)
+        while self.current < target:
+            tick = self._next_event()
+            if tick is None or tick > target:
+                self.current = target
+                break
+            self.current = tick
+            overflow = self.overflow
+            while overflow and overflow[0][0] - tick < self.span:
+                _, sequence, key, deadline = heapq.heappop(overflow)
+                if self.location.get(key) == ("overflow", sequence):
+                    self._file(key, deadline)
+            for level in range(self.levels - 1, -1, -1):
+                if tick & ((1 << (self.bits * level)) - 1) == 0:
+                    slot = (tick >> (self.bits * level)) & self.mask
+                    entries, self.wheels[level][slot] = self.wheels[level][slot], {}
+                    self.counts[level] -= len(entries)
+                    for key, deadline in entries.items():
+                        self._file(key, deadline)
+
+        expired = []
+        due = self.due
+        while due and due[0][0] <= now:
+            _, sequence, key = heapq.heappop(due)
+            if self.location.get(key) == ("due", sequence):
+                del self.location[key]
+                expired.append(key)
+        return expired